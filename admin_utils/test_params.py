@@ -16,3 +16,4 @@ TEST_CRAWLER_CONFIG_PATH = TEST_PATH / TEST_SCRAPER_CONFIG
 
 PIPE_TEST_FILES_FOLDER = PROJECT_ROOT / "lab_6_pipeline" / "tests" / "test_files"
 CORE_UTILS_TEST_FILES_FOLDER = PROJECT_ROOT / "core_utils" / "tests" / "test_files"
+SCRAPER_TEST_FILES_FOLDER = PROJECT_ROOT / "lab_5_scraper" / "tests" / "test_files"
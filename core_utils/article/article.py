@@ -6,12 +6,21 @@ Article implementation.
 
 import datetime
 import enum
+import hashlib
+import os
 import pathlib
 import re
 import string
+from typing import Iterator
 
 from core_utils.constants import ASSETS_PATH
 
+#: File marking an assets folder whose articles are spread over shard folders
+SHARDED_LAYOUT_MARKER = ".sharded"
+
+#: Number of hex digits in a shard folder name, giving 4096 shards
+SHARD_NAME_LENGTH = 3
+
 
 def date_from_meta(date_txt: str) -> datetime.datetime:
     """
@@ -41,6 +50,59 @@ def get_article_id_from_filepath(path: pathlib.Path) -> int:
     return int(path.stem.split("_")[0])
 
 
+def get_shard_name(article_id: int) -> str:
+    """
+    Get the name of the shard folder holding files of the article.
+
+    Ids are hashed so that consecutive articles are spread evenly over shards.
+
+    Args:
+        article_id (int): Article id
+
+    Returns:
+        str: Shard folder name
+    """
+    return hashlib.md5(str(article_id).encode("utf-8")).hexdigest()[:SHARD_NAME_LENGTH]
+
+
+def is_sharded(path: pathlib.Path) -> bool:
+    """
+    Check whether the assets folder uses the sharded layout.
+
+    Args:
+        path (pathlib.Path): Path to assets folder
+
+    Returns:
+        bool: Whether articles are stored in shard folders or not
+    """
+    return (path / SHARDED_LAYOUT_MARKER).exists()
+
+
+def iter_article_files(path: pathlib.Path) -> Iterator[os.DirEntry]:
+    """
+    Iterate over article files of the assets folder in either layout.
+
+    Folders are read with os.scandir, so each entry is listed once and
+    no pattern matching over the whole corpus takes place.
+
+    Args:
+        path (pathlib.Path): Path to assets folder
+
+    Yields:
+        os.DirEntry: Entry of an article file
+    """
+    if not is_sharded(path):
+        with os.scandir(path) as entries:
+            yield from (entry for entry in entries
+                        if entry.is_file() and entry.name != SHARDED_LAYOUT_MARKER)
+        return
+    with os.scandir(path) as shards:
+        for shard in shards:
+            if shard.is_dir():
+                with os.scandir(shard.path) as entries:
+                    yield from (entry for entry in entries if entry.is_file())
+
+
 def split_by_sentence(text: str) -> list[str]:
     """
     Splits the given text by sentence separators.
@@ -201,6 +263,17 @@ class Article:
         """
         return self.date.strftime("%Y-%m-%d %H:%M:%S") if self.date else ""
 
+    def get_folder(self) -> pathlib.Path:
+        """
+        Get the folder holding files of the article.
+
+        Returns:
+            pathlib.Path: Assets folder or the shard folder of the article
+        """
+        if is_sharded(ASSETS_PATH):
+            return ASSETS_PATH / get_shard_name(self.article_id)
+        return ASSETS_PATH
+
     def get_raw_text_path(self) -> pathlib.Path:
         """
         Get path for requested raw article.
@@ -209,7 +282,7 @@ class Article:
             pathlib.Path: Path to requested raw article
         """
         article_txt_name = f"{self.article_id}_raw.txt"
-        return ASSETS_PATH / article_txt_name
+        return self.get_folder() / article_txt_name
 
     def get_meta_file_path(self) -> pathlib.Path:
         """
@@ -219,7 +292,7 @@ class Article:
             pathlib.Path: Path to requested article's meta info
         """
         meta_file_name = f"{self.article_id}_meta.json"
-        return ASSETS_PATH / meta_file_name
+        return self.get_folder() / meta_file_name
 
     def get_file_path(self, kind: ArtifactType) -> pathlib.Path:
         """
@@ -236,7 +309,7 @@ class Article:
         extension = ".conllu" if conllu else ".txt"
         article_name = f"{self.article_id}_{kind.value}{extension}"
 
-        return ASSETS_PATH / article_name
+        return self.get_folder() / article_name
 
     def get_pos_freq(self) -> dict:
         """
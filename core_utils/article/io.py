@@ -22,7 +22,9 @@ def to_raw(article: Article) -> None:
     Args:
         article (Article): Article instance
     """
-    with open(article.get_raw_text_path(), "w", encoding="utf-8") as file:
+    path = article.get_raw_text_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as file:
         file.write(article.text)
 
 
@@ -65,7 +67,9 @@ def to_meta(article: Article) -> None:
     Args:
         article (Article): Article instance
     """
-    with open(article.get_meta_file_path(), "w", encoding="utf-8") as meta_file:
+    path = article.get_meta_file_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as meta_file:
         json.dump(
             article.get_meta(), meta_file, indent=4, ensure_ascii=False, separators=(",", ": ")
         )
@@ -3,6 +3,244 @@
 ConfigDTO class implementation: stores the configuration information.
 """
 
+from typing import Any
+
+
+class NetworkOptions:
+    """
+    Type annotations for settings of connections, request rate and retries.
+    """
+
+    #: Maximum number of simultaneous requests to a single host
+    max_requests_per_host: int
+
+    #: Maximum number of connections kept open to a single host
+    pool_size: int
+
+    #: Keep connections open between requests or not
+    keep_alive: bool
+
+    #: Number of retries on timeouts, connection errors, 429 and 5xx responses
+    max_retries: int
+
+    #: Upper bound of the first back-off delay in seconds
+    backoff_factor: float
+
+    #: Number of consecutive failures of a host opening its circuit
+    circuit_breaker_threshold: int
+
+    #: Number of seconds an open circuit waits before a probe request
+    circuit_breaker_timeout: float
+
+    #: Maximum rate of requests to a single host
+    requests_per_second: float
+
+    #: Number of requests allowed to go at once
+    burst_size: int
+
+    #: Adapt request rate to server feedback or not
+    adaptive_rate_limit: bool
+
+    def __init__(
+        self,
+        max_requests_per_host: int = 4,
+        pool_size: int = 10,
+        keep_alive: bool = True,
+        max_retries: int = 0,
+        backoff_factor: float = 0.5,
+        circuit_breaker_threshold: int = 5,
+        circuit_breaker_timeout: float = 30.0,
+        requests_per_second: float = 2.0,
+        burst_size: int = 2,
+        adaptive_rate_limit: bool = True,
+    ) -> None:
+        """
+        Initializes an instance of the NetworkOptions class.
+
+        Args:
+            max_requests_per_host (int): Maximum number of simultaneous requests to a host
+            pool_size (int): Maximum number of connections kept open to a single host
+            keep_alive (bool): Keep connections open between requests or not
+            max_retries (int): Number of retries on timeouts, connection errors, 429 and 5xx
+                responses
+            backoff_factor (float): Upper bound of the first back-off delay in seconds
+            circuit_breaker_threshold (int): Number of consecutive failures of a host opening
+                its circuit, 0 disables breaking
+            circuit_breaker_timeout (float): Number of seconds an open circuit waits before
+                a probe request
+            requests_per_second (float): Maximum rate of requests to a single host
+            burst_size (int): Number of requests allowed to go at once
+            adaptive_rate_limit (bool): Adapt request rate to server feedback or not
+        """
+        self.max_requests_per_host = max_requests_per_host
+        self.pool_size = pool_size
+        self.keep_alive = keep_alive
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.circuit_breaker_threshold = circuit_breaker_threshold
+        self.circuit_breaker_timeout = circuit_breaker_timeout
+        self.requests_per_second = requests_per_second
+        self.burst_size = burst_size
+        self.adaptive_rate_limit = adaptive_rate_limit
+
+
+class StorageOptions:
+    """
+    Type annotations for settings of files kept between requests and runs.
+    """
+
+    #: Cache responses on disk and revalidate them or not
+    use_http_cache: bool
+
+    #: Archive mode: off, record or replay
+    archive_mode: str
+
+    #: Keep articles of previous runs and fetch only new and modified ones or not
+    incremental_mode: bool
+
+    #: Skip articles whose text nearly duplicates a saved one or not
+    skip_near_duplicates: bool
+
+    #: Lift the limit on articles and store them in shard folders or not
+    large_corpus_mode: bool
+
+    def __init__(
+        self,
+        use_http_cache: bool = False,
+        archive_mode: str = "off",
+        incremental_mode: bool = False,
+        skip_near_duplicates: bool = False,
+        large_corpus_mode: bool = False,
+    ) -> None:
+        """
+        Initializes an instance of the StorageOptions class.
+
+        Args:
+            use_http_cache (bool): Cache responses on disk and revalidate them or not
+            archive_mode (str): Archive mode: off, record or replay
+            incremental_mode (bool): Keep articles of previous runs and fetch only new and
+                modified ones or not
+            skip_near_duplicates (bool): Skip articles whose text nearly duplicates a saved one
+                or not
+            large_corpus_mode (bool): Lift the limit on articles and store them in shard folders
+                or not
+        """
+        self.use_http_cache = use_http_cache
+        self.archive_mode = archive_mode
+        self.incremental_mode = incremental_mode
+        self.skip_near_duplicates = skip_near_duplicates
+        self.large_corpus_mode = large_corpus_mode
+
+
+class CrawlingOptions:
+    """
+    Type annotations for settings of finding article urls.
+    """
+
+    #: Maximum number of pages read per seed url
+    max_seed_pages: int
+
+    #: Sitemaps and RSS/Atom feeds listing articles
+    sitemap_urls: list[str]
+
+    #: Earliest modification date of articles found in sitemaps and feeds
+    lastmod_since: str | None
+
+    #: Share the frontier of the recursive crawler with other crawler processes or not
+    shared_frontier: bool
+
+    #: Weights of signals the recursive crawler orders links by
+    frontier_weights: dict[str, float] | None
+
+    def __init__(
+        self,
+        max_seed_pages: int = 1,
+        sitemap_urls: list[str] | None = None,
+        lastmod_since: str | None = None,
+        shared_frontier: bool = False,
+        frontier_weights: dict[str, float] | None = None,
+    ) -> None:
+        """
+        Initializes an instance of the CrawlingOptions class.
+
+        Args:
+            max_seed_pages (int): Maximum number of pages read per seed url
+            sitemap_urls (list[str] | None): Sitemaps and RSS/Atom feeds listing articles
+            lastmod_since (str | None): Earliest modification date of articles found
+                in sitemaps and feeds, YYYY-MM-DD
+            shared_frontier (bool): Share the frontier of the recursive crawler with other
+                crawler processes or not
+            frontier_weights (dict[str, float] | None): Weights of signals the recursive
+                crawler orders links by
+        """
+        self.max_seed_pages = max_seed_pages
+        self.sitemap_urls = sitemap_urls if sitemap_urls is not None else []
+        self.lastmod_since = lastmod_since
+        self.shared_frontier = shared_frontier
+        self.frontier_weights = frontier_weights
+
+
+class ProcessingOptions:
+    """
+    Type annotations for settings of downloading and parsing article pages.
+    """
+
+    #: Number of processes parsing HTML
+    parse_workers: int
+
+    #: Extract fields with precompiled lxml selectors or not
+    use_fast_extraction: bool
+
+    #: Stop downloading article pages once every required block is read or not
+    stream_article_pages: bool
+
+    #: Rules finding fields of article pages and links of seed and news pages
+    extraction_rules: dict | None
+
+    #: Number of seconds between live metrics summaries
+    metrics_interval: float
+
+    def __init__(
+        self,
+        parse_workers: int = 0,
+        use_fast_extraction: bool = False,
+        stream_article_pages: bool = False,
+        extraction_rules: dict | None = None,
+        metrics_interval: float = 0.0,
+    ) -> None:
+        """
+        Initializes an instance of the ProcessingOptions class.
+
+        Args:
+            parse_workers (int): Number of processes parsing HTML
+            use_fast_extraction (bool): Extract fields with precompiled lxml selectors or not
+            stream_article_pages (bool): Stop downloading article pages once every required
+                block is read or not
+            extraction_rules (dict | None): Rules finding fields of article pages and links
+                of seed and news pages
+            metrics_interval (float): Number of seconds between live metrics summaries,
+                0 disables them
+        """
+        self.parse_workers = parse_workers
+        self.use_fast_extraction = use_fast_extraction
+        self.stream_article_pages = stream_article_pages
+        self.extraction_rules = extraction_rules
+        self.metrics_interval = metrics_interval
+
+
+def _take_options(options: dict[str, Any], group: type) -> dict[str, Any]:
+    """
+    Move settings of a group out of the optional settings.
+
+    Args:
+        options (dict[str, Any]): Optional settings not taken yet
+        group (type): Class of the group of settings
+
+    Returns:
+        dict[str, Any]: Settings of the group
+    """
+    return {name: options.pop(name) for name in group.__annotations__ if name in options}
+
 
 class ConfigDTO:
     """
@@ -30,6 +268,18 @@ class ConfigDTO:
     #: Require headless mode or not
     headless_mode: bool
 
+    #: Settings of connections, request rate and retries
+    network: NetworkOptions
+
+    #: Settings of files kept between requests and runs
+    storage: StorageOptions
+
+    #: Settings of finding article urls
+    crawling: CrawlingOptions
+
+    #: Settings of downloading and parsing article pages
+    processing: ProcessingOptions
+
     def __init__(
         self,
         seed_urls: list[str],
@@ -39,6 +289,7 @@ class ConfigDTO:
         timeout: int,
         should_verify_certificate: bool,
         headless_mode: bool,
+        **options: Any,
     ) -> None:
         """
         Initializes an instance of the ConfigDTO class.
@@ -51,6 +302,11 @@ class ConfigDTO:
             timeout (int): Number of seconds to wait for response
             should_verify_certificate (bool): Should verify certificate or not
             headless_mode (bool): Require headless mode or not
+            **options (Any): Optional settings, grouped into network, storage, crawling
+                and processing ones
+
+        Raises:
+            TypeError: Optional settings include an unknown one
         """
         self.seed_urls = seed_urls
         self.total_articles = total_articles_to_find_and_parse
@@ -59,3 +315,9 @@ class ConfigDTO:
         self.timeout = timeout
         self.should_verify_certificate = should_verify_certificate
         self.headless_mode = headless_mode
+        self.network = NetworkOptions(**_take_options(options, NetworkOptions))
+        self.storage = StorageOptions(**_take_options(options, StorageOptions))
+        self.crawling = CrawlingOptions(**_take_options(options, CrawlingOptions))
+        self.processing = ProcessingOptions(**_take_options(options, ProcessingOptions))
+        if options:
+            raise TypeError(f'Unknown configuration parameters: {", ".join(options)}')
@@ -0,0 +1,57 @@
+"""
+Deferred imports of heavy dependencies.
+"""
+
+import importlib
+import sys
+import types
+from typing import Any
+
+
+class LazyModule(types.ModuleType):
+    """
+    Stand-in for a module that imports it on first access to its attributes.
+
+    Importing a module that holds a LazyModule costs nothing for the
+    dependency, so runs that never use it never load it. Unlike
+    importlib.util.LazyLoader, a submodule, e.g. ``stanza.utils.conll``,
+    does not import its parent packages until first use either. A missing
+    dependency raises ImportError on first use instead of on import.
+
+    Modules holding stand-ins import the real modules under
+    ``typing.TYPE_CHECKING`` instead, so that type checkers see their types.
+    """
+
+    def __getattr__(self, name: str) -> Any:
+        """
+        Import the module and get its attribute.
+
+        Args:
+            name (str): Attribute name
+
+        Returns:
+            Any: Attribute of the module
+        """
+        return getattr(importlib.import_module(self.__name__), name)
+
+    def __repr__(self) -> str:
+        """
+        Get representation of the stand-in.
+
+        Returns:
+            str: Name of the module
+        """
+        return f'<lazy module {self.__name__!r}>'
+
+
+def is_loaded(module: types.ModuleType) -> bool:
+    """
+    Check whether a module has been imported, without importing a deferred one.
+
+    Args:
+        module (types.ModuleType): Module or its LazyModule stand-in
+
+    Returns:
+        bool: Whether the module is imported
+    """
+    return not isinstance(module, LazyModule) or module.__name__ in sys.modules
@@ -17,6 +17,9 @@ from core_utils.article.article import (
     ArtifactType,
     date_from_meta,
     get_article_id_from_filepath,
+    get_shard_name,
+    iter_article_files,
+    SHARDED_LAYOUT_MARKER,
 )
 from core_utils.article.io import from_meta, from_raw, to_cleaned, to_meta, to_raw
 from core_utils.tests.utils import universal_setup
@@ -277,3 +280,54 @@ class IOTest(unittest.TestCase):
         Define final instructions for IOTest class.
         """
         shutil.rmtree(TEST_PATH)
+
+
+class ShardedLayoutTest(unittest.TestCase):
+    """
+    Class for testing the sharded layout of a large corpus.
+    """
+
+    def setUp(self) -> None:
+        """
+        Define start instructions for ShardedLayoutTest class.
+        """
+        self.assets_path = article.ASSETS_PATH
+        article.ASSETS_PATH = TEST_PATH
+        TEST_PATH.mkdir(parents=True, exist_ok=True)
+        (TEST_PATH / SHARDED_LAYOUT_MARKER).touch()
+
+    @pytest.mark.core_utils
+    def test_artifacts_are_stored_in_shard_folders(self) -> None:
+        """
+        Ensure that every artifact of an article goes to the shard folder of its id.
+        """
+        test_article = Article(url=None, article_id=42)
+        test_article.text = "Текст"
+        to_raw(test_article)
+        to_meta(test_article)
+        shard = TEST_PATH / get_shard_name(42)
+        self.assertEqual(shard / "42_raw.txt", test_article.get_raw_text_path())
+        self.assertEqual(shard / "42_meta.json", test_article.get_meta_file_path())
+        self.assertEqual(shard / "42_cleaned.txt", test_article.get_file_path(ArtifactType.CLEANED))
+        self.assertTrue(test_article.get_raw_text_path().is_file())
+
+    @pytest.mark.core_utils
+    def test_article_files_are_listed_across_shards(self) -> None:
+        """
+        Ensure that files of all shards are listed and shards stay balanced.
+        """
+        for article_id in range(1, 201):
+            test_article = Article(url=None, article_id=article_id)
+            test_article.text = "Текст"
+            to_raw(test_article)
+        names = {entry.name for entry in iter_article_files(TEST_PATH)}
+        self.assertEqual({f"{article_id}_raw.txt" for article_id in range(1, 201)}, names)
+        self.assertLess(max(len(list(shard.iterdir())) for shard in TEST_PATH.iterdir()
+                            if shard.is_dir()), 5)
+
+    def tearDown(self) -> None:
+        """
+        Define final instructions for ShardedLayoutTest class.
+        """
+        article.ASSETS_PATH = self.assets_path
+        shutil.rmtree(TEST_PATH)
@@ -0,0 +1,44 @@
+"""
+Tests for deferred imports.
+"""
+
+import sys
+import unittest
+from unittest import mock
+
+import pytest
+
+from core_utils.lazy import is_loaded, LazyModule
+
+
+class LazyModuleTest(unittest.TestCase):
+    """
+    Class for testing LazyModule.
+    """
+
+    @pytest.mark.core_utils
+    def test_module_is_imported_on_first_use(self) -> None:
+        """
+        Ensure the module is imported only once its attribute is accessed.
+        """
+        sys.modules.pop('colorsys', None)
+        colorsys = LazyModule('colorsys')
+        self.assertFalse(is_loaded(colorsys))
+        self.assertNotIn('colorsys', sys.modules)
+        self.assertEqual((0.0, 0.0, 1.0), colorsys.rgb_to_hsv(1.0, 1.0, 1.0))
+        self.assertTrue(is_loaded(colorsys))
+        self.assertTrue(is_loaded(sys))
+
+    @pytest.mark.core_utils
+    def test_missing_module_fails_on_first_use(self) -> None:
+        """
+        Ensure a missing module is not looked for until it is used, then raises ImportError.
+        """
+        finder = mock.Mock(spec=['find_spec'])
+        finder.find_spec.return_value = None
+        with mock.patch.object(sys, 'meta_path', [finder, *sys.meta_path]):
+            missing = LazyModule('no_such_dependency')
+            finder.find_spec.assert_not_called()
+            with self.assertRaises(ImportError):
+                missing.load()
+        self.assertEqual('no_such_dependency', finder.find_spec.call_args.args[0])
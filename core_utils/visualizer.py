@@ -2,25 +2,23 @@
 Visualizer module for visualizing PosFrequencyPipeline results.
 """
 
+from __future__ import annotations
+
 from pathlib import Path
-from typing import Callable
+from typing import Callable, TYPE_CHECKING
+
+from core_utils.article.article import Article
+from core_utils.lazy import LazyModule
 
-try:
+if TYPE_CHECKING:
     import matplotlib
     import matplotlib.pyplot as plt
-
-    matplotlib.use("agg")
-except ImportError:  # pragma: no cover
-    print("No libraries installed. Failed to import.")
-
-try:
     import networkx as nx
-    from networkx import DiGraph
-except ImportError:  # pragma: no cover
-    DiGraph = None  # type: ignore
-    print("No libraries installed. Failed to import.")
-
-from core_utils.article.article import Article
+else:
+    #: Imported on first use: plotting is the last step of a pipeline run
+    matplotlib = LazyModule("matplotlib")
+    plt = LazyModule("matplotlib.pyplot")
+    nx = LazyModule("networkx")
 
 
 def visualize(article: Article, path_to_save: Path) -> None:
@@ -39,6 +37,7 @@ def visualize(article: Article, path_to_save: Path) -> None:
     pos_tags = list(range(number_of_tags))
     colors = ("b", "g", "r", "c")
 
+    matplotlib.use("agg")
     figure = plt.figure()
     axis = figure.add_subplot(1, 1, 1)
     for i in range(0, number_of_tags):
@@ -60,7 +59,7 @@ def visualize(article: Article, path_to_save: Path) -> None:
     plt.savefig(path_to_save)
 
 
-def show_graph(graph: DiGraph, graph_path: str) -> None:
+def show_graph(graph: nx.DiGraph, graph_path: str) -> None:
     """
     Visualization for debug.
 
@@ -0,0 +1,193 @@
+"""
+Append-only archive of fetched pages for offline re-parsing.
+"""
+
+# pylint: disable=protected-access
+import json
+import pathlib
+import threading
+from typing import BinaryIO, Iterator, Union
+
+import requests
+
+
+class ResponseArchive:
+    """
+    Record responses into a single append-only file and replay them without network.
+
+    Every record is a JSON header line followed by the raw body and a newline.
+    A sidecar ``.idx`` file maps each url to the offset of its latest record,
+    so a replayed page costs one seek and one read.
+    """
+
+    def __init__(self, path: Union[pathlib.Path, str]) -> None:
+        """
+        Initialize an instance of the ResponseArchive class.
+
+        Args:
+            path (Union[pathlib.Path, str]): Path to archive file
+        """
+        self.path = pathlib.Path(path)
+        self.index_path = self.path.with_suffix(self.path.suffix + '.idx')
+        self._lock = threading.Lock()
+        self._index: dict[str, int] = {}
+        self._load_index()
+
+    def _load_index(self) -> None:
+        """
+        Read the offset index, rebuilding it from the archive if it is missing or stale.
+
+        The index is trusted only if its last record ends exactly where the
+        archive does: a torn index line, a record appended without its index
+        entry or a torn record makes the index rebuilt.
+        """
+        if not self.path.exists():
+            return
+        try:
+            with open(self.index_path, encoding='utf-8') as file:
+                for line in file:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self._index[entry['url']] = entry['offset']
+        except (OSError, ValueError, KeyError):
+            self._index = {}
+        if self._get_end() != self.path.stat().st_size:
+            self._rebuild_index()
+
+    def _get_end(self) -> int:
+        """
+        Find where the last indexed record ends.
+
+        Returns:
+            int: Offset of the end of the last indexed record, -1 if it is torn
+        """
+        if not self._index:
+            return 0
+        with open(self.path, 'rb') as file:
+            file.seek(max(self._index.values()))
+            try:
+                header = json.loads(file.readline())
+            except ValueError:
+                return -1
+            length = header.get('length') if isinstance(header, dict) else None
+            if not isinstance(length, int):
+                return -1
+            return file.tell() + length + 1
+
+    def _rebuild_index(self) -> None:
+        """
+        Scan the archive and write the offset index anew.
+
+        A torn record at the end of the archive is cut off, so records
+        appended later can be found again.
+        """
+        self._index = {}
+        size = self.path.stat().st_size
+        with open(self.path, 'rb+') as file:
+            while header_line := file.readline():
+                offset = file.tell() - len(header_line)
+                try:
+                    header = json.loads(header_line)
+                except ValueError:
+                    header = None
+                if header is None or offset + len(header_line) + header['length'] + 1 > size:
+                    file.truncate(offset)
+                    break
+                file.seek(header['length'] + 1, 1)
+                self._index[header['url']] = offset
+        with open(self.index_path, 'w', encoding='utf-8') as file:
+            for url, offset in self._index.items():
+                file.write(json.dumps({'url': url, 'offset': offset}, ensure_ascii=False) + '\n')
+
+    def __len__(self) -> int:
+        """
+        Get number of archived urls.
+
+        Returns:
+            int: Number of archived urls
+        """
+        return len(self._index)
+
+    def __contains__(self, url: object) -> bool:
+        """
+        Check whether the url is archived.
+
+        Args:
+            url (object): Site url
+
+        Returns:
+            bool: Whether the url is archived or not
+        """
+        return url in self._index
+
+    def record(self, url: str, response: requests.models.Response) -> None:
+        """
+        Append a response to the archive.
+
+        Args:
+            url (str): Site url
+            response (requests.models.Response): A response from a request
+        """
+        header = {
+            'url': url,
+            'status_code': response.status_code,
+            'headers': dict(response.headers),
+            'length': len(response.content),
+        }
+        header_line = json.dumps(header, ensure_ascii=False).encode('utf-8') + b'\n'
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, 'ab') as file:
+                offset = file.tell()
+                file.write(header_line + response.content + b'\n')
+            with open(self.index_path, 'a', encoding='utf-8') as file:
+                file.write(json.dumps({'url': url, 'offset': offset}, ensure_ascii=False) + '\n')
+            self._index[url] = offset
+
+    @staticmethod
+    def _read_record(file: BinaryIO, offset: int) -> requests.models.Response:
+        """
+        Read a record starting at the offset.
+
+        Args:
+            file (BinaryIO): Archive opened in binary mode
+            offset (int): Offset of the record
+
+        Returns:
+            requests.models.Response: Archived response
+        """
+        file.seek(offset)
+        header = json.loads(file.readline())
+        response = requests.models.Response()
+        response.url = header['url']
+        response.status_code = header['status_code']
+        response.headers = requests.structures.CaseInsensitiveDict(header['headers'])
+        response._content = file.read(header['length'])
+        return response
+
+    def replay(self, url: str) -> requests.models.Response | None:
+        """
+        Get the latest archived response for the url.
+
+        Args:
+            url (str): Site url
+
+        Returns:
+            requests.models.Response | None: Archived response or None if the url is missing
+        """
+        offset = self._index.get(url)
+        if offset is None:
+            return None
+        with open(self.path, 'rb') as file:
+            return self._read_record(file, offset)
+
+    def __iter__(self) -> Iterator[requests.models.Response]:
+        """
+        Iterate over the latest response of every archived url in recording order.
+
+        Yields:
+            requests.models.Response: Archived response
+        """
+        with open(self.path, 'rb') as file:
+            for offset in sorted(self._index.values()):
+                yield self._read_record(file, offset)
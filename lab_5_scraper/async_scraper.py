@@ -0,0 +1,343 @@
+"""
+Asynchronous crawler, parser and pipeline streaming articles from seed pages to disk.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, Awaitable, Union
+
+from core_utils.article.article import Article
+from lab_5_scraper.dedup import minhash
+from lab_5_scraper.scraper import (
+    accept_article,
+    Config,
+    Crawler,
+    HostLimiter,
+    HTMLParser,
+    make_request_async,
+    UNPARSEABLE_PAGE_ERRORS,
+    write_article,
+)
+
+logger = logging.getLogger(__name__)
+
+#: Configuration of a process of the parsing pool, set once by init_parse_worker
+_PARSE_WORKER_STATE: dict[str, Config] = {}
+
+def parse_article_html(full_url: str, article_id: int, config: Config, html: bytes) -> Article:
+    """
+    Parse raw bytes of an article page.
+
+    Args:
+        full_url (str): Site url
+        article_id (int): Article id
+        config (Config): Configuration
+        html (bytes): Raw HTML of the article page
+
+    Returns:
+        Article: Article instance
+    """
+    return HTMLParser(full_url, article_id, config).parse_html(
+        html.decode(config.get_encoding(), errors='replace'))
+
+
+def init_parse_worker(config: Config) -> None:
+    """
+    Keep the configuration in a process of the parsing pool.
+
+    The configuration reaches every process once, when the process starts,
+    so tasks carry pages only.
+
+    Args:
+        config (Config): Configuration
+    """
+    _PARSE_WORKER_STATE['config'] = config
+
+
+def parse_in_worker(full_url: str, article_id: int, html: bytes) -> Article:
+    """
+    Parse raw bytes of an article page in a process of the parsing pool.
+
+    Args:
+        full_url (str): Site url
+        article_id (int): Article id
+        html (bytes): Raw HTML of the article page
+
+    Returns:
+        Article: Article instance
+    """
+    return parse_article_html(full_url, article_id, _PARSE_WORKER_STATE['config'], html)
+
+
+def create_parse_pool(config: Config) -> ProcessPoolExecutor | None:
+    """
+    Create a pool of processes parsing HTML with parse_in_worker.
+
+    Args:
+        config (Config): Configuration
+
+    Returns:
+        ProcessPoolExecutor | None: Pool of parse_workers processes, None if parsing
+            stays in the crawling process
+    """
+    parse_workers = config.get_processing_options().parse_workers
+    if not parse_workers:
+        return None
+    return ProcessPoolExecutor(parse_workers, initializer=init_parse_worker, initargs=(config,))
+
+
+class AsyncCrawler(Crawler):
+    """
+    Crawler that requests seed pages concurrently.
+    """
+
+    def __init__(self, config: Config, limiter: HostLimiter | None = None) -> None:
+        """
+        Initialize an instance of the AsyncCrawler class.
+
+        Args:
+            config (Config): Configuration
+            limiter (HostLimiter | None): Limiter of in-flight requests per host
+        """
+        super().__init__(config)
+        self.limiter = limiter or HostLimiter(config.get_network_options().max_requests_per_host)
+
+    async def find_articles_async(self, found: asyncio.Queue | None = None) -> None:
+        """
+        Find articles requesting all seed pages of a round at once.
+
+        Urls listed in sitemaps and feeds come first. Pages of seed urls are
+        read in the same rounds as by Crawler and handled in the order of the
+        config, so article ids do not depend on which page arrives first.
+        Every new url is put into the queue as soon as its seed page is
+        handled, and pending seed pages are dropped once enough articles are
+        found.
+
+        Args:
+            found (asyncio.Queue | None): Queue receiving article ids and urls
+        """
+        for article_id, url in enumerate(await asyncio.to_thread(self._discover_urls), 1):
+            if found is not None:
+                await found.put((article_id, url))
+        seed_urls = self.get_search_urls()
+        for page in range(1, self.config.get_crawling_options().max_seed_pages + 1):
+            if not seed_urls or len(self.urls) >= self.config.get_num_articles():
+                return
+            seed_urls = await self._read_seed_pages(seed_urls, page, found)
+
+    async def _read_seed_pages(self, seed_urls: list[str], page: int,
+                               found: asyncio.Queue | None) -> list[str]:
+        """
+        Request a page of every seed url at once and collect article urls in seed order.
+
+        Args:
+            seed_urls (list[str]): Seed urls
+            page (int): Page number, starting with 1
+            found (asyncio.Queue | None): Queue receiving article ids and urls
+
+        Returns:
+            list[str]: Seed urls whose next page is worth reading
+        """
+        requests_to_pages = [
+            asyncio.create_task(make_request_async(self._get_page_url(seed_url, page),
+                                                   self.config, self.limiter))
+            for seed_url in seed_urls
+        ]
+        next_seed_urls = []
+        try:
+            for seed_url, request_to_page in zip(seed_urls, requests_to_pages):
+                if len(self.urls) >= self.config.get_num_articles():
+                    break
+                first_id = len(self.urls) + 1
+                new_urls, has_next_page = self._handle_seed_page(seed_url, page,
+                                                                 await request_to_page)
+                if has_next_page:
+                    next_seed_urls.append(seed_url)
+                for article_id, url in enumerate(new_urls, first_id):
+                    if found is not None:
+                        await found.put((article_id, url))
+        finally:
+            for request_to_page in requests_to_pages:
+                request_to_page.cancel()
+        return next_seed_urls
+
+    def find_articles(self) -> None:
+        """
+        Find articles.
+        """
+        asyncio.run(self.find_articles_async())
+
+
+class AsyncHTMLParser(HTMLParser):
+    """
+    HTMLParser that does not block the event loop while requesting an article.
+    """
+
+    def __init__(self, full_url: str, article_id: int, config: Config,
+                 limiter: HostLimiter | None = None, executor: Executor | None = None) -> None:
+        """
+        Initialize an instance of the AsyncHTMLParser class.
+
+        Args:
+            full_url (str): Site url
+            article_id (int): Article id
+            config (Config): Configuration
+            limiter (HostLimiter | None): Limiter of in-flight requests per host
+            executor (Executor | None): Pool of processes parsing HTML, as created by
+                create_parse_pool
+        """
+        super().__init__(full_url, article_id, config)
+        self.limiter = limiter or HostLimiter(config.get_network_options().max_requests_per_host)
+        self.executor = executor
+
+    async def parse_async(self) -> Union[Article, bool, list]:
+        """
+        Parse the article.
+
+        Returns:
+            Union[Article, bool, list]: Article instance
+        """
+        if self.article.url is None:
+            return False
+        response = await make_request_async(self.article.url, self.config, self.limiter, True)
+        if self.executor is None or not response.ok:
+            return self.parse_response(response)
+        with self.config.get_metrics().measure('parse'):
+            self.article = await asyncio.get_running_loop().run_in_executor(
+                self.executor, parse_in_worker,
+                self.article.url, self.article.article_id, response.content)
+        return self.article
+
+    def parse(self) -> Union[Article, bool, list]:
+        """
+        Parse each article.
+
+        Returns:
+            Union[Article, bool, list]: Article instance
+        """
+        return asyncio.run(self.parse_async())
+
+
+async def run_stages(*stages: Awaitable) -> list[Any]:
+    """
+    Run stages of a pipeline at once, stopping all of them as soon as one fails.
+
+    Stages wait for each other through queues, so a failed stage would leave
+    the rest waiting forever. Instead, the other stages are cancelled and
+    the error of the failed one is raised.
+
+    Args:
+        *stages (Awaitable): Stages to run
+
+    Returns:
+        list[Any]: Results of the stages in the given order
+    """
+    tasks = [asyncio.ensure_future(stage) for stage in stages]
+    try:
+        done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+        for task in done:
+            if (error := task.exception()) is not None:
+                raise error
+        return [task.result() for task in tasks]
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def scrape_async(config: Config) -> int:
+    """
+    Find, parse and save articles as a stream of overlapping stages.
+
+    The crawler feeds article urls into a bounded queue as seed pages arrive,
+    a pool of parser workers fetches and parses them, and a writer saves
+    parsed articles. Bounded queues keep fast stages from running ahead.
+    When parse_workers is set, HTML is parsed in a pool of processes, so
+    parsing uses all cores while the event loop keeps fetching.
+    Articles are saved in crawl order; pages that still fail after retries,
+    pages that cannot be parsed and near-duplicates of saved articles are
+    left out and later articles take their ids, so ids have no gaps.
+    Signatures of near-duplicate detection are computed by the parse stage,
+    in the parsing pool or in a thread, so the event loop never hashes
+    texts. If a stage fails, the other stages are stopped and its error is
+    raised. In incremental mode new articles continue the ids of the
+    manifest and unchanged ones are not written.
+    Durations of every phase are collected in the metrics of the configuration.
+
+    Args:
+        config (Config): Configuration
+
+    Returns:
+        int: Number of saved articles
+    """
+    limiter = HostLimiter(config.get_network_options().max_requests_per_host)
+    crawler = AsyncCrawler(config, limiter)
+    # Enough workers to keep every allowed request in flight and every parsing process busy
+    workers = (config.get_network_options().max_requests_per_host
+               + config.get_processing_options().parse_workers)
+    metrics = config.get_metrics()
+    found: asyncio.Queue = asyncio.Queue(maxsize=2 * workers)
+    parsed: asyncio.Queue = asyncio.Queue(maxsize=2 * workers)
+
+    executor = create_parse_pool(config)
+    loop = asyncio.get_running_loop()
+
+    async def find_articles() -> None:
+        await crawler.find_articles_async(found)
+        for _ in range(workers):
+            await found.put(None)
+
+    async def parse_articles() -> None:
+        while (item := await found.get()) is not None:
+            article_id, url = item
+            parser = AsyncHTMLParser(url, article_id, config, limiter, executor)
+            try:
+                article: Union[Article, bool, list] = await parser.parse_async()
+            except UNPARSEABLE_PAGE_ERRORS as error:
+                logger.warning('Skipping %s that cannot be parsed: %r', url, error)
+                article = False
+            signature = None
+            if config.get_duplicate_index() is not None and isinstance(article, Article):
+                signature = await loop.run_in_executor(executor, minhash, article.text or '')
+            await parsed.put((article_id, article, signature))
+
+    async def parse_all_articles() -> None:
+        await run_stages(*(parse_articles() for _ in range(workers)))
+        await parsed.put(None)
+
+    async def save_articles() -> int:
+        saved = 0
+        next_id = 1
+        pending: dict[int, tuple[Union[Article, bool, list], tuple[int, ...] | None]] = {}
+        while (item := await parsed.get()) is not None:
+            pending[item[0]] = item[1:]
+            while next_id in pending:
+                article, signature = pending.pop(next_id)
+                next_id += 1
+                if accept_article(article, config, saved, signature):
+                    saved += 1
+                    with metrics.measure('write'):
+                        await asyncio.to_thread(write_article, article, config)
+                    metrics.add_article()
+        return saved
+
+    async def report_metrics() -> None:
+        while True:
+            await asyncio.sleep(config.get_processing_options().metrics_interval)
+            logger.info(metrics.get_summary_line())
+
+    metrics.start()
+    reporter = (asyncio.create_task(report_metrics())
+                if config.get_processing_options().metrics_interval else None)
+    try:
+        results = await run_stages(find_articles(), parse_all_articles(), save_articles())
+        saved: int = results[-1]
+        return saved
+    finally:
+        if reporter is not None:
+            reporter.cancel()
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
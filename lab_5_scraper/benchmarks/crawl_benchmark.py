@@ -0,0 +1,240 @@
+"""
+Load-test crawlers and parsers against a local mock of the news site.
+"""
+
+# pylint: disable=protected-access
+import argparse
+import asyncio
+import math
+import multiprocessing
+import pathlib
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.connection import Connection
+from typing import Callable
+from unittest import mock
+
+from core_utils.article import article
+from core_utils.article.article import Article
+from core_utils.constants import CRAWLER_CONFIG_PATH
+from lab_5_scraper import scraper
+from lab_5_scraper.async_scraper import scrape_async
+from lab_5_scraper.benchmarks.mock_site import create_server, MockNewsSite, route_to_server
+from lab_5_scraper.scraper import (
+    Config,
+    Crawler,
+    CrawlerRecursive,
+    HTMLParser,
+    prepare_environment,
+)
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None  # type: ignore[assignment]
+
+
+def get_peak_rss() -> int:
+    """
+    Get peak resident memory of the current process.
+
+    Returns:
+        int: Peak resident memory in bytes, 0 if it cannot be measured
+    """
+    if resource is None:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def serve(site: MockNewsSite, connection: Connection) -> None:
+    """
+    Serve the site, sending the port it listens on back first.
+
+    Args:
+        site (MockNewsSite): Site to serve
+        connection (Connection): Pipe receiving the port
+    """
+    server = create_server(site)
+    connection.send(server.server_port)
+    connection.close()
+    server.serve_forever()
+
+
+def build_config(site: MockNewsSite, server_url: str) -> Config:
+    """
+    Build a configuration crawling every article of the site as fast as it can.
+
+    Args:
+        site (MockNewsSite): Site to crawl
+        server_url (str): Url of the local server
+
+    Returns:
+        Config: Configuration sending requests of the website to the server
+    """
+    config = Config(CRAWLER_CONFIG_PATH)
+    config._seed_urls = site.get_rubric_urls()
+    config._num_articles = site.num_articles
+    config._storage.large_corpus_mode = site.num_articles > 150
+    config._crawling.max_seed_pages = math.ceil(site.num_articles / len(config._seed_urls) /
+                                                site.page_size) + 1
+    config._crawling.sitemap_urls = []
+    config._network.requests_per_second = 0
+    config._storage.use_http_cache = False
+    config._storage.archive_mode = 'off'
+    config._processing.metrics_interval = 0
+    config._init_services()
+    route_to_server(config.get_session_pool().session, server_url,
+                    config.get_network_options().pool_size)
+    return config
+
+
+def run_crawler(config: Config) -> int:
+    """
+    Find articles on seed pages.
+
+    Args:
+        config (Config): Configuration
+
+    Returns:
+        int: Number of found articles
+    """
+    crawler = Crawler(config)
+    crawler.find_articles()
+    return len(crawler.urls)
+
+
+def run_recursive_crawler(config: Config) -> int:
+    """
+    Find articles following links from the home page.
+
+    Args:
+        config (Config): Configuration
+
+    Returns:
+        int: Number of found articles
+    """
+    crawler = CrawlerRecursive(config)
+    crawler.find_articles()
+    return len(crawler.urls)
+
+
+def run_parser(config: Config) -> int:
+    """
+    Request and parse every article of the site one by one.
+
+    Args:
+        config (Config): Configuration
+
+    Returns:
+        int: Number of parsed articles
+    """
+    return sum(isinstance(HTMLParser(MockNewsSite.get_article_url(number), number,
+                                     config).parse(), Article)
+               for number in range(1, config.get_num_articles() + 1))
+
+
+def run_pipeline(config: Config) -> int:
+    """
+    Find, parse and save articles concurrently.
+
+    Args:
+        config (Config): Configuration
+
+    Returns:
+        int: Number of saved articles
+    """
+    return asyncio.run(scrape_async(config))
+
+
+#: Scenarios the benchmark can run
+SCENARIOS: dict[str, Callable[[Config], int]] = {
+    'crawler': run_crawler,
+    'recursive': run_recursive_crawler,
+    'parser': run_parser,
+    'pipeline': run_pipeline,
+}
+
+
+def run_scenario(scenario: str, site: MockNewsSite, server_url: str) -> dict:
+    """
+    Run a scenario in the current process and measure it.
+
+    Args:
+        scenario (str): One of SCENARIOS
+        site (MockNewsSite): Site to crawl
+        server_url (str): Url of the local server
+
+    Returns:
+        dict: Number of articles, seconds, request latency percentiles and peak memory
+    """
+    config = build_config(site, server_url)
+    with tempfile.TemporaryDirectory() as tmp:
+        assets = pathlib.Path(tmp) / 'articles'
+        with mock.patch.object(scraper, 'ASSETS_PATH', assets), \
+                mock.patch.object(article, 'ASSETS_PATH', assets):
+            prepare_environment(assets, config.get_storage_options().large_corpus_mode)
+            start = time.perf_counter()
+            done = SCENARIOS[scenario](config)
+            seconds = time.perf_counter() - start
+    config.get_session_pool().close()
+    request = config.get_metrics().get_report()['phases'].get('request', {})
+    return {
+        'articles': done,
+        'seconds': seconds,
+        'p50_ms': request.get('p50_ms', 0.0),
+        'p99_ms': request.get('p99_ms', 0.0),
+        'peak_rss': get_peak_rss(),
+    }
+
+
+def main(num_articles: int, scenarios: list[str], latency: float, error_rate: float) -> None:
+    """
+    Serve a mock site in a separate process and run every scenario against it.
+
+    Each scenario runs in a fresh process, so peak memory of one scenario
+    does not include memory of another.
+
+    Args:
+        num_articles (int): Number of articles on the site
+        scenarios (list[str]): Scenarios to run
+        latency (float): Number of seconds every response is delayed by
+        error_rate (float): Share of requests answered with 503
+    """
+    site = MockNewsSite(num_articles, latency=latency, error_rate=error_rate)
+    context = multiprocessing.get_context('spawn')
+    receiver, sender = context.Pipe(duplex=False)
+    server = context.Process(target=serve, args=(site, sender), daemon=True)
+    server.start()
+    server_url = f'http://127.0.0.1:{receiver.recv()}'
+    print(f'{num_articles} articles, latency {latency * 1000:.0f}ms, '
+          f'error rate {error_rate:.0%}')
+    print(f'{"scenario":<12}{"articles":>10}{"seconds":>10}{"articles/s":>12}'
+          f'{"p50 ms":>9}{"p99 ms":>9}{"peak MiB":>10}')
+    try:
+        for scenario in scenarios:
+            with ProcessPoolExecutor(1, mp_context=context) as executor:
+                result = executor.submit(run_scenario, scenario, site, server_url).result()
+            rate = result['articles'] / result['seconds'] if result['seconds'] else 0.0
+            print(f'{scenario:<12}{result["articles"]:>10}{result["seconds"]:>10.1f}'
+                  f'{rate:>12.1f}{result["p50_ms"]:>9.1f}{result["p99_ms"]:>9.1f}'
+                  f'{result["peak_rss"] / 1024 / 1024:>10.1f}')
+    finally:
+        server.terminate()
+        server.join()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--articles", type=int, default=1000,
+                        help="Number of articles on the mock site")
+    parser.add_argument("--scenario", choices=list(SCENARIOS), action="append",
+                        help="Scenario to run, all by default")
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="Seconds every response is delayed by")
+    parser.add_argument("--error-rate", type=float, default=0.0,
+                        help="Share of requests answered with 503")
+    args = parser.parse_args()
+    main(args.articles, args.scenario or list(SCENARIOS), args.latency, args.error_rate)
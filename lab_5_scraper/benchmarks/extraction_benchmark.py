@@ -0,0 +1,80 @@
+"""
+Compare parse time and memory of the BeautifulSoup and the lxml extraction paths.
+"""
+
+# pylint: disable=protected-access
+import argparse
+import pathlib
+import timeit
+import tracemalloc
+from typing import Callable
+
+from admin_utils.test_params import SCRAPER_TEST_FILES_FOLDER
+from core_utils.constants import CRAWLER_CONFIG_PATH
+from lab_5_scraper.scraper import Config, HTMLParser
+
+
+def measure(parse: Callable[[], object], repeats: int) -> tuple[float, int]:
+    """
+    Measure time per page and peak Python memory of a parse.
+
+    Memory is traced with tracemalloc, so only Python objects are counted:
+    the BeautifulSoup tree is made of them, while an lxml tree lives in
+    libxml2 and is freed as soon as the page is extracted.
+
+    Args:
+        parse (Callable[[], object]): Parse of a single page
+        repeats (int): Number of parses to average over
+
+    Returns:
+        tuple[float, int]: Milliseconds per page and peak memory in bytes
+    """
+    parse()
+    seconds = timeit.timeit(parse, number=repeats)
+    tracemalloc.start()
+    parse()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return seconds / repeats * 1000, peak
+
+
+def main(page_path: pathlib.Path, repeats: int) -> None:
+    """
+    Parse the page with both extraction paths and print the comparison.
+
+    Args:
+        page_path (pathlib.Path): Path to HTML of an article page
+        repeats (int): Number of parses to average over
+    """
+    html = page_path.read_text(encoding='utf-8')
+    soup_config = Config(CRAWLER_CONFIG_PATH)
+    soup_config._processing.use_fast_extraction = False
+    fast_config = Config(CRAWLER_CONFIG_PATH)
+    fast_config._processing.use_fast_extraction = True
+    if (soup_config.get_processing_options().use_fast_extraction
+            == fast_config.get_processing_options().use_fast_extraction):
+        raise ValueError('Both configurations use the same extraction path')
+
+    soup_parser = HTMLParser('https://ugra-news.ru/article/1/', 1, soup_config)
+    fast_parser = HTMLParser('https://ugra-news.ru/article/1/', 1, fast_config)
+    soup_article = soup_parser.parse_html(html)
+    fast_article = fast_parser.parse_html(html)
+    if vars(soup_article) != vars(fast_article):
+        raise ValueError('Extraction paths produce different articles')
+
+    soup_ms, soup_peak = measure(lambda: soup_parser.parse_html(html), repeats)
+    fast_ms, fast_peak = measure(lambda: fast_parser.parse_html(html), repeats)
+    print(f'{"path":<15}{"ms/page":>10}{"peak KiB":>12}')
+    print(f'{"BeautifulSoup":<15}{soup_ms:>10.3f}{soup_peak / 1024:>12.1f}')
+    print(f'{"lxml rules":<15}{fast_ms:>10.3f}{fast_peak / 1024:>12.1f}')
+    print(f'speed-up {soup_ms / fast_ms:.1f}x, memory {soup_peak / fast_peak:.1f}x less')
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--page", type=pathlib.Path,
+                        default=SCRAPER_TEST_FILES_FOLDER / "article.html",
+                        help="Path to HTML of an article page")
+    parser.add_argument("--repeats", type=int, default=200, help="Number of parses per path")
+    args = parser.parse_args()
+    main(args.page, args.repeats)
@@ -0,0 +1,94 @@
+"""
+Measure cold import time of the entry points and check heavy dependencies stay deferred.
+
+Imports are recorded as they are attempted, so a dependency that is not
+installed still counts if an entry point tries to import it.
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+
+from core_utils.constants import PROJECT_ROOT
+
+#: Modules users start from
+ENTRY_POINTS = ('lab_5_scraper.scraper', 'lab_6_pipeline.pipeline', 'core_utils.visualizer')
+
+#: Dependencies that must be imported on first use only
+DEFERRED_MODULES = ('bs4', 'lxml', 'matplotlib', 'networkx', 'spacy', 'spacy_conll',
+                    'spacy_udpipe', 'stanza')
+
+#: Cold import time of a single entry point, in milliseconds, not to be exceeded
+IMPORT_BUDGET_MS = 500.0
+
+_PROBE = '''
+import json, sys, time
+attempted = set()
+class Recorder:
+    @staticmethod
+    def find_spec(name, path=None, target=None):
+        attempted.add(name.partition('.')[0])
+sys.meta_path.insert(0, Recorder)
+start = time.perf_counter()
+import {module}
+print(json.dumps([(time.perf_counter() - start) * 1000,
+                  sorted(attempted.intersection({deferred!r}))]))
+'''
+
+
+def measure_import(module: str, repeats: int = 3,
+                   deferred: tuple[str, ...] = DEFERRED_MODULES) -> tuple[float, list[str]]:
+    """
+    Import a module in fresh interpreters.
+
+    Args:
+        module (str): Name of the module
+        repeats (int): Number of interpreters to take the fastest import of
+        deferred (tuple[str, ...]): Top-level packages that must not be imported
+
+    Returns:
+        tuple[float, list[str]]: Milliseconds of the fastest import and deferred packages
+            the import tried to load
+    """
+    timings = []
+    attempted: list[str] = []
+    for _ in range(repeats):
+        output = subprocess.run(
+            [sys.executable, '-c', _PROBE.format(module=module, deferred=deferred)],
+            cwd=PROJECT_ROOT, capture_output=True, text=True, check=True
+        ).stdout
+        milliseconds, attempted = json.loads(output)
+        timings.append(milliseconds)
+    return min(timings), attempted
+
+
+def main(repeats: int, budget: float) -> int:
+    """
+    Import every entry point and print the comparison with the budget.
+
+    Args:
+        repeats (int): Number of interpreters per entry point
+        budget (float): Cold import time of a single entry point not to be exceeded
+
+    Returns:
+        int: Exit code, 1 if an entry point is over budget or imports a deferred module
+    """
+    failed = False
+    print(f'{"entry point":<26}{"ms":>8}  deferred modules imported')
+    for module in ENTRY_POINTS:
+        milliseconds, attempted = measure_import(module, repeats)
+        failed = failed or milliseconds > budget or bool(attempted)
+        print(f'{module:<26}{milliseconds:>8.1f}  {", ".join(attempted) or "-"}')
+    print(f'budget {budget:.0f} ms: {"exceeded" if failed else "met"}')
+    return int(failed)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeats", type=int, default=5,
+                        help="Number of interpreters per entry point")
+    parser.add_argument("--budget", type=float, default=IMPORT_BUDGET_MS,
+                        help="Cold import time of a single entry point in milliseconds")
+    args = parser.parse_args()
+    sys.exit(main(args.repeats, args.budget))
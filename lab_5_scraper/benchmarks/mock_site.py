@@ -0,0 +1,429 @@
+"""
+Local HTTP server generating an ugra-news-shaped site of any size.
+"""
+
+import datetime
+import math
+import random
+import string
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Mapping
+from urllib.parse import parse_qs, urlsplit
+
+import lxml.html
+import requests
+from requests.adapters import HTTPAdapter
+
+from admin_utils.test_params import SCRAPER_TEST_FILES_FOLDER
+
+#: Website the generated pages pretend to belong to
+WEBSITE = 'https://ugra-news.ru'
+
+#: Rubrics articles are spread over, one after another
+RUBRICS = ('society', 'politics', 'economics', 'health', 'culture', 'sport')
+
+#: Month names in the genitive case, as the site writes dates
+MONTHS = ('января', 'февраля', 'марта', 'апреля', 'мая', 'июня',
+          'июля', 'августа', 'сентября', 'октября', 'ноября', 'декабря')
+
+#: Words generated texts are made of
+WORDS = ('Югра', 'город', 'жители', 'администрация', 'проект', 'школа', 'библиотека',
+         'открытие', 'ремонт', 'дорога', 'парк', 'спорт', 'турнир', 'больница', 'врачи',
+         'бюджет', 'строительство', 'округ', 'район', 'праздник', 'выставка', 'музей',
+         'весной', 'сегодня', 'новый', 'большой', 'центральный', 'городской', 'рассказали',
+         'сообщили', 'завершили', 'начали', 'планируют', 'получили', 'в', 'на', 'для', 'и')
+
+#: Authors of generated articles
+AUTHORS = ('Анна Иванова', 'Сергей Петров', 'Мария Смирнова', 'Олег Кузнецов')
+
+#: Publication time of the newest article
+NEWEST_DATE = datetime.datetime(2025, 4, 12, 14, 30)
+
+#: Time between two consecutive articles
+ARTICLE_INTERVAL = datetime.timedelta(minutes=37)
+
+#: Number of newest articles linked from the home page
+HOME_PAGE_ARTICLES = 10
+
+
+def _fill(tree: lxml.html.HtmlElement, xpath: str, marker: str) -> None:
+    """
+    Replace contents of the first element matching the XPath with a template marker.
+
+    Args:
+        tree (lxml.html.HtmlElement): Page tree
+        xpath (str): Element to replace contents of
+        marker (str): Name of the marker
+    """
+    element = tree.xpath(xpath)[0]
+    for child in list(element):
+        element.remove(child)
+    element.text = f'${{{marker}}}'
+
+
+def build_templates() -> tuple[string.Template, string.Template]:
+    """
+    Turn the article page fixture into templates of article and rubric pages.
+
+    Returns:
+        tuple[string.Template, string.Template]: Article page and rubric page templates
+    """
+    fixture = (SCRAPER_TEST_FILES_FOLDER / 'article.html').read_text(encoding='utf-8')
+    tree = lxml.html.document_fromstring(fixture)
+    _fill(tree, '//head/title', 'page_title')
+    _fill(tree, "//div[@class='header__top']", 'banner')
+    _fill(tree, "//div[@class='slider']", 'slider')
+    _fill(tree, '//aside', 'related')
+    rubric_tree = lxml.html.document_fromstring(lxml.html.tostring(tree))
+    _fill(rubric_tree, '//main', 'main')
+    _fill(tree, "//div[@class='news-detail']/h1", 'title')
+    _fill(tree, "//div[@class='author-news__info-authors']", 'author')
+    _fill(tree, "//span[@class='author-news__info-text']", 'date')
+    _fill(tree, "//div[@class='news-detail__detail-text']", 'text')
+    _fill(tree, "//div[@class='photo-report-detail-share-tags']", 'tags')
+    return (string.Template('<!DOCTYPE html>\n' + lxml.html.tostring(tree, encoding='unicode')),
+            string.Template('<!DOCTYPE html>\n' +
+                            lxml.html.tostring(rubric_tree, encoding='unicode')))
+
+
+class MockNewsSite:
+    """
+    Generate pages of a news site with a given number of articles.
+
+    Article ``n`` belongs to rubric ``RUBRICS[n % len(RUBRICS)]``, is
+    published ``ARTICLE_INTERVAL`` after article ``n - 1`` and links to
+    its neighbours, so both seed crawlers and recursive crawlers reach
+    every article. Rubric pages list the newest articles first and are
+    paginated with ``?PAGEN_1=N``. Contents are derived from the article
+    number only, so every request of a page returns the same page.
+    """
+
+    def __init__(self, num_articles: int, page_size: int = 20, paragraphs: int = 6,
+                 latency: float = 0.0, error_rate: float = 0.0) -> None:
+        """
+        Initialize an instance of the MockNewsSite class.
+
+        Args:
+            num_articles (int): Number of articles on the site
+            page_size (int): Number of article cards on a rubric page
+            paragraphs (int): Number of paragraphs in an article
+            latency (float): Number of seconds every response is delayed by
+            error_rate (float): Share of requests answered with 503
+        """
+        self.num_articles = num_articles
+        self.page_size = page_size
+        self.paragraphs = paragraphs
+        self.latency = latency
+        self.error_rate = error_rate
+        self._article_template, self._rubric_template = build_templates()
+        self._random = threading.local()
+
+    def __getstate__(self) -> dict:
+        """
+        Get picklable state, leaving out random generators of serving threads.
+
+        Returns:
+            dict: Site options and page templates
+        """
+        return {name: value for name, value in self.__dict__.items() if name != '_random'}
+
+    def __setstate__(self, state: dict) -> None:
+        """
+        Restore the site in another process.
+
+        Args:
+            state (dict): Site options and page templates
+        """
+        self.__dict__.update(state)
+        self._random = threading.local()
+
+    def get_rubric_urls(self) -> list[str]:
+        """
+        Get first pages of all rubrics.
+
+        Returns:
+            list[str]: Seed urls
+        """
+        return [f'{WEBSITE}/rubrics/{rubric}/' for rubric in RUBRICS]
+
+    @staticmethod
+    def get_article_url(number: int) -> str:
+        """
+        Get the url of an article.
+
+        Args:
+            number (int): Article number, starting with 1
+
+        Returns:
+            str: Article url
+        """
+        return f'{WEBSITE}/article/{RUBRICS[number % len(RUBRICS)]}-{number}/'
+
+    def get_article(self, number: int) -> dict:
+        """
+        Generate fields of an article.
+
+        Args:
+            number (int): Article number, starting with 1
+
+        Returns:
+            dict: Title, author, date, paragraphs and topics of the article
+        """
+        rng = random.Random(number)
+        paragraphs = [' '.join(rng.choice(WORDS) for _ in range(rng.randint(20, 60))).capitalize()
+                      + '.' for _ in range(self.paragraphs)]
+        date = NEWEST_DATE - ARTICLE_INTERVAL * (self.num_articles - number)
+        return {
+            'title': f'Новость номер {number}: ' + ' '.join(rng.choice(WORDS) for _ in range(5)),
+            'author': AUTHORS[number % len(AUTHORS)],
+            'date': f'{date.day} {MONTHS[date.month - 1]} {date.year} {date:%H:%M}',
+            'paragraphs': paragraphs,
+            'topics': [RUBRICS[number % len(RUBRICS)].capitalize(), f'Тема {number % 7}'],
+        }
+
+    def _get_rubric_articles(self, rubric: str, page: int) -> tuple[list[int], int]:
+        """
+        Get numbers of articles listed on a page of a rubric.
+
+        Args:
+            rubric (str): Rubric
+            page (int): Page number, starting with 1
+
+        Returns:
+            tuple[list[int], int]: Article numbers, newest first, and the last page number
+        """
+        remainder = RUBRICS.index(rubric)
+        newest = self.num_articles - (self.num_articles - remainder) % len(RUBRICS)
+        numbers = range(newest, 0, -len(RUBRICS))
+        start = (page - 1) * self.page_size
+        return (list(numbers[start:start + self.page_size]),
+                max(1, math.ceil(len(numbers) / self.page_size)))
+
+    def _render_links(self, class_name: str, numbers: list[int]) -> str:
+        """
+        Render links to articles.
+
+        Args:
+            class_name (str): Class of the links
+            numbers (list[int]): Article numbers
+
+        Returns:
+            str: HTML of the links
+        """
+        return ''.join(f'<a class="{class_name}" '
+                       f'href="{self.get_article_url(number).removeprefix(WEBSITE)}">'
+                       f'Новость {number}</a>'
+                       for number in numbers if 1 <= number <= self.num_articles)
+
+    def _render_frame(self, number: int) -> dict[str, str]:
+        """
+        Render blocks shared by all pages.
+
+        Args:
+            number (int): Number of the article the page is about, 0 for other pages
+
+        Returns:
+            dict[str, str]: Banner, slider and related news blocks
+        """
+        newest = self.num_articles
+        return {
+            'banner': f'<a class="header__top-banner-item" href="{self.get_article_url(newest)}">'
+                      f'Главное</a>',
+            'slider': self._render_links('slider__swiper-slide swiper-slide '
+                                         'slider__swiper-slide-js swiper-slide-next',
+                                         [number - 3] if number else [newest - 1]),
+            'related': (self._render_links('line-news', [number - 1, number + 1]) +
+                        self._render_links('news-card photo', [number - 2])) if number else '',
+        }
+
+    def render_article(self, number: int) -> str:
+        """
+        Render an article page.
+
+        Args:
+            number (int): Article number, starting with 1
+
+        Returns:
+            str: HTML of the page
+        """
+        fields = self.get_article(number)
+        text = ''.join(f'<p>{paragraph}</p>' for paragraph in fields['paragraphs'])
+        if number > 5:
+            text += (f'<p>Ранее <a href="{self.get_article_url(number - 5)}">'
+                     f'сообщалось</a>.</p>')
+        tags = ''.join(f'<a class="tags photo-report-detail-share-tags__item" '
+                       f'href="/tags/{idx}/">{topic}</a>'
+                       for idx, topic in enumerate(fields['topics']))
+        return self._article_template.substitute(
+            page_title=fields['title'], title=fields['title'], author=fields['author'],
+            date=fields['date'], text=text, tags=tags, **self._render_frame(number))
+
+    def render_rubric(self, rubric: str, page: int) -> str:
+        """
+        Render a page of a rubric.
+
+        Args:
+            rubric (str): Rubric
+            page (int): Page number, starting with 1
+
+        Returns:
+            str: HTML of the page
+        """
+        numbers, last_page = self._get_rubric_articles(rubric, page)
+        pages = sorted({*range(page + 1, min(page + 2, last_page) + 1), last_page} - {page})
+        pager = ''.join(f'<a href="/rubrics/{rubric}/?PAGEN_1={number}">{number}</a>'
+                        for number in pages)
+        main = (self._render_links('news-card photo', numbers) +
+                f'<div class="pagination">{pager}</div>')
+        return self._rubric_template.substitute(page_title=rubric, main=main,
+                                                **self._render_frame(0))
+
+    def render_home(self) -> str:
+        """
+        Render the home page.
+
+        Returns:
+            str: HTML of the page
+        """
+        newest = range(self.num_articles, max(0, self.num_articles - HOME_PAGE_ARTICLES), -1)
+        main = (self._render_links('line-news', list(newest)) +
+                self._render_links('news-card photo', list(newest)))
+        return self._rubric_template.substitute(page_title='Новости Югры', main=main,
+                                                **self._render_frame(0))
+
+    def handle(self, path: str) -> tuple[int, str]:
+        """
+        Answer a request of a path.
+
+        Args:
+            path (str): Path with query of the request
+
+        Returns:
+            tuple[int, str]: Status code and HTML
+        """
+        if self.latency:
+            time.sleep(self.latency)
+        if not hasattr(self._random, 'generator'):
+            self._random.generator = random.Random(threading.get_ident())
+        if self.error_rate and self._random.generator.random() < self.error_rate:
+            return 503, '<html><body>Service unavailable</body></html>'
+        parts = urlsplit(path)
+        segments = [segment for segment in parts.path.split('/') if segment]
+        if not segments:
+            return 200, self.render_home()
+        if len(segments) == 2 and segments[0] == 'rubrics' and segments[1] in RUBRICS:
+            page = int(parse_qs(parts.query).get('PAGEN_1', ['1'])[0])
+            return 200, self.render_rubric(segments[1], page)
+        if len(segments) == 2 and segments[0] == 'article':
+            rubric, _, number = segments[1].rpartition('-')
+            if number.isdigit() and 1 <= int(number) <= self.num_articles and \
+                    rubric == RUBRICS[int(number) % len(RUBRICS)]:
+                return 200, self.render_article(int(number))
+        return 404, '<html><body>Not found</body></html>'
+
+
+class MockSiteHandler(BaseHTTPRequestHandler):
+    """
+    Serve pages of the site attached to the server.
+    """
+
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def do_GET(self) -> None:  # pylint: disable=invalid-name
+        """
+        Respond to a GET request.
+        """
+        status, html = self.server.site.handle(self.path)  # type: ignore[attr-defined]
+        body = html.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_message(self, *args: object) -> None:
+        """
+        Keep output clean.
+
+        Args:
+            *args (object): Ignored log arguments
+        """
+
+
+def create_server(site: MockNewsSite, port: int = 0) -> ThreadingHTTPServer:
+    """
+    Create a server of the site on the loopback interface.
+
+    Args:
+        site (MockNewsSite): Site to serve
+        port (int): Port to listen on, 0 for any free port
+
+    Returns:
+        ThreadingHTTPServer: Server ready to serve_forever
+    """
+    server = ThreadingHTTPServer(('127.0.0.1', port), MockSiteHandler)
+    server.daemon_threads = True
+    server.site = site  # type: ignore[attr-defined]
+    return server
+
+
+class LocalSiteAdapter(HTTPAdapter):
+    """
+    Send requests of the website to the local server instead.
+    """
+
+    def __init__(self, server_url: str, **kwargs: Any) -> None:
+        """
+        Initialize an instance of the LocalSiteAdapter class.
+
+        Args:
+            server_url (str): Url of the local server
+            **kwargs (Any): Options of the adapter
+        """
+        super().__init__(**kwargs)
+        self.server_url = server_url.rstrip('/')
+
+    def send(self, request: requests.PreparedRequest,  # pylint: disable=too-many-arguments
+             stream: bool = False,
+             timeout: None | float | tuple[float, float] | tuple[float, None] = None,
+             verify: bool | str = True,
+             cert: None | bytes | str | tuple[bytes | str, bytes | str] = None,
+             proxies: Mapping[str, str] | None = None) -> requests.Response:
+        """
+        Send the request to the local server, the response keeps the url of the website.
+
+        Args:
+            request (requests.PreparedRequest): Request to the website
+            stream (bool): Whether to stream the body
+            timeout (None | float | tuple[float, float] | tuple[float, None]): Timeout
+            verify (bool | str): Whether to verify the certificate, or a path to CA bundle
+            cert (None | bytes | str | tuple[bytes | str, bytes | str]): Client certificate
+            proxies (Mapping[str, str] | None): Proxies by scheme
+
+        Returns:
+            requests.Response: Response of the local server
+        """
+        url = request.url or ''
+        request.url = self.server_url + url.removeprefix(WEBSITE)
+        response = super().send(request, stream, timeout, verify, cert, proxies)
+        response.url = url
+        return response
+
+
+def route_to_server(session: requests.Session, server_url: str, pool_size: int = 10) -> None:
+    """
+    Make a session send requests of the website to the local server.
+
+    Args:
+        session (requests.Session): Session to reroute
+        server_url (str): Url of the local server
+        pool_size (int): Maximum number of connections kept open to the server
+    """
+    session.mount(WEBSITE, LocalSiteAdapter(server_url, pool_connections=pool_size,
+                                            pool_maxsize=pool_size, pool_block=True))
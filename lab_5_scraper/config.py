@@ -0,0 +1,567 @@
+"""
+Configuration of the scraper: unpacking, validation and services shared by its users.
+"""
+
+# pylint: disable=too-many-instance-attributes
+import datetime
+import json
+import pathlib
+import threading
+from typing import Any, Callable, TypeVar
+
+from core_utils.config_dto import (
+    ConfigDTO,
+    CrawlingOptions,
+    NetworkOptions,
+    ProcessingOptions,
+    StorageOptions,
+)
+from core_utils.constants import ASSETS_PATH
+from lab_5_scraper.archive import ResponseArchive
+from lab_5_scraper.dedup import NearDuplicateIndex
+from lab_5_scraper.extraction import ExtractionRules
+from lab_5_scraper.http_cache import ResponseCache
+from lab_5_scraper.http_session import SessionPool
+from lab_5_scraper.manifest import CrawlManifest
+from lab_5_scraper.metrics import ScrapeMetrics
+from lab_5_scraper.resilience import RequestGuards
+from lab_5_scraper.scoring import DEFAULT_FRONTIER_WEIGHTS
+from lab_5_scraper.shared_frontier import SharedFrontier
+
+WEBSITE = 'https://ugra-news.ru'
+HTTP_CACHE_PATH = pathlib.Path(ASSETS_PATH).parent / 'http_cache'
+ARCHIVE_PATH = pathlib.Path(ASSETS_PATH).parent / 'crawl_archive.warc'
+ARCHIVE_MODES = ('off', 'record', 'replay')
+MANIFEST_PATH = pathlib.Path(ASSETS_PATH).parent / 'crawl_manifest.jsonl'
+FRONTIER_PATH = pathlib.Path(ASSETS_PATH).parent / 'crawl_frontier.sqlite'
+
+#: Service of an optional feature created by Config on first use
+_FeatureT = TypeVar('_FeatureT')
+
+
+class IncorrectSeedURLError(Exception):
+    """
+    Raised when seed URL is not a valid URL
+    """
+
+
+class NumberOfArticlesOutOfRangeError(Exception):
+    """
+    Raised when number of articles is out of range from 1 to 150
+    """
+
+
+class IncorrectNumberOfArticlesError(Exception):
+    """
+    Raised when total number of articles to parse is not integer or is less than 0
+    """
+
+
+class IncorrectHeadersError(Exception):
+    """
+    Raised when headers are not a dictionary
+    """
+
+
+class IncorrectEncodingError(Exception):
+    """
+    Raised when encoding is not a string
+    """
+
+
+class IncorrectTimeoutError(Exception):
+    """
+    Raised when timeout value is not a positive integer less than 60
+    """
+
+
+class IncorrectVerifyError(Exception):
+    """
+    Raised when verify certificate value is not True or False
+    """
+
+
+class IncorrectConcurrencyError(Exception):
+    """
+    Raised when the number of simultaneous requests per host is not a positive integer
+    """
+
+
+class IncorrectSessionError(Exception):
+    """
+    Raised when connection pool settings are malformed
+    """
+
+
+class IncorrectRateLimitError(Exception):
+    """
+    Raised when rate limit settings are malformed
+    """
+
+
+class IncorrectRetryError(Exception):
+    """
+    Raised when back-off or circuit breaker settings are malformed
+    """
+
+
+class IncorrectSeedPagesError(Exception):
+    """
+    Raised when the number of pages read per seed url is not a positive integer
+    """
+
+
+class IncorrectDiscoveryError(Exception):
+    """
+    Raised when sitemap urls or the earliest modification date are malformed
+    """
+
+
+class IncorrectArchiveModeError(Exception):
+    """
+    Raised when archive mode is not one of off, record or replay
+    """
+
+
+class IncorrectFrontierWeightsError(Exception):
+    """
+    Raised when frontier weights are not non-negative numbers of known signals
+    """
+
+
+class IncorrectExtractionRulesError(Exception):
+    """
+    Raised when extraction rules are not rules of known fields
+    """
+
+
+def _is_count(value: Any, minimum: int) -> bool:
+    """
+    Check that a value is an integer not less than the minimum.
+
+    Args:
+        value (Any): Value of a parameter
+        minimum (int): Smallest allowed value
+
+    Returns:
+        bool: Whether the value is an integer, but not a bool, not less than the minimum
+    """
+    return isinstance(value, int) and not isinstance(value, bool) and value >= minimum
+
+
+def _is_non_negative_number(value: Any) -> bool:
+    """
+    Check that a value is a non-negative number.
+
+    Args:
+        value (Any): Value of a parameter
+
+    Returns:
+        bool: Whether the value is an integer or a float, but not a bool, not less than 0
+    """
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and value >= 0
+
+
+class Config:
+    """
+    Class for unpacking and validating configurations.
+    """
+
+    def __init__(self, path_to_config: pathlib.Path) -> None:
+        """
+        Initialize an instance of the Config class.
+
+        Args:
+            path_to_config (pathlib.Path): Path to configuration.
+        """
+        self.path_to_config = path_to_config
+        config = self._extract_config_content()
+        self._seed_urls = config.seed_urls
+        self._num_articles = config.total_articles
+        self._headers = config.headers
+        self._encoding = config.encoding
+        self._timeout = config.timeout
+        self._should_verify_certificate = config.should_verify_certificate
+        self._headless_mode = config.headless_mode
+        self._network = config.network
+        self._storage = config.storage
+        self._crawling = config.crawling
+        self._processing = config.processing
+        self._validate_config_content()
+        self._init_services()
+
+    def _init_services(self) -> None:
+        """
+        Create metrics, connection pool, guards of requests and compiled extraction rules.
+
+        Services of optional features, such as the cache, the archive, the index of
+        near-duplicates, the manifest and the shared frontier, are dropped and created on
+        first use, and only if their feature is enabled.
+        """
+        self._metrics = ScrapeMetrics()
+        self._session_pool = SessionPool(self._headers, self._network.pool_size,
+                                         self._network.keep_alive, 0, self._metrics)
+        self._request_guards = RequestGuards(self._network)
+        self._compiled_rules = ExtractionRules(self._processing.extraction_rules)
+        self._feature_lock = threading.Lock()
+        self._features: dict[str, Any] = {}
+
+    def __getstate__(self) -> dict:
+        """
+        Get picklable state, leaving out open connections and locks.
+
+        Returns:
+            dict: Configuration values
+        """
+        return {name: value for name, value in self.__dict__.items()
+                if name not in ('_metrics', '_session_pool', '_request_guards', '_compiled_rules',
+                                '_feature_lock', '_features')}
+
+    def __setstate__(self, state: dict) -> None:
+        """
+        Restore configuration in another process with its own services.
+
+        Args:
+            state (dict): Configuration values
+        """
+        self.__dict__.update(state)
+        self._init_services()
+
+    def _get_feature(self, name: str, create: Callable[[], _FeatureT]) -> _FeatureT:
+        """
+        Get service of an optional feature, creating it on first use.
+
+        Args:
+            name (str): Name of the feature
+            create (Callable[[], _FeatureT]): Function creating the service
+
+        Returns:
+            _FeatureT: Service shared by everyone using this configuration
+        """
+        with self._feature_lock:
+            if name not in self._features:
+                self._features[name] = create()
+            feature: _FeatureT = self._features[name]
+            return feature
+
+    def _extract_config_content(self) -> ConfigDTO:
+        """
+        Get config values.
+
+        Returns:
+            ConfigDTO: Config values
+        """
+        with open(self.path_to_config, encoding='utf-8') as file:
+            config = json.load(file)
+        return ConfigDTO(**config)
+
+    def _validate_config_content(self) -> None:
+        """
+        Ensure configuration parameters are not corrupt.
+        """
+        if (not isinstance(self._seed_urls, list) or
+                not all(isinstance(url, str) for url in self._seed_urls)):
+            raise IncorrectSeedURLError('Parameter _seed_urls of Config is malformed')
+        if not all(url.startswith(WEBSITE) for url in self._seed_urls):
+            raise IncorrectSeedURLError('Not all URLs belong to the original website')
+        if not _is_count(self._num_articles, 0):
+            raise IncorrectNumberOfArticlesError('Invalid number of articles to pass')
+        if not isinstance(self._storage.large_corpus_mode, bool):
+            raise IncorrectNumberOfArticlesError('large_corpus_mode is not an instance of bool')
+        if self._num_articles > 150 and not self._storage.large_corpus_mode:
+            raise NumberOfArticlesOutOfRangeError(
+                'Number of articles is out of range: should be between 1 and 150')
+        if not isinstance(self._headers, dict):
+            raise IncorrectHeadersError('Headers is not an instance of dict')
+        if not isinstance(self._encoding, str):
+            raise IncorrectEncodingError('Encoding is not an instance of str')
+        if self._timeout not in range(1, 61):
+            raise IncorrectTimeoutError('Timeout is out of range')
+        if not isinstance(self._should_verify_certificate, bool):
+            raise IncorrectVerifyError('should_verify_certificate is not an instance of bool')
+        if not isinstance(self._headless_mode, bool):
+            raise IncorrectVerifyError('headless_mode is not an instance of bool')
+        self._validate_network()
+        self._validate_storage()
+        self._validate_crawling()
+        self._validate_processing()
+
+    def _validate_network(self) -> None:
+        """
+        Ensure settings of connections, request rate and retries are not corrupt.
+        """
+        network = self._network
+        if not _is_count(network.max_requests_per_host, 1):
+            raise IncorrectConcurrencyError('max_requests_per_host is not a positive integer')
+        if not _is_count(network.pool_size, 1):
+            raise IncorrectSessionError('pool_size is not a positive integer')
+        if not isinstance(network.keep_alive, bool):
+            raise IncorrectSessionError('keep_alive is not an instance of bool')
+        if not _is_count(network.max_retries, 0):
+            raise IncorrectSessionError('max_retries is not a non-negative integer')
+        if not _is_non_negative_number(network.requests_per_second):
+            raise IncorrectRateLimitError('requests_per_second is not a non-negative number')
+        if not _is_count(network.burst_size, 1):
+            raise IncorrectRateLimitError('burst_size is not a positive integer')
+        if not isinstance(network.adaptive_rate_limit, bool):
+            raise IncorrectRateLimitError('adaptive_rate_limit is not an instance of bool')
+        if not _is_non_negative_number(network.backoff_factor):
+            raise IncorrectRetryError('backoff_factor is not a non-negative number')
+        if not _is_count(network.circuit_breaker_threshold, 0):
+            raise IncorrectRetryError('circuit_breaker_threshold is not a non-negative integer')
+        if not _is_non_negative_number(network.circuit_breaker_timeout):
+            raise IncorrectRetryError('circuit_breaker_timeout is not a non-negative number')
+
+    def _validate_storage(self) -> None:
+        """
+        Ensure settings of files kept between requests and runs are not corrupt.
+        """
+        storage = self._storage
+        if not isinstance(storage.use_http_cache, bool):
+            raise IncorrectVerifyError('use_http_cache is not an instance of bool')
+        if storage.archive_mode not in ARCHIVE_MODES:
+            raise IncorrectArchiveModeError('archive_mode is not one of off, record or replay')
+        if not isinstance(storage.incremental_mode, bool):
+            raise IncorrectVerifyError('incremental_mode is not an instance of bool')
+        if not isinstance(storage.skip_near_duplicates, bool):
+            raise IncorrectVerifyError('skip_near_duplicates is not an instance of bool')
+
+    def _validate_crawling(self) -> None:
+        """
+        Ensure settings of finding article urls are not corrupt.
+        """
+        crawling = self._crawling
+        if not _is_count(crawling.max_seed_pages, 1):
+            raise IncorrectSeedPagesError('max_seed_pages is not a positive integer')
+        if (not isinstance(crawling.sitemap_urls, list) or
+                not all(isinstance(url, str) and url.startswith(WEBSITE)
+                        for url in crawling.sitemap_urls)):
+            raise IncorrectDiscoveryError('sitemap_urls is not a list of urls of the website')
+        if crawling.lastmod_since is not None:
+            try:
+                datetime.date.fromisoformat(crawling.lastmod_since)
+            except (TypeError, ValueError) as error:
+                raise IncorrectDiscoveryError('lastmod_since is not a YYYY-MM-DD date') from error
+        if not isinstance(crawling.shared_frontier, bool):
+            raise IncorrectVerifyError('shared_frontier is not an instance of bool')
+        if crawling.shared_frontier and self._storage.incremental_mode:
+            raise IncorrectVerifyError('shared_frontier cannot be combined with incremental_mode')
+        if crawling.frontier_weights is not None and (
+                not isinstance(crawling.frontier_weights, dict) or
+                not set(crawling.frontier_weights) <= set(DEFAULT_FRONTIER_WEIGHTS) or
+                not all(_is_non_negative_number(weight)
+                        for weight in crawling.frontier_weights.values())):
+            raise IncorrectFrontierWeightsError(
+                'frontier_weights is not a dictionary of non-negative weights of '
+                + ', '.join(DEFAULT_FRONTIER_WEIGHTS))
+
+    def _validate_processing(self) -> None:
+        """
+        Ensure settings of downloading and parsing article pages are not corrupt.
+        """
+        processing = self._processing
+        if not _is_count(processing.parse_workers, 0):
+            raise IncorrectConcurrencyError('parse_workers is not a non-negative integer')
+        if not _is_non_negative_number(processing.metrics_interval):
+            raise IncorrectConcurrencyError('metrics_interval is not a non-negative number')
+        try:
+            ExtractionRules(processing.extraction_rules)
+        except ValueError as error:
+            raise IncorrectExtractionRulesError(
+                f'extraction_rules are malformed: {error}') from error
+        if not isinstance(processing.stream_article_pages, bool):
+            raise IncorrectVerifyError('stream_article_pages is not an instance of bool')
+        if not isinstance(processing.use_fast_extraction, bool):
+            raise IncorrectVerifyError('use_fast_extraction is not an instance of bool')
+
+    def get_seed_urls(self) -> list[str]:
+        """
+        Retrieve seed urls.
+
+        Returns:
+            list[str]: Seed urls
+        """
+        return self._seed_urls
+
+    def get_num_articles(self) -> int:
+        """
+        Retrieve total number of articles to scrape.
+
+        Returns:
+            int: Total number of articles to scrape
+        """
+        return self._num_articles
+
+    def get_headers(self) -> dict[str, str]:
+        """
+        Retrieve headers to use during requesting.
+
+        Returns:
+            dict[str, str]: Headers
+        """
+        return self._headers
+
+    def get_encoding(self) -> str:
+        """
+        Retrieve encoding to use during parsing.
+
+        Returns:
+            str: Encoding
+        """
+        return self._encoding
+
+    def get_timeout(self) -> int:
+        """
+        Retrieve number of seconds to wait for response.
+
+        Returns:
+            int: Number of seconds to wait for response
+        """
+        return self._timeout
+
+    def get_verify_certificate(self) -> bool:
+        """
+        Retrieve whether to verify certificate.
+
+        Returns:
+            bool: Whether to verify certificate or not
+        """
+        return self._should_verify_certificate
+
+    def get_headless_mode(self) -> bool:
+        """
+        Retrieve whether to use headless mode.
+
+        Returns:
+            bool: Whether to use headless mode or not
+        """
+        return self._headless_mode
+
+    def get_network_options(self) -> NetworkOptions:
+        """
+        Retrieve settings of connections, request rate and retries.
+
+        Returns:
+            NetworkOptions: Settings of connections, request rate and retries
+        """
+        return self._network
+
+    def get_storage_options(self) -> StorageOptions:
+        """
+        Retrieve settings of files kept between requests and runs.
+
+        Returns:
+            StorageOptions: Settings of files kept between requests and runs
+        """
+        return self._storage
+
+    def get_crawling_options(self) -> CrawlingOptions:
+        """
+        Retrieve settings of finding article urls.
+
+        Returns:
+            CrawlingOptions: Settings of finding article urls
+        """
+        return self._crawling
+
+    def get_processing_options(self) -> ProcessingOptions:
+        """
+        Retrieve settings of downloading and parsing article pages.
+
+        Returns:
+            ProcessingOptions: Settings of downloading and parsing article pages
+        """
+        return self._processing
+
+    def get_session_pool(self) -> SessionPool:
+        """
+        Retrieve connection pool shared by everyone using this configuration.
+
+        Returns:
+            SessionPool: Connection pool
+        """
+        return self._session_pool
+
+    def get_request_guards(self) -> RequestGuards:
+        """
+        Retrieve rate limiter, retry policy, circuit breaker and coalescing of requests
+        shared by everyone using this configuration.
+
+        Returns:
+            RequestGuards: Guards of requests
+        """
+        return self._request_guards
+
+    def get_response_cache(self) -> ResponseCache | None:
+        """
+        Retrieve on-disk response cache, creating it on first use, if caching is enabled.
+
+        Returns:
+            ResponseCache | None: Response cache
+        """
+        if not self._storage.use_http_cache:
+            return None
+        return self._get_feature('response_cache', lambda: ResponseCache(HTTP_CACHE_PATH))
+
+    def get_archive(self) -> ResponseArchive | None:
+        """
+        Retrieve archive of fetched pages, loading its index on first use, if archiving
+        is enabled.
+
+        Returns:
+            ResponseArchive | None: Archive of fetched pages
+        """
+        if self._storage.archive_mode == 'off':
+            return None
+        return self._get_feature('archive', lambda: ResponseArchive(ARCHIVE_PATH))
+
+    def get_metrics(self) -> ScrapeMetrics:
+        """
+        Retrieve metrics shared by everyone using this configuration.
+
+        Returns:
+            ScrapeMetrics: Metrics of the crawl
+        """
+        return self._metrics
+
+    def get_extraction_rules(self) -> ExtractionRules:
+        """
+        Retrieve rules finding fields of article pages and links of seed and news pages.
+
+        Returns:
+            ExtractionRules: Rules compiled into a single-pass matcher
+        """
+        return self._compiled_rules
+
+    def get_duplicate_index(self) -> NearDuplicateIndex | None:
+        """
+        Retrieve index of texts of saved articles.
+
+        Returns:
+            NearDuplicateIndex | None: Index or None if near-duplicates are saved too
+        """
+        if not self._storage.skip_near_duplicates:
+            return None
+        return self._get_feature('duplicate_index', NearDuplicateIndex)
+
+    def get_manifest(self) -> CrawlManifest | None:
+        """
+        Retrieve manifest of articles saved by previous runs.
+
+        Returns:
+            CrawlManifest | None: Manifest or None if every run starts from scratch
+        """
+        if not self._storage.incremental_mode:
+            return None
+        return self._get_feature('manifest', lambda: CrawlManifest(MANIFEST_PATH))
+
+    def get_frontier_store(self) -> SharedFrontier | None:
+        """
+        Retrieve frontier shared by crawler processes.
+
+        Returns:
+            SharedFrontier | None: Shared frontier or None if a single process crawls
+        """
+        if not self._crawling.shared_frontier:
+            return None
+        return self._get_feature('frontier_store', lambda: SharedFrontier(FRONTIER_PATH))
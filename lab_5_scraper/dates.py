@@ -0,0 +1,232 @@
+"""
+Normalization of dates as the site writes them into datetimes.
+"""
+
+import datetime
+import re
+from functools import lru_cache, partial
+from typing import Callable, Iterable
+
+#: Month names in the genitive case, as the site writes dates
+MONTHS = {name: number for number, name in enumerate(
+    ('января', 'февраля', 'марта', 'апреля', 'мая', 'июня',
+     'июля', 'августа', 'сентября', 'октября', 'ноября', 'декабря'), 1)}
+
+#: Month names and their abbreviations
+MONTH_NUMBERS = dict(MONTHS, **{name: number for number, names in enumerate(
+    (('янв',), ('фев', 'февр'), ('мар',), ('апр',), ('май',), ('июн',),
+     ('июл',), ('авг',), ('сен', 'сент'), ('окт',), ('ноя', 'нояб'), ('дек',)), 1)
+    for name in names})
+
+#: Days before today named by words
+DAY_WORDS = {'сегодня': 0, 'вчера': 1, 'позавчера': 2}
+
+#: Units of relative times by the stems of their names
+TIME_UNITS = {
+    'сек': datetime.timedelta(seconds=1),
+    'мин': datetime.timedelta(minutes=1),
+    'час': datetime.timedelta(hours=1),
+    'дн': datetime.timedelta(days=1),
+    'ден': datetime.timedelta(days=1),
+    'нед': datetime.timedelta(weeks=1),
+}
+
+#: Number of distinct date strings whose parses are remembered
+CACHE_SIZE = 1 << 16
+
+_TIME = r'(?:,?\s*(?:в\s+)?(?P<hour>\d{1,2}):(?P<minute>\d{2}))?'
+
+TEXT_DATE_PATTERN = re.compile(
+    r'(?P<day>\d{1,2})\s+(?P<month>[а-яё]+)\.?(?:\s+(?P<year>\d{4})(?:\s*г\.?)?)?' + _TIME)
+NUMERIC_DATE_PATTERN = re.compile(
+    r'(?P<day>\d{1,2})\.(?P<month>\d{1,2})\.(?P<year>\d{4})' + _TIME)
+DAY_WORD_PATTERN = re.compile(r'(?P<word>' + '|'.join(DAY_WORDS) + ')' + _TIME)
+RELATIVE_PATTERN = re.compile(
+    r'только что|(?:(?P<count>\d+)\s+)?(?P<unit>' + '|'.join(TIME_UNITS) + r')[а-яё]*\s+назад')
+
+#: Resolution of a parsed date against the current time
+Resolver = Callable[[datetime.datetime], datetime.datetime]
+
+
+def _this_year(month: int, day: int, hour: int, minute: int,
+               now: datetime.datetime) -> datetime.datetime:
+    """
+    Resolve a date written without a year.
+
+    Args:
+        month (int): Month
+        day (int): Day
+        hour (int): Hour
+        minute (int): Minute
+        now (datetime.datetime): Current time
+
+    Returns:
+        datetime.datetime: Date of the current year or, for 29 February, of the
+            latest leap year
+    """
+    year = now.year
+    while True:
+        try:
+            return datetime.datetime(year, month, day, hour, minute)
+        except ValueError:
+            year -= 1
+
+
+def _days_ago(days: int, hour: int, minute: int, now: datetime.datetime) -> datetime.datetime:
+    """
+    Resolve a date written as a day before today.
+
+    Args:
+        days (int): Number of days before today
+        hour (int): Hour
+        minute (int): Minute
+        now (datetime.datetime): Current time
+
+    Returns:
+        datetime.datetime: Time of the day
+    """
+    return datetime.datetime.combine(now.date() - datetime.timedelta(days=days),
+                                     datetime.time(hour, minute))
+
+
+def _time_ago(delta: datetime.timedelta, now: datetime.datetime) -> datetime.datetime:
+    """
+    Resolve a date written as time passed since it.
+
+    Args:
+        delta (datetime.timedelta): Time passed
+        now (datetime.datetime): Current time
+
+    Returns:
+        datetime.datetime: Current time less the time passed, to the minute
+    """
+    return (now - delta).replace(second=0, microsecond=0)
+
+
+def _get_time(match: re.Match) -> tuple[int, int]:
+    """
+    Get the time of a matched date.
+
+    Args:
+        match (re.Match): Match of a date pattern
+
+    Returns:
+        tuple[int, int]: Hour and minute, midnight if no time is written
+    """
+    if match['hour'] is None:
+        return 0, 0
+    return int(match['hour']), int(match['minute'])
+
+
+def _parse_site_format(text: str) -> datetime.datetime | None:
+    """
+    Parse a date in the format of article pages without regular expressions.
+
+    Args:
+        text (str): Date, e.g. ``12 апреля 2025 14:30`` or ``12 апреля 14:30``
+
+    Returns:
+        datetime.datetime | None: Date or None if the text is in another format
+            or has no year
+    """
+    items = text.split()
+    if len(items) != 4 or items[1] not in MONTHS:
+        return None
+    hour, _, minute = items[3].partition(':')
+    try:
+        return datetime.datetime(int(items[2]), MONTHS[items[1]], int(items[0]),
+                                 int(hour), int(minute))
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def compile_date(text: str) -> datetime.datetime | Resolver:
+    """
+    Parse a date, once per distinct string.
+
+    A date written in full is parsed into itself. A date without a year or
+    a relative one is parsed into a resolution against the current time,
+    so the cache stays right as time goes. A text that is not a date of a
+    known format raises ValueError.
+
+    Dates in the format of article pages are parsed faster than the cache
+    looks them up, so callers try _parse_site_format first.
+
+    Args:
+        text (str): Date, e.g. ``12 апреля 2025 14:30``, ``вчера в 09:15`` or ``5 минут назад``
+
+    Returns:
+        datetime.datetime | Resolver: Date or its resolution
+    """
+    normalized = ' '.join(text.lower().split())
+    if match := TEXT_DATE_PATTERN.fullmatch(normalized):
+        month = MONTH_NUMBERS.get(match['month'])
+        if month is None:
+            raise ValueError(f'Unknown month in date: {text!r}')
+        hour, minute = _get_time(match)
+        if match['year'] is None:
+            # A leap year, so that the day is checked to exist in some year
+            datetime.datetime(2000, month, int(match['day']), hour, minute)
+            return partial(_this_year, month, int(match['day']), hour, minute)
+        return datetime.datetime(int(match['year']), month, int(match['day']), hour, minute)
+    if match := NUMERIC_DATE_PATTERN.fullmatch(normalized):
+        return datetime.datetime(int(match['year']), int(match['month']), int(match['day']),
+                                 *_get_time(match))
+    if match := DAY_WORD_PATTERN.fullmatch(normalized):
+        hour, minute = _get_time(match)
+        datetime.time(hour, minute)  # Checks the time exists
+        return partial(_days_ago, DAY_WORDS[match['word']], hour, minute)
+    if match := RELATIVE_PATTERN.fullmatch(normalized):
+        delta = (int(match['count'] or 1) * TIME_UNITS[match['unit']] if match['unit']
+                 else datetime.timedelta())
+        return partial(_time_ago, delta)
+    try:
+        return datetime.datetime.fromisoformat(normalized)
+    except ValueError:
+        raise ValueError(f'Unknown date format: {text!r}') from None
+
+
+def parse_date(text: str, now: datetime.datetime | None = None) -> datetime.datetime:
+    """
+    Parse a date.
+
+    Args:
+        text (str): Date as the site writes it
+        now (datetime.datetime | None): Current time, read from the clock by default
+
+    Returns:
+        datetime.datetime: Date
+    """
+    if (moment := _parse_site_format(text)) is not None:
+        return moment
+    parsed = compile_date(text)
+    if isinstance(parsed, datetime.datetime):
+        return parsed
+    return parsed(now or datetime.datetime.now())
+
+
+def parse_dates(texts: Iterable[str],
+                now: datetime.datetime | None = None) -> list[datetime.datetime]:
+    """
+    Parse a column of dates at once.
+
+    The clock is read once for the whole column and every distinct string
+    is resolved once.
+
+    Args:
+        texts (Iterable[str]): Dates as the site writes them
+        now (datetime.datetime | None): Current time, read from the clock by default
+
+    Returns:
+        list[datetime.datetime]: Dates in the given order
+    """
+    now = now or datetime.datetime.now()
+    resolved: dict[str, datetime.datetime] = {}
+    dates = []
+    for text in texts:
+        date = resolved.get(text)
+        if date is None:
+            date = resolved[text] = parse_date(text, now)
+        dates.append(date)
+    return dates
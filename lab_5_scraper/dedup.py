@@ -0,0 +1,186 @@
+"""
+Near-duplicate detection of article texts with MinHash and locality-sensitive hashing.
+"""
+
+import hashlib
+import re
+import threading
+
+#: Number of consecutive words in a shingle
+SHINGLE_SIZE = 3
+
+#: Number of bins, and so of values, in a signature
+SIGNATURE_SIZE = 128
+
+#: Number of bands a signature is split into for candidate lookup
+NUM_BANDS = 16
+
+#: Minimum estimated Jaccard similarity of shingles of near-duplicate texts
+SIMILARITY_THRESHOLD = 0.8
+
+#: Words of a text
+WORD_PATTERN = re.compile(r'\w+')
+
+#: Offset added to a value borrowed by an empty bin per bin it is borrowed across,
+#: greater than any value kept in a bin
+_ROTATION_OFFSET = (1 << 64) // SIGNATURE_SIZE
+
+
+def get_shingles(text: str) -> set[str]:
+    """
+    Split a text into overlapping sequences of words.
+
+    Args:
+        text (str): Text
+
+    Returns:
+        set[str]: Shingles of the text
+    """
+    words = WORD_PATTERN.findall(text.lower())
+    if len(words) <= SHINGLE_SIZE:
+        return {' '.join(words)} if words else set()
+    return {' '.join(words[idx:idx + SHINGLE_SIZE])
+            for idx in range(len(words) - SHINGLE_SIZE + 1)}
+
+
+def minhash(text: str) -> tuple[int, ...] | None:
+    """
+    Compute a signature whose share of equal values estimates Jaccard similarity of texts.
+
+    Every shingle is hashed once: the hash picks one of SIGNATURE_SIZE
+    bins and the rest of it is the value kept if it is the least in the bin.
+    An empty bin borrows the value of the nearest filled bin to its right,
+    shifted by the distance, so texts with few shingles are compared as well.
+    The cost grows with the number of shingles only, not with the size of
+    the signature.
+
+    Args:
+        text (str): Text
+
+    Returns:
+        tuple[int, ...] | None: Signature or None if the text has no words
+    """
+    shingles = get_shingles(text)
+    if not shingles:
+        return None
+    bins: list[int | None] = [None] * SIGNATURE_SIZE
+    for shingle in shingles:
+        digest = int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(),
+                                'big')
+        value, bin_idx = divmod(digest, SIGNATURE_SIZE)
+        current = bins[bin_idx]
+        if current is None or value < current:
+            bins[bin_idx] = value
+    signature = [0] * SIGNATURE_SIZE
+    borrowed, distance = 0, 0
+    # Walking twice from the right lets bins at the end borrow from the start
+    for idx in reversed(range(2 * SIGNATURE_SIZE)):
+        current = bins[idx % SIGNATURE_SIZE]
+        if current is None:
+            distance += 1
+            signature[idx % SIGNATURE_SIZE] = borrowed + distance * _ROTATION_OFFSET
+        else:
+            borrowed, distance = current, 0
+            signature[idx % SIGNATURE_SIZE] = current
+    return tuple(signature)
+
+
+class NearDuplicateIndex:
+    """
+    In-memory index of signatures of seen texts answering near-duplicate queries.
+
+    A signature is split into bands, and only texts sharing a whole band with
+    the query are compared, so a lookup does not scan the whole index. Texts
+    similar above the threshold share a band with high probability.
+    """
+
+    def __init__(self, threshold: float = SIMILARITY_THRESHOLD) -> None:
+        """
+        Initialize an instance of the NearDuplicateIndex class.
+
+        Args:
+            threshold (float): Minimum estimated similarity of near-duplicates
+        """
+        self._threshold = threshold
+        self._rows = SIGNATURE_SIZE // NUM_BANDS
+        self._bands: list[dict[tuple[int, ...], list[str]]] = [{} for _ in range(NUM_BANDS)]
+        self._signatures: dict[str, tuple[int, ...]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """
+        Get number of indexed texts.
+
+        Returns:
+            int: Number of indexed texts
+        """
+        return len(self._signatures)
+
+    def _get_bands(self, signature: tuple[int, ...]) -> list[tuple[int, ...]]:
+        """
+        Split a signature into bands.
+
+        Args:
+            signature (tuple[int, ...]): Signature
+
+        Returns:
+            list[tuple[int, ...]]: Bands of the signature
+        """
+        return [signature[idx:idx + self._rows]
+                for idx in range(0, NUM_BANDS * self._rows, self._rows)]
+
+    def find(self, signature: tuple[int, ...]) -> str | None:
+        """
+        Find an indexed text the signature is a near-duplicate of.
+
+        Args:
+            signature (tuple[int, ...]): Signature
+
+        Returns:
+            str | None: Key of the indexed text or None if there is none
+        """
+        checked = set()
+        for band, value in zip(self._bands, self._get_bands(signature)):
+            for key in band.get(value, ()):
+                if key in checked:
+                    continue
+                checked.add(key)
+                same = sum(a == b for a, b in zip(signature, self._signatures[key]))
+                if same / SIGNATURE_SIZE >= self._threshold:
+                    return key
+        return None
+
+    def add(self, key: str, text: str) -> str | None:
+        """
+        Index a text unless it is a near-duplicate of an already indexed one.
+
+        Args:
+            key (str): Key of the text, e.g. its url
+            text (str): Text
+
+        Returns:
+            str | None: Key of the text this one duplicates or None if it is new
+        """
+        signature = minhash(text)
+        if signature is None:
+            return None
+        return self.add_signature(key, signature)
+
+    def add_signature(self, key: str, signature: tuple[int, ...]) -> str | None:
+        """
+        Index a text by its signature unless it is a near-duplicate of an already indexed one.
+
+        Args:
+            key (str): Key of the text, e.g. its url
+            signature (tuple[int, ...]): Signature of the text computed by minhash
+
+        Returns:
+            str | None: Key of the text this one duplicates or None if it is new
+        """
+        with self._lock:
+            duplicate_of = self.find(signature)
+            if duplicate_of is None:
+                self._signatures[key] = signature
+                for band, value in zip(self._bands, self._get_bands(signature)):
+                    band.setdefault(value, []).append(key)
+            return duplicate_of
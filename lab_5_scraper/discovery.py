@@ -0,0 +1,165 @@
+"""
+Discovery of article urls from sitemaps and RSS/Atom feeds.
+"""
+
+from __future__ import annotations
+
+import datetime
+import gzip
+import io
+from collections import deque
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Callable, Iterable, Iterator, TYPE_CHECKING
+
+from core_utils.lazy import LazyModule
+
+if TYPE_CHECKING:
+    from lxml import etree
+else:
+    #: Imported on first use, so that crawls without sitemaps never load lxml
+    etree = LazyModule('lxml.etree')
+
+#: Elements describing a single entry in sitemaps and feeds
+ENTRY_TAGS = frozenset({'url', 'sitemap', 'item', 'entry'})
+
+#: Children holding the url of an entry
+LOCATION_TAGS = frozenset({'loc', 'link'})
+
+#: Children holding the modification date of an entry
+DATE_TAGS = frozenset({'lastmod', 'pubDate', 'updated', 'published'})
+
+
+@dataclass
+class FeedEntry:
+    """
+    Url found in a sitemap or a feed.
+    """
+
+    #: Url of the page or of a nested sitemap
+    url: str
+
+    #: Date the page was last modified, if given
+    lastmod: datetime.date | None
+
+    #: Whether the url points to a nested sitemap
+    is_sitemap: bool
+
+
+def parse_feed_date(text: str) -> datetime.date | None:
+    """
+    Parse a W3C (sitemaps, Atom) or an RFC 822 (RSS) date.
+
+    Args:
+        text (str): Date in text format
+
+    Returns:
+        datetime.date | None: Date or None if the text is not a date
+    """
+    text = text.strip()
+    try:
+        return datetime.date.fromisoformat(text[:10])
+    except ValueError:
+        pass
+    try:
+        return parsedate_to_datetime(text).date()
+    except (TypeError, ValueError):
+        return None
+
+
+def _local_name(element: etree._Element) -> str:
+    """
+    Get the tag of an element without its namespace.
+
+    Args:
+        element (etree._Element): Element
+
+    Returns:
+        str: Tag without namespace
+    """
+    return str(etree.QName(element).localname) if isinstance(element.tag, str) else ''
+
+
+def iter_feed_entries(source: io.BufferedIOBase) -> Iterator[FeedEntry]:
+    """
+    Read entries of a sitemap, a sitemap index, an RSS or an Atom feed one by one.
+
+    The document is parsed incrementally and every entry is dropped from the
+    tree once read, so memory does not grow with the size of the document.
+
+    Args:
+        source (io.BufferedIOBase): Document opened in binary mode
+
+    Yields:
+        FeedEntry: Entry of the document
+    """
+    for _, element in etree.iterparse(source, events=('end',), resolve_entities=False,
+                                      no_network=True, recover=True):
+        name = _local_name(element)
+        if name not in ENTRY_TAGS:
+            continue
+        url = None
+        lastmod = None
+        for child in element:
+            child_name = _local_name(child)
+            if child_name in LOCATION_TAGS and url is None:
+                url = (child.text or child.get('href') or '').strip() or None
+            elif child_name in DATE_TAGS and lastmod is None and child.text:
+                lastmod = parse_feed_date(child.text)
+        element.clear(keep_tail=True)
+        parent = element.getparent()
+        while parent is not None and element.getprevious() is not None:
+            del parent[0]
+        if url:
+            yield FeedEntry(url, lastmod, name == 'sitemap')
+
+
+def open_document(content: bytes) -> io.BufferedIOBase:
+    """
+    Open a downloaded sitemap or feed, unpacking it if it is gzipped.
+
+    Args:
+        content (bytes): Downloaded document
+
+    Returns:
+        io.BufferedIOBase: Document opened in binary mode
+    """
+    if content[:2] == b'\x1f\x8b':
+        return gzip.GzipFile(fileobj=io.BytesIO(content))
+    return io.BytesIO(content)
+
+
+def discover_entries(feed_urls: Iterable[str], fetch: Callable[[str], bytes | None],
+                     since: datetime.date | None = None) -> Iterator[FeedEntry]:
+    """
+    Walk sitemaps and feeds, following sitemap indexes, and yield page entries.
+
+    Entries are yielded as soon as they are read, so the caller may stop once
+    it has enough and no further documents are downloaded. Entries modified
+    before ``since`` are skipped, including whole nested sitemaps.
+
+    Args:
+        feed_urls (Iterable[str]): Urls of sitemaps and feeds
+        fetch (Callable[[str], bytes | None]): Download of a document, None on failure
+        since (datetime.date | None): Earliest modification date of entries to keep
+
+    Yields:
+        FeedEntry: Entry of a page
+    """
+    queue = deque(feed_urls)
+    seen = set(queue)
+    while queue:
+        content = fetch(queue.popleft())
+        if not content:
+            continue
+        try:
+            for entry in iter_feed_entries(open_document(content)):
+                if since is not None and entry.lastmod is not None and entry.lastmod < since:
+                    continue
+                if not entry.is_sitemap:
+                    yield entry
+                elif entry.url not in seen:
+                    seen.add(entry.url)
+                    queue.append(entry.url)
+        except (etree.XMLSyntaxError, OSError, EOFError):
+            continue
@@ -0,0 +1,507 @@
+"""
+Fast extraction of article fields with declarative rules compiled into a single-pass matcher.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable, TYPE_CHECKING
+
+from core_utils.lazy import LazyModule
+
+if TYPE_CHECKING:
+    import bs4
+    from lxml import etree
+    from lxml import html as lxml_html
+else:
+    #: Imported on first use: trees of the BeautifulSoup path are built by its callers
+    bs4 = LazyModule('bs4')
+    #: Imported on first use, so that importing the scraper does not load lxml
+    etree = LazyModule('lxml.etree')
+    lxml_html = LazyModule('lxml.html')
+
+#: Whitespace characters BeautifulSoup collapses in whitespace-only strings
+ASCII_SPACES = str.maketrans('', '', '\x20\x0a\x09\x0c\x0d')
+
+#: Tags whose strings BeautifulSoup leaves out of Tag.text
+HIDDEN_STRING_TAGS = frozenset({'rt', 'rp', 'style', 'script', 'template'})
+
+#: Tags whose whitespace BeautifulSoup keeps as is
+PRESERVE_WHITESPACE_TAGS = frozenset({'pre', 'textarea'})
+
+#: Fields of an article page, each found by a rule or a list of rules
+ARTICLE_FIELDS = ('text', 'title', 'author', 'date', 'topics')
+
+#: Fields a streamed article page must have read before it is cut off
+REQUIRED_ARTICLE_FIELDS = frozenset(ARTICLE_FIELDS) - {'author'}
+
+#: Fields of links, only elements having an href are matched
+LINK_FIELDS = ('seed_links', 'links', 'text_links')
+
+#: Keys a rule is made of, the tag is required
+RULE_KEYS = frozenset({'tag', 'class', 'inside'})
+
+#: Rules the site is scraped by: the tag, the class and the class of an enclosing element
+DEFAULT_EXTRACTION_RULES = {
+    'text': {'tag': 'div', 'class': 'news-detail__detail-text'},
+    'title': {'tag': 'h1', 'class': 'title'},
+    'author': {'tag': 'div', 'class': 'author-news__info-authors'},
+    'date': {'tag': 'span', 'class': 'author-news__info-text'},
+    'topics': {'tag': 'a', 'class': 'tags photo-report-detail-share-tags__item'},
+    'seed_links': {'tag': 'a', 'class': 'news-card photo'},
+    'links': [
+        {'tag': 'a',
+         'class': 'slider__swiper-slide swiper-slide slider__swiper-slide-js swiper-slide-next'},
+        {'tag': 'a', 'class': 'line-news'},
+        {'tag': 'a', 'class': 'news-card photo'},
+        {'tag': 'a', 'class': 'header__top-banner-item'},
+    ],
+    'text_links': {'tag': 'a', 'inside': 'news-detail__detail-text'},
+}
+
+
+def _collect_text(element: etree._Element, hidden: bool, preserve: bool,
+                  chunks: list[str]) -> None:
+    """
+    Collect strings of an element and its descendants in document order.
+
+    Args:
+        element (etree._Element): Element to collect strings from
+        hidden (bool): Whether strings are inside a tag hidden from Tag.text
+        preserve (bool): Whether whitespace is preserved as is
+        chunks (list[str]): Collected strings
+    """
+    def add(string: str | None, is_hidden: bool, keep_whitespace: bool) -> None:
+        if not string or is_hidden:
+            return
+        if not keep_whitespace and not string.translate(ASCII_SPACES):
+            string = '\n' if '\n' in string else ' '
+        chunks.append(string)
+
+    is_tag = isinstance(element.tag, str)
+    inner_hidden = hidden or (is_tag and element.tag in HIDDEN_STRING_TAGS)
+    inner_preserve = preserve or (is_tag and element.tag in PRESERVE_WHITESPACE_TAGS)
+    if is_tag:
+        add(element.text, inner_hidden, inner_preserve)
+        for child in element:
+            _collect_text(child, inner_hidden, inner_preserve, chunks)
+    add(element.tail, hidden, preserve)
+
+
+def get_text(element: etree._Element) -> str:
+    """
+    Get text of an element exactly as BeautifulSoup Tag.text with the lxml builder does.
+
+    Args:
+        element (etree._Element): Element
+
+    Returns:
+        str: Text of the element
+    """
+    chunks: list[str] = []
+    hidden = preserve = False
+    for ancestor in element.iterancestors():
+        hidden = hidden or ancestor.tag in HIDDEN_STRING_TAGS
+        preserve = preserve or ancestor.tag in PRESERVE_WHITESPACE_TAGS
+    tail, element.tail = element.tail, None
+    try:
+        _collect_text(element, hidden, preserve, chunks)
+    finally:
+        element.tail = tail
+    return ''.join(chunks)
+
+
+def matches_class(class_name: str, classes: list[str]) -> bool:
+    """
+    Check whether classes of an element match a class the way BeautifulSoup does.
+
+    Args:
+        class_name (str): Class or space-separated classes
+        classes (list[str]): Classes of the element
+
+    Returns:
+        bool: Whether the element has the class or exactly the space-separated classes
+    """
+    if ' ' in class_name:
+        return ' '.join(classes) == class_name
+    return class_name in classes
+
+
+@dataclass(frozen=True)
+class Selector:
+    """
+    Compiled rule matching elements of a field.
+    """
+
+    field: str
+    order: int
+    tag: str
+    class_name: str | None
+    inside: str | None
+
+
+def _parse_rule(name: str, order: int, rule: object) -> Selector:
+    """
+    Check a rule and compile it into a selector.
+
+    Args:
+        name (str): Field the rule finds
+        order (int): Position of the rule among the rules of the field
+        rule (object): Rule as configured
+
+    Returns:
+        Selector: Compiled rule
+    """
+    if not isinstance(rule, dict) or not set(rule) <= RULE_KEYS or 'tag' not in rule:
+        raise ValueError(f'Rule of {name} is not a dictionary of tag, class and inside')
+    if not all(isinstance(value, str) and value.split() for value in rule.values()):
+        raise ValueError(f'Rule of {name} has empty or non-string values')
+    if len(rule['tag'].split()) > 1 or len(rule.get('inside', '').split()) > 1:
+        raise ValueError(f'Rule of {name} has several tags or enclosing classes')
+    class_name = rule.get('class')
+    return Selector(name, order, rule['tag'].lower(),
+                    ' '.join(class_name.split()) if class_name else None, rule.get('inside'))
+
+
+class ExtractionRules:
+    """
+    Rules finding fields of pages, compiled into a single-pass matcher.
+
+    Every field is found by a rule or a list of rules: a tag, a class and a
+    class of an enclosing element. Rules are grouped by tag and by class, so
+    a page is walked once and every element is checked only against the
+    rules that may match it, however many fields and rules there are.
+    Elements of a field come in the order of its rules and, for a rule, in
+    the order of the page, just like one search per rule would give them.
+    """
+
+    def __init__(self, rules: dict | None = None,
+                 fields: tuple[str, ...] = ARTICLE_FIELDS + LINK_FIELDS) -> None:
+        """
+        Initialize an instance of the ExtractionRules class.
+
+        Args:
+            rules (dict | None): Rules by fields, defaults for fields not given
+            fields (tuple[str, ...]): Fields to find, all by default
+        """
+        if rules is not None and not isinstance(rules, dict):
+            raise ValueError('Rules are not a dictionary of fields')
+        self._rules = dict(DEFAULT_EXTRACTION_RULES, **(rules or {}))
+        unknown = set(self._rules).difference(ARTICLE_FIELDS + LINK_FIELDS)
+        if unknown:
+            raise ValueError(f'Unknown fields: {", ".join(sorted(unknown))}')
+        self._fields = fields
+        self._selectors: list[Selector] = []
+        for name in fields:
+            field_rules = self._rules[name]
+            if not isinstance(field_rules, list):
+                field_rules = [field_rules]
+            self._selectors.extend(_parse_rule(name, order, rule)
+                                   for order, rule in enumerate(field_rules))
+        self._by_class: dict[tuple[str, str], list[Selector]] = {}
+        self._by_classes: dict[tuple[str, str], list[Selector]] = {}
+        self._by_tag: dict[str, list[Selector]] = {}
+        for selector in self._selectors:
+            if selector.class_name is None:
+                self._by_tag.setdefault(selector.tag, []).append(selector)
+            elif ' ' in selector.class_name:
+                self._by_classes.setdefault((selector.tag, selector.class_name),
+                                            []).append(selector)
+            else:
+                self._by_class.setdefault((selector.tag, selector.class_name),
+                                          []).append(selector)
+        self._tags = sorted({selector.tag for selector in self._selectors})
+        self._dispatch: dict[tuple[str, str], tuple[Selector, ...]] = {}
+        self._selections: dict[tuple[str, ...], ExtractionRules] = {}
+
+    def select(self, fields: tuple[str, ...]) -> ExtractionRules:
+        """
+        Get rules of some fields only, so that rules of other fields cost nothing.
+
+        Args:
+            fields (tuple[str, ...]): Fields to find
+
+        Returns:
+            ExtractionRules: Rules of the fields, compiled once
+        """
+        if fields not in self._selections:
+            self._selections[fields] = ExtractionRules(self._rules, fields)
+        return self._selections[fields]
+
+    def _candidates(self, tag: str, class_attr: str) -> tuple[Selector, ...]:
+        """
+        Get the rules an element may match by its tag and its classes.
+
+        Rules are looked up once per pair of a tag and a class attribute, so
+        elements repeated all over a page, like menu items, cost a single lookup.
+
+        Args:
+            tag (str): Tag of the element
+            class_attr (str): Class attribute of the element
+
+        Returns:
+            tuple[Selector, ...]: Rules to check the element against
+        """
+        candidates = self._dispatch.get((tag, class_attr))
+        if candidates is None:
+            classes = class_attr.split()
+            found = list(self._by_tag.get(tag, ()))
+            for class_name in dict.fromkeys(classes):
+                found.extend(self._by_class.get((tag, class_name), ()))
+            if len(classes) > 1:
+                found.extend(self._by_classes.get((tag, ' '.join(classes)), ()))
+            candidates = self._dispatch[(tag, class_attr)] = tuple(found)
+        return candidates
+
+    @staticmethod
+    def _is_inside(element: Any, class_name: str, parent_of: Callable[[Any], Any],
+                   class_of: Callable[[Any], str],
+                   known: dict[int, tuple[Any, bool]]) -> bool:
+        """
+        Check whether an element is enclosed by an element of a class.
+
+        Answers for the elements passed on the way up are remembered, so
+        elements sharing ancestors, like links of one menu, walk up only once.
+
+        Args:
+            element (Any): Element
+            class_name (str): Class of the enclosing element
+            parent_of (Callable[[Any], Any]): Parent of an element, None for the root
+            class_of (Callable[[Any], str]): Class attribute of an element
+            known (dict[int, tuple[Any, bool]]): Elements by their ids, kept alive so that
+                ids are not reused, and whether they are or are inside the enclosing element
+
+        Returns:
+            bool: Whether the element is inside an element of the class
+        """
+        passed = []
+        inside = False
+        node = parent_of(element)
+        while node is not None:
+            if id(node) in known:
+                inside = known[id(node)][1]
+                break
+            passed.append(node)
+            if matches_class(class_name, class_of(node).split()):
+                inside = True
+                break
+            node = parent_of(node)
+        for node in passed:
+            known[id(node)] = (node, inside)
+        return inside
+
+    def _match(self, elements: Iterable[Any], tag_of: Callable[[Any], str],
+               class_of: Callable[[Any], str], parent_of: Callable[[Any], Any],
+               has_href: Callable[[Any], bool]) -> dict[str, list]:
+        """
+        Dispatch every element to all rules it matches.
+
+        Args:
+            elements (Iterable[Any]): Elements of the tags of the rules in document order
+            tag_of (Callable[[Any], str]): Tag of an element
+            class_of (Callable[[Any], str]): Class attribute of an element
+            parent_of (Callable[[Any], Any]): Parent of an element, None for the root
+            has_href (Callable[[Any], bool]): Whether an element has an href
+
+        Returns:
+            dict[str, list]: Matched elements by fields
+        """
+        found: dict[Selector, list] = {}
+        known: dict[str, dict[int, tuple[Any, bool]]] = {}
+        for element in elements:
+            for selector in self._candidates(tag_of(element), class_of(element)):
+                if selector.field in LINK_FIELDS and not has_href(element):
+                    continue
+                if selector.inside is None or self._is_inside(
+                        element, selector.inside, parent_of, class_of,
+                        known.setdefault(selector.inside, {})):
+                    found.setdefault(selector, []).append(element)
+        fields: dict[str, list] = {name: [] for name in self._fields}
+        for selector in self._selectors:
+            fields[selector.field].extend(found.get(selector, ()))
+        return fields
+
+    def match_element(self, element: etree._Element) -> set[str]:
+        """
+        Find fields an element of an lxml tree matches.
+
+        Enclosing elements are looked up among ancestors of the element, so
+        the element may be matched while the tree is still being parsed.
+
+        Args:
+            element (etree._Element): Element
+
+        Returns:
+            set[str]: Fields the element belongs to
+        """
+        fields = set()
+        for selector in self._candidates(element.tag, element.get('class') or ''):
+            if selector.field in LINK_FIELDS and element.get('href') is None:
+                continue
+            if selector.inside is None or self._is_inside(
+                    element, selector.inside, lambda node: node.getparent(),
+                    lambda node: node.get('class') or '', {}):
+                fields.add(selector.field)
+        return fields
+
+    def match_tree(self, tree: etree._Element) -> dict[str, list[etree._Element]]:
+        """
+        Find elements of every field in an lxml tree in a single pass.
+
+        Args:
+            tree (etree._Element): Root of the tree
+
+        Returns:
+            dict[str, list[etree._Element]]: Matched elements by fields
+        """
+        return self._match(tree.iter(*self._tags), lambda element: element.tag,
+                           lambda element: element.get('class') or '',
+                           lambda element: element.getparent(),
+                           lambda element: element.get('href') is not None)
+
+    def match_soup(self, soup: bs4.BeautifulSoup) -> dict[str, list[bs4.Tag]]:
+        """
+        Find elements of every field in a BeautifulSoup tree in a single pass.
+
+        Args:
+            soup (bs4.BeautifulSoup): BeautifulSoup instance
+
+        Returns:
+            dict[str, list[bs4.Tag]]: Matched elements by fields
+        """
+        return self._match(soup.find_all(self._tags), lambda element: element.name,
+                           lambda element: ' '.join(element.get('class') or ()),
+                           lambda element: element.parent,
+                           lambda element: element.has_attr('href'))
+
+
+@dataclass
+class ExtractedArticle:
+    """
+    Raw fields of an article page.
+    """
+
+    text: str
+    title: str
+    date: str
+    author: str | None = None
+    topics: list[str] = field(default_factory=list)
+
+
+class ArticleExtractor:
+    """
+    Extract article fields with rules compiled once per configuration.
+    """
+
+    def __init__(self, rules: ExtractionRules | None = None) -> None:
+        """
+        Initialize an instance of the ArticleExtractor class.
+
+        Args:
+            rules (ExtractionRules | None): Compiled rules, the default ones if not given
+        """
+        self._rules = rules or ExtractionRules()
+
+    @staticmethod
+    def _parse(html: str) -> etree._Element:
+        """
+        Build an lxml tree of a page.
+
+        Args:
+            html (str): HTML of the page
+
+        Returns:
+            etree._Element: Root of the tree
+        """
+        return lxml_html.document_fromstring(html)
+
+    def extract(self, html: str) -> ExtractedArticle:
+        """
+        Extract fields of an article page.
+
+        A page lacking the text, the title or the date raises IndexError,
+        just like the BeautifulSoup path does.
+
+        Args:
+            html (str): HTML of the article page
+
+        Returns:
+            ExtractedArticle: Fields of the article
+        """
+        fields = self._rules.select(ARTICLE_FIELDS).match_tree(self._parse(html))
+        authors = fields['author']
+        return ExtractedArticle(
+            text=get_text(fields['text'][0]),
+            title=get_text(fields['title'][-1]),
+            date=get_text(fields['date'][0]),
+            author=get_text(authors[0]) if authors else None,
+            topics=[get_text(topic) for topic in fields['topics']],
+        )
+
+    def extract_seed_links(self, html: str) -> list[str]:
+        """
+        Extract hrefs of article cards on a seed page.
+
+        Args:
+            html (str): HTML of the seed page
+
+        Returns:
+            list[str]: Hrefs in the order of the page
+        """
+        links = self._rules.select(('seed_links',)).match_tree(self._parse(html))['seed_links']
+        return [str(link.get('href')) for link in links]
+
+
+class ArticleStreamParser:
+    """
+    Incrementally parse a streamed article page until every field is read.
+
+    Fields of an article are found by the extraction rules. The page holds
+    all of them once an element enclosing elements of every required field
+    has closed, e.g. the article block. The author is not required, as
+    many articles have none. The rest of the page (galleries, videos,
+    related news) does not have to be downloaded. A page lacking some
+    required field never completes and is downloaded in full.
+    """
+
+    def __init__(self, rules: ExtractionRules | None = None,
+                 encoding: str | None = None) -> None:
+        """
+        Initialize an instance of the ArticleStreamParser class.
+
+        Args:
+            rules (ExtractionRules | None): Compiled rules, the default ones if not given
+            encoding (str | None): Encoding of the page
+        """
+        self._rules = (rules or ExtractionRules()).select(ARTICLE_FIELDS)
+        self._parser = etree.HTMLPullParser(events=('start', 'end'), encoding=encoding)
+        self._found: list[set[str]] = [set()]
+        self.is_complete = False
+
+    def feed(self, chunk: bytes) -> bool:
+        """
+        Parse the next chunk of the page.
+
+        Elements are dropped as soon as they close, so memory does not grow
+        with the size of the page.
+
+        Args:
+            chunk (bytes): Next chunk of the page
+
+        Returns:
+            bool: Whether an element enclosing every required field has closed
+        """
+        if self.is_complete:
+            return True
+        self._parser.feed(chunk)
+        for event, element in self._parser.read_events():
+            if event == 'start':
+                self._found.append(self._rules.match_element(element))
+                continue
+            fields = self._found.pop() if len(self._found) > 1 else set()
+            self._found[-1].update(fields)
+            element.clear(keep_tail=True)
+            if fields >= REQUIRED_ARTICLE_FIELDS:
+                self.is_complete = True
+                break
+        return self.is_complete
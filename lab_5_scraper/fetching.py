@@ -0,0 +1,129 @@
+"""
+Sending requests with retries, rate limiting, caching and archiving of responses.
+"""
+
+import time
+from typing import Any
+
+import requests
+
+from lab_5_scraper.archive import ResponseArchive
+from lab_5_scraper.config import Config
+from lab_5_scraper.extraction import ArticleStreamParser
+from lab_5_scraper.http_session import is_truncated
+from lab_5_scraper.resilience import build_failed_response
+
+
+def send_with_retries(url: str, config: Config,
+                      article_page: bool = False) -> requests.models.Response:
+    """
+    Request a url, retrying transient failures.
+
+    Timeouts, connection errors, 429 and 5xx responses are retried with
+    jittered exponential back-off. While the circuit of the host is open,
+    an empty 503 response is returned at once.
+
+    Args:
+        url (str): Site url
+        config (Config): Configuration
+        article_page (bool): Whether the url is an article page that may be
+            streamed and cut off once every required block is read
+
+    Returns:
+        requests.models.Response: A response from a request
+    """
+    archive = config.get_archive()
+    if archive is not None and config.get_storage_options().archive_mode == 'replay':
+        return replay_request(url, config, archive)
+    cache = config.get_response_cache()
+    guards = config.get_request_guards()
+    retry_policy = guards.retry_policy
+    circuit_breaker = guards.circuit_breaker
+    metrics = config.get_metrics()
+    start = time.perf_counter()
+    for attempt in range(retry_policy.max_retries + 1):
+        if not circuit_breaker.allow(url):
+            request = build_failed_response(url, 503, 'Circuit open')
+            request.encoding = config.get_encoding()
+            metrics.record_response(url, request.status_code, time.perf_counter() - start)
+            return request
+        if attempt:
+            metrics.add_retry()
+        request = send_request(url, config, article_page)
+        if not retry_policy.is_retryable(request):
+            circuit_breaker.record_success(url)
+            if cache and not is_truncated(request):
+                request = cache.update(url, request)
+            break
+        circuit_breaker.record_failure(url)
+        if attempt < retry_policy.max_retries:
+            retry_policy.wait(attempt, request)
+    metrics.record_response(url, request.status_code, time.perf_counter() - start)
+    if archive is not None:
+        archive.record(url, request)
+    request.encoding = config.get_encoding()
+    return request
+
+
+def send_request(url: str, config: Config,
+                 article_page: bool = False) -> requests.models.Response:
+    """
+    Send a single request within the politeness budget.
+
+    Args:
+        url (str): Site url
+        config (Config): Configuration
+        article_page (bool): Whether the url is an article page that may be
+            streamed and cut off once every required block is read. Pages
+            being recorded to the archive are always downloaded in full
+
+    Returns:
+        requests.models.Response: A response, or an empty 504/503 one on timeout
+            or connection error
+    """
+    rate_limiter = config.get_request_guards().rate_limiter
+    cache = config.get_response_cache()
+    session_pool = config.get_session_pool()
+    options: dict[str, Any] = {
+        'headers': cache.get_conditional_headers(url) if cache else None,
+        'timeout': config.get_timeout(),
+        'verify': config.get_verify_certificate(),
+    }
+    rate_limiter.acquire(url)
+    try:
+        if (article_page and config.get_processing_options().stream_article_pages
+                and config.get_storage_options().archive_mode != 'record'):
+            request = session_pool.stream(
+                url, ArticleStreamParser(config.get_extraction_rules(),
+                                         config.get_encoding()).feed, **options)
+        else:
+            request = session_pool.get(url, **options)
+    except requests.exceptions.Timeout:
+        request = build_failed_response(url, 504, 'Timeout')
+    except (requests.exceptions.ConnectionError, requests.exceptions.ChunkedEncodingError):
+        request = build_failed_response(url, 503, 'Connection error')
+    else:
+        rate_limiter.record(url, request.status_code, request.elapsed.total_seconds())
+        return request
+    rate_limiter.record(url, request.status_code, config.get_timeout())
+    return request
+
+
+def replay_request(url: str, config: Config,
+                   archive: ResponseArchive) -> requests.models.Response:
+    """
+    Deliver an archived response without touching the network.
+
+    Args:
+        url (str): Site url
+        config (Config): Configuration
+        archive (ResponseArchive): Archive of fetched pages
+
+    Returns:
+        requests.models.Response: Archived response or 404 if the url was never recorded
+    """
+    response = archive.replay(url)
+    if response is None:
+        response = build_failed_response(url, 404, 'Not archived')
+    response.encoding = config.get_encoding()
+    return response
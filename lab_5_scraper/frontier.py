@@ -0,0 +1,90 @@
+"""
+Crawl frontier: urls waiting to be visited.
+"""
+
+import heapq
+import itertools
+from typing import Callable, Iterable
+
+
+class PriorityFrontier:
+    """
+    Queue of urls that gives out the url with the highest priority first.
+
+    Urls of equal priority come out in the order they were pushed. The
+    frontier never holds a url twice: every url ever pushed is remembered,
+    so checking and skipping already known urls costs O(1).
+    """
+
+    def __init__(self, seen: Iterable[str] = ()) -> None:
+        """
+        Initialize an instance of the PriorityFrontier class.
+
+        Args:
+            seen (Iterable[str]): Urls known in advance that must not be queued
+        """
+        self._heap: list[tuple[float, int, str]] = []
+        self._order = itertools.count()
+        self._seen: set[str] = set(seen)
+
+    def __len__(self) -> int:
+        """
+        Get number of urls waiting to be visited.
+
+        Returns:
+            int: Number of urls waiting to be visited
+        """
+        return len(self._heap)
+
+    def __contains__(self, url: object) -> bool:
+        """
+        Check whether the url has ever been pushed or marked as seen.
+
+        Args:
+            url (object): Site url
+
+        Returns:
+            bool: Whether the url is known or not
+        """
+        return url in self._seen
+
+    def push(self, url: str, priority: float = 0.0) -> bool:
+        """
+        Queue the url unless it is already known.
+
+        Args:
+            url (str): Site url
+            priority (float): Priority of the url, the higher the sooner it is given out
+
+        Returns:
+            bool: Whether the url was queued
+        """
+        if url in self._seen:
+            return False
+        self._seen.add(url)
+        heapq.heappush(self._heap, (-priority, next(self._order), url))
+        return True
+
+    def pop(self, rescore: Callable[[str], float] | None = None) -> str:
+        """
+        Take the url with the highest priority.
+
+        Priorities may go stale while urls wait. Given a way to rescore urls,
+        the frontier rescores the best url and, if its priority fell below
+        the one of the next url, queues it again with the fresh priority and
+        takes the next one, so only urls about to come out are rescored.
+
+        Args:
+            rescore (Callable[[str], float] | None): Computes the current priority of a url
+
+        Returns:
+            str: Site url
+        """
+        while True:
+            priority, order, url = heapq.heappop(self._heap)
+            if rescore is None or not self._heap:
+                return url
+            fresh = -rescore(url)
+            if fresh <= self._heap[0][0] or fresh <= priority:
+                return url
+            heapq.heappush(self._heap, (fresh, order, url))
@@ -0,0 +1,167 @@
+"""
+On-disk HTTP response cache with conditional revalidation.
+"""
+
+# pylint: disable=protected-access
+import gzip
+import hashlib
+import json
+import os
+import pathlib
+import threading
+from typing import Union
+
+import requests
+
+
+class ResponseCache:
+    """
+    Store responses on disk and revalidate them with conditional requests.
+
+    Each url is addressed by the SHA-256 of the url: ``<key>.json`` keeps
+    validators and headers, ``<key>.html.gz`` keeps the compressed body. Both
+    live in a subdirectory named after the first two digits of the key.
+    """
+
+    def __init__(self, path: Union[pathlib.Path, str]) -> None:
+        """
+        Initialize an instance of the ResponseCache class.
+
+        Args:
+            path (Union[pathlib.Path, str]): Directory to store responses in
+        """
+        self.path = pathlib.Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def _get_entry_paths(self, url: str) -> tuple[pathlib.Path, pathlib.Path]:
+        """
+        Get paths to the metadata and the body of a cached url.
+
+        Args:
+            url (str): Site url
+
+        Returns:
+            tuple[pathlib.Path, pathlib.Path]: Paths to metadata and body
+        """
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        directory = self.path / key[:2]
+        return directory / f'{key}.json', directory / f'{key}.html.gz'
+
+    def _load_meta(self, url: str) -> dict | None:
+        """
+        Load metadata of a cached url.
+
+        Args:
+            url (str): Site url
+
+        Returns:
+            dict | None: Metadata or None if the url is not cached
+        """
+        meta_path, body_path = self._get_entry_paths(url)
+        if not meta_path.exists() or not body_path.exists():
+            return None
+        with open(meta_path, encoding='utf-8') as file:
+            meta: dict = json.load(file)
+        return meta
+
+    def get_conditional_headers(self, url: str) -> dict[str, str]:
+        """
+        Get headers revalidating a cached copy of the url.
+
+        Args:
+            url (str): Site url
+
+        Returns:
+            dict[str, str]: If-None-Match and If-Modified-Since headers
+        """
+        meta = self._load_meta(url)
+        if meta is None:
+            return {}
+        headers = {}
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+        return headers
+
+    @staticmethod
+    def _write_atomically(path: pathlib.Path, content: bytes) -> None:
+        """
+        Write content so that readers never see a partially written file.
+
+        Args:
+            path (pathlib.Path): Path to file
+            content (bytes): Content to write
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f'{path.name}.{os.getpid()}.{threading.get_ident()}.tmp')
+        tmp_path.write_bytes(content)
+        os.replace(tmp_path, path)
+
+    def store(self, url: str, response: requests.models.Response) -> None:
+        """
+        Save a successful response.
+
+        Args:
+            url (str): Site url
+            response (requests.models.Response): A response from a request
+        """
+        meta_path, body_path = self._get_entry_paths(url)
+        meta = {
+            'url': url,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'headers': dict(response.headers),
+            'sha256': hashlib.sha256(response.content).hexdigest(),
+        }
+        self._write_atomically(body_path, gzip.compress(response.content))
+        self._write_atomically(meta_path, json.dumps(meta, ensure_ascii=False).encode('utf-8'))
+
+    def load(self, url: str, response: requests.models.Response) -> requests.models.Response:
+        """
+        Rebuild a full response from disk in place of a 304 response.
+
+        Args:
+            url (str): Site url
+            response (requests.models.Response): A 304 response from a request
+
+        Returns:
+            requests.models.Response: A response with cached body
+        """
+        meta_path, body_path = self._get_entry_paths(url)
+        with open(meta_path, encoding='utf-8') as file:
+            meta = json.load(file)
+        cached = requests.models.Response()
+        cached.url = response.url or url
+        cached.status_code = 200
+        cached.reason = 'OK'
+        cached.headers = requests.structures.CaseInsensitiveDict(meta['headers'])
+        cached.headers.update(response.headers)
+        cached.request = response.request
+        cached.elapsed = response.elapsed
+        cached._content = gzip.decompress(body_path.read_bytes())
+        return cached
+
+    def update(self, url: str, response: requests.models.Response) -> requests.models.Response:
+        """
+        Serve 304 responses from disk and store fresh ones.
+
+        Args:
+            url (str): Site url
+            response (requests.models.Response): A response from a request
+
+        Returns:
+            requests.models.Response: A response with body
+        """
+        if response.status_code == 304 and self._load_meta(url) is not None:
+            with self._lock:
+                self.hits += 1
+            return self.load(url, response)
+        with self._lock:
+            self.misses += 1
+        if response.ok:
+            self.store(url, response)
+        return response
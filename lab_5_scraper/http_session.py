@@ -0,0 +1,364 @@
+"""
+Pooled keep-alive HTTP sessions shared by crawlers and parsers.
+
+Name lookup is timed through ``_new_conn`` and ``_dns_host`` of urllib3
+connections, which are private. urllib3 is pinned in requirements.txt for
+this reason; everything else goes through public attributes of requests and
+urllib3.
+"""
+
+# pylint: disable=protected-access
+import socket
+import threading
+import time
+import weakref
+from typing import Any, Callable
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3 import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
+from urllib3.util.retry import Retry
+
+from lab_5_scraper.metrics import ScrapeMetrics
+
+#: Number of bytes read at once from a streamed response
+STREAM_CHUNK_SIZE = 16 * 1024
+
+#: Durations of connection phases and sockets opened by the request the current thread sends
+_request_events = threading.local()
+
+#: Streamed responses whose download was stopped before the end of the body
+_truncated_responses: weakref.WeakSet = weakref.WeakSet()
+
+
+def is_truncated(response: requests.models.Response) -> bool:
+    """
+    Check whether a streamed response holds only the head of the body.
+
+    Args:
+        response (requests.models.Response): A response from a request
+
+    Returns:
+        bool: Whether the download was stopped before the end of the body
+    """
+    return response in _truncated_responses
+
+
+def _record_phase(phase: str, seconds: float) -> None:
+    """
+    Remember a duration of a connection phase of the current request.
+
+    Args:
+        phase (str): Phase name
+        seconds (float): Duration in seconds
+    """
+    timings = getattr(_request_events, 'timings', None)
+    if timings is not None:
+        timings[phase] = timings.get(phase, 0.0) + seconds
+
+
+def _record_socket() -> None:
+    """
+    Count a socket opened by the current request.
+    """
+    if getattr(_request_events, 'timings', None) is not None:
+        _request_events.sockets += 1
+
+
+class _TimedConnectionMixin:
+    """
+    Time name lookup separately from TCP and TLS handshakes of a new connection.
+    """
+
+    _dns_host: str
+    port: int
+
+    def _open_socket(self) -> socket.socket:
+        """
+        Open a socket with urllib3.
+
+        Returns:
+            socket.socket: Connected socket
+        """
+        sock: socket.socket = super()._new_conn()  # type: ignore[misc]
+        return sock
+
+    def _new_conn(self) -> socket.socket:
+        """
+        Open a socket, resolving the host apart so that name lookup is timed.
+
+        Returns:
+            socket.socket: Connected socket
+        """
+        start = time.perf_counter()
+        try:
+            addresses = socket.getaddrinfo(self._dns_host, self.port, 0, socket.SOCK_STREAM)
+        except socket.gaierror:
+            return self._open_socket()
+        _record_phase('dns', time.perf_counter() - start)
+        host = self._dns_host
+        error: Exception | None = None
+        try:
+            for *_, sockaddr in addresses:
+                self._dns_host = str(sockaddr[0])
+                try:
+                    return self._open_socket()
+                except (ConnectTimeoutError, NewConnectionError) as address_error:
+                    error = address_error
+        finally:
+            self._dns_host = host
+        raise error or NewConnectionError(self, f'No addresses found for {host}')
+
+    def connect(self) -> None:
+        """
+        Connect to the host, timing TCP and TLS handshakes and counting the socket.
+        """
+        timings = getattr(_request_events, 'timings', None)
+        dns_before = timings.get('dns', 0.0) if timings is not None else 0.0
+        start = time.perf_counter()
+        super().connect()  # type: ignore[misc]
+        dns = (timings.get('dns', 0.0) if timings is not None else 0.0) - dns_before
+        _record_phase('connect', time.perf_counter() - start - dns)
+        _record_socket()
+
+
+class _TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    """
+    HTTP connection timing its establishment.
+    """
+
+
+class _TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    """
+    HTTPS connection timing its establishment.
+    """
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    """
+    HTTP connection pool of timed connections.
+    """
+
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    """
+    HTTPS connection pool of timed connections.
+    """
+
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class _TimedAdapter(HTTPAdapter):
+    """
+    Adapter creating connection pools of timed connections.
+    """
+
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        """
+        Initialize a pool manager with pools of timed connections.
+
+        Args:
+            *args (Any): Positional arguments of the pool manager
+            **kwargs (Any): Keyword arguments of the pool manager
+        """
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _TimedHTTPConnectionPool,
+            'https': _TimedHTTPSConnectionPool,
+        }
+
+
+class SessionPool:
+    """
+    Reuse TCP and TLS connections across all requests of a crawl.
+    """
+
+    def __init__(self, headers: dict[str, str], pool_size: int, keep_alive: bool,
+                 max_retries: int, metrics: ScrapeMetrics | None = None) -> None:
+        """
+        Initialize an instance of the SessionPool class.
+
+        Args:
+            headers (dict[str, str]): Headers sent with every request
+            pool_size (int): Maximum number of connections kept open to a single host
+            keep_alive (bool): Whether to keep connections open between requests
+            max_retries (int): Number of retries on connection errors
+            metrics (ScrapeMetrics | None): Metrics receiving phase durations and traffic
+        """
+        self._headers = dict(headers)
+        if not keep_alive:
+            self._headers['Connection'] = 'close'
+        self._pool_size = pool_size
+        self._max_retries = max_retries
+        self._metrics = metrics
+        self._lock = threading.Lock()
+        self._session: requests.Session | None = None
+        self._sockets_opened = 0
+
+    def _build_session(self) -> requests.Session:
+        """
+        Create a session with a mounted connection pool.
+
+        Returns:
+            requests.Session: Session instance
+        """
+        session = requests.Session()
+        session.headers.update(self._headers)
+        adapter = _TimedAdapter(
+            pool_connections=self._pool_size,
+            pool_maxsize=self._pool_size,
+            max_retries=Retry(total=self._max_retries, raise_on_status=False),
+            pool_block=True,
+        )
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+
+    @property
+    def session(self) -> requests.Session:
+        """
+        Get the underlying session, creating it on first use.
+
+        Returns:
+            requests.Session: Session instance
+        """
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    self._session = self._build_session()
+        return self._session
+
+    def _send(self, url: str, **kwargs: Any) -> requests.models.Response:
+        """
+        Send a GET request recording durations of the phases up to receiving headers.
+
+        Args:
+            url (str): Site url
+            **kwargs (Any): Options passed to requests
+
+        Returns:
+            requests.models.Response: A response from a request
+        """
+        timings: dict[str, float] = {}
+        _request_events.timings = timings
+        _request_events.sockets = 0
+        try:
+            response = self.session.get(url, **kwargs)
+        finally:
+            _request_events.timings = None
+            with self._lock:
+                self._sockets_opened += _request_events.sockets
+        if self._metrics is None:
+            return response
+        for phase, seconds in timings.items():
+            self._metrics.observe(phase, seconds)
+        self._metrics.observe('ttfb', max(0.0, response.elapsed.total_seconds() -
+                                          sum(timings.values())))
+        return response
+
+    def _record_download(self, response: requests.models.Response, seconds: float) -> None:
+        """
+        Record the download time and the size of a received body.
+
+        Args:
+            response (requests.models.Response): A response with its body read
+            seconds (float): Duration of reading the body in seconds
+        """
+        if self._metrics is not None:
+            self._metrics.observe('download', max(0.0, seconds))
+            self._metrics.add_bytes(len(response.content))
+
+    def get(self, url: str, **kwargs: Any) -> requests.models.Response:
+        """
+        Send a GET request through the pool.
+
+        When metrics are given, name lookup and connection time of new connections,
+        time to first byte, download time and body size are recorded.
+
+        Args:
+            url (str): Site url
+            **kwargs (Any): Options passed to requests
+
+        Returns:
+            requests.models.Response: A response from a request
+        """
+        start = time.perf_counter()
+        response = self._send(url, **kwargs)
+        self._record_download(response, time.perf_counter() - start -
+                              response.elapsed.total_seconds())
+        return response
+
+    def stream(self, url: str, until: Callable[[bytes], bool],
+               chunk_size: int = STREAM_CHUNK_SIZE, **kwargs: Any) -> requests.models.Response:
+        """
+        Send a GET request reading the body in chunks until the body holds enough.
+
+        Once ``until`` is satisfied, the connection is closed instead of reading
+        the rest of the body, and the response holds the bytes read so far.
+
+        Args:
+            url (str): Site url
+            until (Callable[[bytes], bool]): Receives every chunk, True stops the download
+            chunk_size (int): Number of bytes read at once
+            **kwargs (Any): Options passed to requests
+
+        Returns:
+            requests.models.Response: A response with the body read so far
+        """
+        response = self._send(url, stream=True, **kwargs)
+        start = time.perf_counter()
+        chunks = []
+        aborted = False
+        try:
+            for chunk in response.iter_content(chunk_size):
+                chunks.append(chunk)
+                if response.ok and until(chunk):
+                    aborted = True
+                    break
+        finally:
+            response.close()
+        response._content = b''.join(chunks)
+        self._record_download(response, time.perf_counter() - start)
+        if aborted:
+            _truncated_responses.add(response)
+            if self._metrics is not None:
+                self._metrics.add_aborted_download()
+        return response
+
+    def get_statistics(self) -> dict[str, float]:
+        """
+        Collect connection reuse statistics over all hosts.
+
+        Returns:
+            dict[str, float]: Requests sent, sockets opened, reuse ratio and idle sockets
+        """
+        requests_sent = open_sockets = 0
+        connections_opened = self._sockets_opened
+        if self._session is not None:
+            adapters = {id(adapter): adapter for adapter in self._session.adapters.values()}
+            for adapter in adapters.values():
+                pools = adapter.poolmanager.pools
+                for pool in filter(None, map(pools.get, pools.keys())):
+                    requests_sent += pool.num_requests
+                    open_sockets += sum(1 for conn in list(pool.pool.queue)
+                                        if getattr(conn, 'sock', None) is not None)
+        reuse_ratio = 1 - connections_opened / requests_sent if requests_sent else 0.0
+        return {
+            'requests': requests_sent,
+            'connections': connections_opened,
+            'reuse_ratio': reuse_ratio,
+            'open_sockets': open_sockets,
+        }
+
+    def close(self) -> None:
+        """
+        Close all pooled connections.
+        """
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
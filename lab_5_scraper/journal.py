@@ -0,0 +1,113 @@
+"""
+Append-only journal persisting the state of a recursive crawl.
+"""
+
+import json
+import os
+import pathlib
+from typing import Union
+
+
+class CrawlJournal:
+    """
+    Persist collected and visited urls at the cost of new urls only.
+
+    State lives in a snapshot (``<name>.json``) and a log of changes made
+    after it (``<name>.jsonl``). Every visited page appends one line to the
+    log; every ``compact_every`` lines the state is written to a new snapshot
+    which atomically replaces the old one, and the log is emptied. Resuming
+    reads the snapshot and replays the log, cutting off a line torn by a
+    crash, so that lines appended afterwards start on a line of their own.
+    """
+
+    def __init__(self, path: Union[pathlib.Path, str], compact_every: int = 100) -> None:
+        """
+        Initialize an instance of the CrawlJournal class.
+
+        Args:
+            path (Union[pathlib.Path, str]): Path to snapshot
+            compact_every (int): Number of log lines written before compaction
+        """
+        self.snapshot_path = pathlib.Path(path)
+        self.log_path = self.snapshot_path.with_suffix('.jsonl')
+        self._compact_every = compact_every
+        self._lines_written = 0
+
+    def load(self) -> tuple[list[str], list[str]]:
+        """
+        Restore state from the snapshot and the log.
+
+        A torn line and everything after it is cut off the log, and lines
+        already in the log count towards the next compaction.
+
+        Returns:
+            tuple[list[str], list[str]]: Collected and visited urls in the order they were found
+        """
+        collected: dict[str, None] = {}
+        visited: dict[str, None] = {}
+        if self.snapshot_path.exists():
+            with open(self.snapshot_path, encoding='utf-8') as file:
+                snapshot = json.load(file)
+            collected.update(dict.fromkeys(snapshot['urls_collected']))
+            visited.update(dict.fromkeys(snapshot['urls_visited']))
+        self._lines_written = 0
+        if self.log_path.exists():
+            with open(self.log_path, 'r+b') as file:
+                complete_size = 0
+                for line in file:
+                    if not line.endswith(b'\n'):
+                        break
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        break
+                    collected.update(dict.fromkeys(entry['collected']))
+                    visited.update(dict.fromkeys(entry['visited']))
+                    complete_size += len(line)
+                    self._lines_written += 1
+                if file.seek(0, os.SEEK_END) > complete_size:
+                    file.truncate(complete_size)
+        return list(collected), list(visited)
+
+    def append(self, collected: list[str], visited: list[str]) -> None:
+        """
+        Log urls collected and visited since the previous call.
+
+        Args:
+            collected (list[str]): Newly collected urls
+            visited (list[str]): Newly visited urls
+        """
+        self.log_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.log_path, 'a', encoding='utf-8') as file:
+            file.write(json.dumps({'collected': collected, 'visited': visited},
+                                  ensure_ascii=False) + '\n')
+        self._lines_written += 1
+
+    def should_compact(self) -> bool:
+        """
+        Check whether the log has grown enough to be folded into a snapshot.
+
+        Returns:
+            bool: Whether to compact or not
+        """
+        return self._lines_written >= self._compact_every
+
+    def compact(self, collected: list[str], visited: list[str]) -> None:
+        """
+        Atomically write the full state to the snapshot and empty the log.
+
+        Args:
+            collected (list[str]): All collected urls
+            visited (list[str]): All visited urls
+        """
+        self.snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.snapshot_path.with_suffix('.json.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as file:
+            json.dump({'urls_collected': collected, 'urls_visited': visited}, file,
+                      ensure_ascii=False)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_path, self.snapshot_path)
+        with open(self.log_path, 'w', encoding='utf-8'):
+            pass
+        self._lines_written = 0
@@ -0,0 +1,217 @@
+"""
+Manifest of saved articles for incremental recrawls.
+"""
+
+import datetime
+import hashlib
+import json
+import os
+import pathlib
+import threading
+from typing import Union
+
+
+def get_text_hash(text: str) -> str:
+    """
+    Hash the text of an article.
+
+    Args:
+        text (str): Text of the article
+
+    Returns:
+        str: Hex digest of the text
+    """
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+
+class CrawlManifest:
+    """
+    Remember the id, the text hash and the fetch time of every saved article by its url.
+
+    Records are appended to a JSON Lines file as articles are saved, so the
+    manifest stays in step with the assets folder even if a crawl is
+    interrupted; a line torn by a crash is ignored. Later records of a url
+    override earlier ones, and compact rewrites the file with one line per url.
+    Article ids are taken in order, so they stay contiguous from 1.
+    """
+
+    def __init__(self, path: Union[pathlib.Path, str]) -> None:
+        """
+        Initialize an instance of the CrawlManifest class.
+
+        Args:
+            path (Union[pathlib.Path, str]): Path to manifest
+        """
+        self.path = pathlib.Path(path)
+        self._lock = threading.Lock()
+        self._entries: dict[str, dict] | None = None
+        self._hashes: dict[str, str] = {}
+
+    def _load(self) -> dict[str, dict]:
+        """
+        Read the manifest on first use.
+
+        Returns:
+            dict[str, dict]: Records by url
+        """
+        if self._entries is not None:
+            return self._entries
+        entries: dict[str, dict] = {}
+        is_torn = False
+        if self.path.exists():
+            with open(self.path, encoding='utf-8') as file:
+                for line in file:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        is_torn = True
+                        continue
+                    entries[entry['url']] = entry
+        self._entries = entries
+        self._hashes = {entry['hash']: url for url, entry in entries.items()}
+        if is_torn:
+            self.compact()
+        return entries
+
+    def __len__(self) -> int:
+        """
+        Get number of saved articles.
+
+        Returns:
+            int: Number of saved articles
+        """
+        return len(self._load())
+
+    def __contains__(self, url: object) -> bool:
+        """
+        Check whether an article was saved from the url.
+
+        Args:
+            url (object): Site url
+
+        Returns:
+            bool: Whether the article is in the manifest
+        """
+        return url in self._load()
+
+    def get_urls(self) -> list[str]:
+        """
+        Get urls of all saved articles.
+
+        Returns:
+            list[str]: Urls in the order of first saving
+        """
+        return list(self._load())
+
+    def get_id(self, url: str) -> int | None:
+        """
+        Get id of the article saved from the url.
+
+        Args:
+            url (str): Site url
+
+        Returns:
+            int | None: Article id or None if the url is new
+        """
+        entry = self._load().get(url)
+        return entry['id'] if entry else None
+
+    def get_next_id(self) -> int:
+        """
+        Get id a new article takes.
+
+        Returns:
+            int: Next free article id
+        """
+        return len(self._load()) + 1
+
+    def has_text(self, text: str) -> bool:
+        """
+        Check whether an article with exactly this text was saved.
+
+        Args:
+            text (str): Text of an article
+
+        Returns:
+            bool: Whether the text is already saved
+        """
+        self._load()
+        return get_text_hash(text) in self._hashes
+
+    def is_unchanged(self, url: str, text: str) -> bool:
+        """
+        Check whether the text of an article is the same as when it was saved.
+
+        Args:
+            url (str): Site url
+            text (str): Text of the article
+
+        Returns:
+            bool: Whether the saved article has the same text
+        """
+        entry = self._load().get(url)
+        return entry is not None and entry['hash'] == get_text_hash(text)
+
+    def is_stale(self, url: str, lastmod: datetime.date) -> bool:
+        """
+        Check whether an article may have been modified after it was fetched.
+
+        Sitemaps give only the day of a modification, so an article fetched
+        on the day it was modified is fetched again.
+
+        Args:
+            url (str): Site url
+            lastmod (datetime.date): Date the page was last modified
+
+        Returns:
+            bool: Whether the saved article was fetched no later than the day of the page
+        """
+        entry = self._load().get(url)
+        return (entry is not None and
+                datetime.datetime.fromisoformat(entry['fetched_at']).date() <= lastmod)
+
+    def record(self, url: str, article_id: int, text: str) -> None:
+        """
+        Record an article that has just been saved or checked.
+
+        Args:
+            url (str): Site url
+            article_id (int): Article id
+            text (str): Text of the article
+        """
+        text_hash = get_text_hash(text)
+        entry = {
+            'url': url,
+            'id': article_id,
+            'hash': text_hash,
+            'fetched_at': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        }
+        with self._lock:
+            self._load()[url] = entry
+            self._hashes[text_hash] = url
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, 'a', encoding='utf-8') as file:
+                file.write(json.dumps(entry, ensure_ascii=False) + '\n')
+
+    def clear(self) -> None:
+        """
+        Forget all articles.
+        """
+        with self._lock:
+            self._entries = {}
+            self._hashes = {}
+            self.path.unlink(missing_ok=True)
+
+    def compact(self) -> None:
+        """
+        Atomically rewrite the manifest with a single line per url.
+        """
+        entries = self._load()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix('.jsonl.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as file:
+            for entry in sorted(entries.values(), key=lambda item: item['id']):
+                file.write(json.dumps(entry, ensure_ascii=False) + '\n')
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_path, self.path)
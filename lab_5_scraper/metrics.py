@@ -0,0 +1,265 @@
+"""
+Latency, traffic and throughput metrics of a crawl.
+"""
+
+import bisect
+import heapq
+import json
+import pathlib
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, Union
+
+#: Upper bounds of histogram buckets in milliseconds
+BUCKET_BOUNDS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 30000)
+
+#: Phases of a request and of handling its page, in the order they happen
+PHASES = ('dns', 'connect', 'ttfb', 'download', 'request', 'parse', 'write')
+
+#: Number of slowest pages kept in the report
+SLOWEST_PAGES = 10
+
+
+class LatencyHistogram:
+    """
+    Histogram of durations over fixed, roughly logarithmic buckets.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialize an instance of the LatencyHistogram class.
+        """
+        self._counts = [0] * (len(BUCKET_BOUNDS_MS) + 1)
+        self._total = 0.0
+        self._max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        """
+        Add a duration to the histogram.
+
+        Args:
+            seconds (float): Duration in seconds
+        """
+        milliseconds = seconds * 1000
+        self._counts[bisect.bisect_left(BUCKET_BOUNDS_MS, milliseconds)] += 1
+        self._total += milliseconds
+        self._max = max(self._max, milliseconds)
+
+    def get_count(self) -> int:
+        """
+        Get number of observed durations.
+
+        Returns:
+            int: Number of observed durations
+        """
+        return sum(self._counts)
+
+    def get_percentile(self, percentile: float) -> float:
+        """
+        Estimate a percentile by the upper bound of the bucket it falls into.
+
+        Args:
+            percentile (float): Percentile from 0 to 100
+
+        Returns:
+            float: Estimated duration in milliseconds
+        """
+        rank = percentile / 100 * self.get_count()
+        seen = 0
+        for bound, count in zip(BUCKET_BOUNDS_MS, self._counts):
+            seen += count
+            if count and seen >= rank:
+                return min(float(bound), self._max)
+        return self._max
+
+    def get_summary(self) -> dict:
+        """
+        Summarize the histogram.
+
+        Returns:
+            dict: Count, mean, percentiles and maximum in milliseconds and bucket counts
+        """
+        count = self.get_count()
+        buckets = {f'<={bound}ms': bucket_count for bound, bucket_count
+                   in zip(BUCKET_BOUNDS_MS, self._counts) if bucket_count}
+        if self._counts[-1]:
+            buckets[f'>{BUCKET_BOUNDS_MS[-1]}ms'] = self._counts[-1]
+        return {
+            'count': count,
+            'mean_ms': round(self._total / count, 3) if count else 0.0,
+            'p50_ms': self.get_percentile(50),
+            'p90_ms': self.get_percentile(90),
+            'p99_ms': self.get_percentile(99),
+            'max_ms': round(self._max, 3),
+            'buckets': buckets,
+        }
+
+
+class ScrapeMetrics:
+    """
+    Collect metrics of every request, parse and write of a crawl.
+
+    Network phases are: ``dns`` (name lookup), ``connect`` (TCP and TLS
+    handshakes), ``ttfb`` (from sending the request to receiving headers)
+    and ``download`` (reading the body). ``request`` is the whole
+    make_request call, retries and waits included.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialize an instance of the ScrapeMetrics class.
+        """
+        self._lock = threading.Lock()
+        self._histograms = {phase: LatencyHistogram() for phase in PHASES}
+        self._status_codes: dict[int, int] = {}
+        self._bytes = 0
+        self._articles = 0
+        self._retries = 0
+        self._aborted_downloads = 0
+        self._duplicates = 0
+        self._slowest: list[tuple[float, str]] = []
+        self._started_at = time.monotonic()
+
+    def start(self) -> None:
+        """
+        Start measuring throughput from now on.
+        """
+        with self._lock:
+            self._started_at = time.monotonic()
+
+    def observe(self, phase: str, seconds: float) -> None:
+        """
+        Add a duration of a phase.
+
+        Args:
+            phase (str): One of PHASES
+            seconds (float): Duration in seconds
+        """
+        with self._lock:
+            self._histograms[phase].observe(seconds)
+
+    @contextmanager
+    def measure(self, phase: str) -> Iterator[None]:
+        """
+        Measure the duration of the enclosed block as a phase.
+
+        Args:
+            phase (str): One of PHASES
+
+        Yields:
+            None: Control to the measured block
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(phase, time.perf_counter() - start)
+
+    def record_response(self, url: str, status_code: int, seconds: float) -> None:
+        """
+        Record the outcome of a make_request call.
+
+        Args:
+            url (str): Site url
+            status_code (int): Status code of the final response
+            seconds (float): Duration of the call in seconds
+        """
+        with self._lock:
+            self._histograms['request'].observe(seconds)
+            self._status_codes[status_code] = self._status_codes.get(status_code, 0) + 1
+            heapq.heappush(self._slowest, (seconds, url))
+            if len(self._slowest) > SLOWEST_PAGES:
+                heapq.heappop(self._slowest)
+
+    def add_bytes(self, num_bytes: int) -> None:
+        """
+        Count bytes received.
+
+        Args:
+            num_bytes (int): Number of bytes
+        """
+        with self._lock:
+            self._bytes += num_bytes
+
+    def add_retry(self) -> None:
+        """
+        Count a repeated request.
+        """
+        with self._lock:
+            self._retries += 1
+
+    def add_aborted_download(self) -> None:
+        """
+        Count a download stopped once the page held everything needed.
+        """
+        with self._lock:
+            self._aborted_downloads += 1
+
+    def add_duplicate(self) -> None:
+        """
+        Count an article skipped as a near-duplicate of a saved one.
+        """
+        with self._lock:
+            self._duplicates += 1
+
+    def add_article(self) -> None:
+        """
+        Count a saved article.
+        """
+        with self._lock:
+            self._articles += 1
+
+    def get_report(self) -> dict:
+        """
+        Build a report of everything measured so far.
+
+        Returns:
+            dict: Report ready to be dumped as JSON
+        """
+        with self._lock:
+            elapsed = time.monotonic() - self._started_at
+            return {
+                'elapsed_seconds': round(elapsed, 3),
+                'articles': self._articles,
+                'articles_per_second': round(self._articles / elapsed, 3) if elapsed else 0.0,
+                'bytes_received': self._bytes,
+                'retries': self._retries,
+                'aborted_downloads': self._aborted_downloads,
+                'duplicates': self._duplicates,
+                'status_codes': {str(code): count
+                                 for code, count in sorted(self._status_codes.items())},
+                'phases': {phase: histogram.get_summary()
+                           for phase, histogram in self._histograms.items()
+                           if histogram.get_count()},
+                'slowest_pages': [{'url': url, 'seconds': round(seconds, 3)}
+                                  for seconds, url in sorted(self._slowest, reverse=True)],
+            }
+
+    def get_summary_line(self) -> str:
+        """
+        Build a one-line summary for live progress output.
+
+        Returns:
+            str: Summary line
+        """
+        report = self.get_report()
+        request = report['phases'].get('request', {})
+        return (f"{report['elapsed_seconds']:.0f}s: {report['articles']} articles "
+                f"({report['articles_per_second']:.2f}/s), "
+                f"{request.get('count', 0)} requests "
+                f"(p50 {request.get('p50_ms', 0):.0f}ms, p99 {request.get('p99_ms', 0):.0f}ms), "
+                f"{report['bytes_received'] / 1024 / 1024:.1f} MiB, "
+                f"{report['retries']} retries")
+
+    def save_report(self, path: Union[pathlib.Path, str]) -> None:
+        """
+        Write the report as JSON.
+
+        Args:
+            path (Union[pathlib.Path, str]): Path to report
+        """
+        path = pathlib.Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(self.get_report(), file, indent=4, ensure_ascii=False)
@@ -0,0 +1,169 @@
+"""
+Per-host token bucket rate limiting with adaptive back-off.
+"""
+
+import threading
+import time
+from urllib.parse import urlparse
+
+#: Status codes signalling that the server asks to slow down
+BACK_OFF_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+#: Lowest rate of backing off: that of the former sleep of 1-3 seconds after every request
+SLOWEST_RATE = 1 / 3
+
+#: Number of slow responses in a row that makes the latency count as sustained
+SLOW_RESPONSES_TO_BACK_OFF = 3
+
+
+class TokenBucket:
+    """
+    Token bucket refilled at a constant rate.
+    """
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        """
+        Initialize an instance of the TokenBucket class.
+
+        Args:
+            rate (float): Number of tokens added per second
+            capacity (float): Maximum number of tokens the bucket holds
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated_at = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        """
+        Add tokens accumulated since the last update.
+
+        Args:
+            now (float): Current monotonic time
+        """
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    def reserve(self) -> float:
+        """
+        Take a token, going into debt if the bucket is empty.
+
+        Returns:
+            float: Number of seconds to wait before the token may be used
+        """
+        self._refill(time.monotonic())
+        self._tokens -= 1
+        return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+
+class RateLimiter:
+    """
+    Keep requests to each host within a politeness budget.
+
+    The budget is a token bucket per host. When adaptive, the rate is halved
+    on 429/5xx responses or on sustained high latency and grows back
+    additively on healthy responses, never exceeding the configured rate nor
+    falling below SLOWEST_RATE. A single slow response is not acted upon.
+    """
+
+    def __init__(self, requests_per_second: float, burst_size: int,
+                 adaptive: bool = True, latency_factor: float = 2.0) -> None:
+        """
+        Initialize an instance of the RateLimiter class.
+
+        Args:
+            requests_per_second (float): Maximum rate of requests to a single host,
+                0 disables limiting
+            burst_size (int): Number of requests allowed to go at once
+            adaptive (bool): Whether to adapt the rate to server feedback
+            latency_factor (float): Threshold of a slow response relative to the average latency
+        """
+        self._max_rate = requests_per_second
+        self._min_rate = min(requests_per_second, SLOWEST_RATE)
+        self._burst_size = burst_size
+        self._adaptive = adaptive
+        self._latency_factor = latency_factor
+        self._buckets: dict[str, TokenBucket] = {}
+        self._latencies: dict[str, float] = {}
+        self._slow_responses: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _get_host(url: str) -> str:
+        """
+        Get host of the url.
+
+        Args:
+            url (str): Site url
+
+        Returns:
+            str: Host of the url
+        """
+        return urlparse(url).netloc.lower()
+
+    def _get_bucket(self, host: str) -> TokenBucket:
+        """
+        Get a bucket of the host, creating it on first use.
+
+        Args:
+            host (str): Host
+
+        Returns:
+            TokenBucket: Bucket of the host
+        """
+        if host not in self._buckets:
+            self._buckets[host] = TokenBucket(self._max_rate, self._burst_size)
+        return self._buckets[host]
+
+    def acquire(self, url: str) -> None:
+        """
+        Block until a request to the url fits into the budget.
+
+        Args:
+            url (str): Site url
+        """
+        if self._max_rate <= 0:
+            return
+        with self._lock:
+            delay = self._get_bucket(self._get_host(url)).reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    def record(self, url: str, status_code: int, latency: float) -> None:
+        """
+        Adapt the rate of the host to the outcome of a request.
+
+        Args:
+            url (str): Site url
+            status_code (int): Status code of the response
+            latency (float): Number of seconds the response took
+        """
+        if self._max_rate <= 0 or not self._adaptive:
+            return
+        host = self._get_host(url)
+        with self._lock:
+            bucket = self._get_bucket(host)
+            average = self._latencies.get(host, latency)
+            self._latencies[host] = 0.8 * average + 0.2 * latency
+            slow_responses = (self._slow_responses.get(host, 0) + 1
+                              if latency > self._latency_factor * average else 0)
+            if (status_code in BACK_OFF_STATUS_CODES or
+                    slow_responses >= SLOW_RESPONSES_TO_BACK_OFF):
+                bucket.rate = max(self._min_rate, bucket.rate / 2)
+                slow_responses = 0
+            elif not slow_responses:
+                bucket.rate = min(self._max_rate, bucket.rate + self._max_rate / 10)
+            self._slow_responses[host] = slow_responses
+
+    def get_rate(self, url: str) -> float:
+        """
+        Get current rate of requests to the host of the url.
+
+        Args:
+            url (str): Site url
+
+        Returns:
+            float: Number of requests per second
+        """
+        with self._lock:
+            return self._get_bucket(self._get_host(url)).rate
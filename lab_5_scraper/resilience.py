@@ -0,0 +1,240 @@
+"""
+Retries with jittered exponential back-off, per-host circuit breaking and the guards
+every request passes.
+"""
+
+# pylint: disable=protected-access
+import random
+import threading
+import time
+from urllib.parse import urlparse
+
+import requests
+
+from core_utils.config_dto import NetworkOptions
+from lab_5_scraper.rate_limiter import BACK_OFF_STATUS_CODES, RateLimiter
+from lab_5_scraper.urls import SingleFlight
+
+#: Status codes of responses worth requesting again
+RETRY_STATUS_CODES = BACK_OFF_STATUS_CODES
+
+
+def build_failed_response(url: str, status_code: int, reason: str) -> requests.models.Response:
+    """
+    Build an empty response standing for a request that did not succeed.
+
+    Args:
+        url (str): Site url
+        status_code (int): Status code of the response
+        reason (str): Reason of the failure
+
+    Returns:
+        requests.models.Response: Empty response
+    """
+    response = requests.models.Response()
+    response.url = url
+    response.status_code = status_code
+    response.reason = reason
+    response._content = b''
+    return response
+
+
+class RetryPolicy:
+    """
+    Decide whether to repeat a request and how long to wait before it.
+
+    Delays grow exponentially with the attempt number and are drawn uniformly
+    from zero to that bound ("full jitter"), so workers failing together do
+    not retry together. A Retry-After header of the server is respected.
+    """
+
+    def __init__(self, max_retries: int, backoff_factor: float, max_delay: float = 30.0) -> None:
+        """
+        Initialize an instance of the RetryPolicy class.
+
+        Args:
+            max_retries (int): Number of retries after the first attempt
+            backoff_factor (float): Upper bound of the first delay in seconds
+            max_delay (float): Upper bound of any delay in seconds
+        """
+        self.max_retries = max_retries
+        self._backoff_factor = backoff_factor
+        self._max_delay = max_delay
+
+    @staticmethod
+    def is_retryable(response: requests.models.Response) -> bool:
+        """
+        Check whether the response signals a transient failure.
+
+        Args:
+            response (requests.models.Response): A response from a request
+
+        Returns:
+            bool: Whether the request is worth repeating
+        """
+        return response.status_code in RETRY_STATUS_CODES
+
+    def get_delay(self, attempt: int, response: requests.models.Response | None = None) -> float:
+        """
+        Get the number of seconds to wait before the next attempt.
+
+        Args:
+            attempt (int): Number of the failed attempt, starting with 0
+            response (requests.models.Response | None): Failed response, if any
+
+        Returns:
+            float: Number of seconds to wait
+        """
+        delay = random.uniform(0, min(self._max_delay, self._backoff_factor * 2 ** attempt))
+        retry_after = response.headers.get('Retry-After', '') if response is not None else ''
+        if retry_after.isdigit():
+            delay = max(delay, float(retry_after))
+        return min(delay, self._max_delay)
+
+    def wait(self, attempt: int, response: requests.models.Response | None = None) -> None:
+        """
+        Sleep before the next attempt.
+
+        Args:
+            attempt (int): Number of the failed attempt, starting with 0
+            response (requests.models.Response | None): Failed response, if any
+        """
+        delay = self.get_delay(attempt, response)
+        if delay > 0:
+            time.sleep(delay)
+
+
+class CircuitBreaker:
+    """
+    Stop sending requests to a host that keeps failing.
+
+    After ``failure_threshold`` consecutive failures the circuit of the host
+    opens and requests fail at once. Once ``reset_timeout`` seconds pass, a
+    single probe request is let through: its success closes the circuit, its
+    failure opens it again.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float) -> None:
+        """
+        Initialize an instance of the CircuitBreaker class.
+
+        Args:
+            failure_threshold (int): Number of consecutive failures opening the circuit,
+                0 disables breaking
+            reset_timeout (float): Number of seconds before a probe request is let through
+        """
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._failures: dict[str, int] = {}
+        self._opened_at: dict[str, float] = {}
+        self._probing: set[str] = set()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _get_host(url: str) -> str:
+        """
+        Get host of the url.
+
+        Args:
+            url (str): Site url
+
+        Returns:
+            str: Host of the url
+        """
+        return urlparse(url).netloc.lower()
+
+    def allow(self, url: str) -> bool:
+        """
+        Check whether a request to the url may be sent.
+
+        Args:
+            url (str): Site url
+
+        Returns:
+            bool: Whether the circuit of the host lets the request through
+        """
+        if not self._failure_threshold:
+            return True
+        host = self._get_host(url)
+        with self._lock:
+            opened_at = self._opened_at.get(host)
+            if opened_at is None:
+                return True
+            if host in self._probing or time.monotonic() - opened_at < self._reset_timeout:
+                return False
+            self._probing.add(host)
+            return True
+
+    def record_success(self, url: str) -> None:
+        """
+        Close the circuit of the host.
+
+        Args:
+            url (str): Site url
+        """
+        host = self._get_host(url)
+        with self._lock:
+            self._failures.pop(host, None)
+            self._opened_at.pop(host, None)
+            self._probing.discard(host)
+
+    def record_failure(self, url: str) -> None:
+        """
+        Count a failure of the host, opening its circuit when there are too many.
+
+        Args:
+            url (str): Site url
+        """
+        if not self._failure_threshold:
+            return
+        host = self._get_host(url)
+        with self._lock:
+            self._failures[host] = self._failures.get(host, 0) + 1
+            if host in self._probing or self._failures[host] >= self._failure_threshold:
+                self._opened_at[host] = time.monotonic()
+                self._probing.discard(host)
+
+    def is_open(self, url: str) -> bool:
+        """
+        Check whether the circuit of the host is open.
+
+        Args:
+            url (str): Site url
+
+        Returns:
+            bool: Whether requests to the host fail at once
+        """
+        with self._lock:
+            return self._get_host(url) in self._opened_at
+
+
+class RequestGuards:  # pylint: disable=too-few-public-methods
+    """
+    Guards shared by every request of a configuration.
+    """
+
+    #: Limit of the rate of requests to a single host
+    rate_limiter: RateLimiter
+
+    #: Retries of failed requests
+    retry_policy: RetryPolicy
+
+    #: Circuits of hosts failing in a row
+    circuit_breaker: CircuitBreaker
+
+    #: Coalescing of concurrent requests of the same url
+    single_flight: SingleFlight
+
+    def __init__(self, network: NetworkOptions) -> None:
+        """
+        Initialize an instance of the RequestGuards class.
+
+        Args:
+            network (NetworkOptions): Settings of connections, request rate and retries
+        """
+        self.rate_limiter = RateLimiter(network.requests_per_second, network.burst_size,
+                                        network.adaptive_rate_limit)
+        self.retry_policy = RetryPolicy(network.max_retries, network.backoff_factor)
+        self.circuit_breaker = CircuitBreaker(network.circuit_breaker_threshold,
+                                              network.circuit_breaker_timeout)
+        self.single_flight = SingleFlight()
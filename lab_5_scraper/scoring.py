@@ -0,0 +1,152 @@
+"""
+Scores telling a recursive crawler which found links to visit first.
+"""
+
+import datetime
+import re
+from collections import Counter
+from urllib.parse import urlsplit
+
+from lab_5_scraper.dates import MONTHS
+
+#: Signals a link is scored by and their default weights
+DEFAULT_FRONTIER_WEIGHTS = {
+    'article': 4.0,
+    'freshness': 2.0,
+    'rubric': 1.0,
+    'depth': 1.0,
+}
+
+#: Number of days after which freshness of a link halves
+FRESHNESS_HALF_LIFE = 7.0
+
+DATE_PATTERNS = (
+    re.compile(r'(?P<day>\d{1,2})\s+(?P<month>' + '|'.join(MONTHS) + r')\s+(?P<year>\d{4})',
+               re.IGNORECASE),
+    re.compile(r'(?P<day>\d{1,2})\.(?P<month>\d{1,2})\.(?P<year>\d{4})'),
+    re.compile(r'(?P<year>\d{4})[/-](?P<month>\d{2})[/-](?P<day>\d{2})'),
+)
+
+RUBRIC_PATTERN = re.compile(r'^/rubrics/(?P<rubric>[^/]+)/')
+
+
+def find_date(text: str) -> datetime.date | None:
+    """
+    Find the first date written in a text or a url.
+
+    Args:
+        text (str): Text or url
+
+    Returns:
+        datetime.date | None: Date or None if there is no valid date
+    """
+    for pattern in DATE_PATTERNS:
+        for match in pattern.finditer(text):
+            month = match['month']
+            try:
+                return datetime.date(int(match['year']),
+                                     MONTHS.get(month.lower()) or int(month),
+                                     int(match['day']))
+            except ValueError:
+                continue
+    return None
+
+
+def get_rubric(url: str) -> str | None:
+    """
+    Get the rubric a url belongs to by its path.
+
+    Args:
+        url (str): Site url
+
+    Returns:
+        str | None: Rubric or None if the path does not name one
+    """
+    match = RUBRIC_PATTERN.match(urlsplit(url).path)
+    return match['rubric'] if match else None
+
+
+class LinkScorer:
+    """
+    Score links so that the most promising ones are visited first.
+
+    A score is a weighted sum of four signals from 0 to 1: whether the url
+    matches an article template, how fresh the date of the link or of the
+    page it was found on is, how few urls of its rubric were collected so
+    far, and how close the page is to the start page.
+    """
+
+    def __init__(self, weights: dict[str, float], templates: list[str],
+                 today: datetime.date | None = None) -> None:
+        """
+        Initialize an instance of the LinkScorer class.
+
+        Args:
+            weights (dict[str, float]): Weights of the signals by their names
+            templates (list[str]): Url prefixes of article pages
+            today (datetime.date | None): Date freshness is counted from, today by default
+        """
+        self._weights = dict(DEFAULT_FRONTIER_WEIGHTS, **weights)
+        self._templates = tuple(templates)
+        self._today = today or datetime.date.today()
+        self._rubrics: Counter[str] = Counter()
+
+    def add_collected(self, rubric: str | None) -> None:
+        """
+        Count a collected url of a rubric.
+
+        Args:
+            rubric (str | None): Rubric of the url, if known
+        """
+        if rubric is not None:
+            self._rubrics[rubric] += 1
+
+    def _score_rubric(self, rubric: str | None) -> float:
+        """
+        Score how few urls of the rubric were collected.
+
+        Args:
+            rubric (str | None): Rubric, if known
+
+        Returns:
+            float: 1 for a rubric with no urls, 0 for the largest one or an unknown one
+        """
+        if rubric is None:
+            return 0.0
+        if not self._rubrics:
+            return 1.0
+        return 1.0 - self._rubrics[rubric] / max(self._rubrics.values())
+
+    def _score_freshness(self, published: datetime.date | None) -> float:
+        """
+        Score how recent a date is.
+
+        Args:
+            published (datetime.date | None): Date, if known
+
+        Returns:
+            float: 1 for today and later, halving every FRESHNESS_HALF_LIFE days, 0 if unknown
+        """
+        if published is None:
+            return 0.0
+        age = max((self._today - published).days, 0)
+        return float(0.5 ** (age / FRESHNESS_HALF_LIFE))
+
+    def score(self, url: str, depth: int, rubric: str | None = None,
+              published: datetime.date | None = None) -> float:
+        """
+        Score a link.
+
+        Args:
+            url (str): Canonical site url
+            depth (int): Number of links between the start page and the url
+            rubric (str | None): Rubric of the url, if known
+            published (datetime.date | None): Date of the link, if known
+
+        Returns:
+            float: Score, the higher the sooner the url is visited
+        """
+        return (self._weights['article'] * url.startswith(self._templates) +
+                self._weights['freshness'] * self._score_freshness(published) +
+                self._weights['rubric'] * self._score_rubric(rubric) +
+                self._weights['depth'] / (1 + depth))
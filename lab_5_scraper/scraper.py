@@ -2,257 +2,363 @@
 Crawler implementation.
 """
 
+from __future__ import annotations
+
+import asyncio
 import datetime
-import json
+import itertools
+import logging
+import os
 
 # pylint: disable=too-many-arguments, too-many-instance-attributes, unused-import, undefined-variable, unused-argument
 import pathlib
+import re
 import shutil
-from random import randint
-from time import sleep
-from typing import Pattern, Union
+from typing import Pattern, TYPE_CHECKING, TypeGuard, Union
+from urllib.parse import urlparse
 
 import requests
-from bs4 import BeautifulSoup
 
-from core_utils.article.article import Article
+from core_utils.article.article import (
+    Article,
+    get_article_id_from_filepath,
+    is_sharded,
+    iter_article_files,
+    SHARDED_LAYOUT_MARKER,
+)
 from core_utils.article.io import to_meta, to_raw
-from core_utils.config_dto import ConfigDTO
 from core_utils.constants import ASSETS_PATH, CRAWLER_CONFIG_PATH
+from core_utils.lazy import LazyModule
+from lab_5_scraper.archive import ResponseArchive
+from lab_5_scraper.config import (
+    ARCHIVE_MODES,
+    ARCHIVE_PATH,
+    Config,
+    FRONTIER_PATH,
+    HTTP_CACHE_PATH,
+    IncorrectArchiveModeError,
+    IncorrectConcurrencyError,
+    IncorrectDiscoveryError,
+    IncorrectEncodingError,
+    IncorrectExtractionRulesError,
+    IncorrectFrontierWeightsError,
+    IncorrectHeadersError,
+    IncorrectNumberOfArticlesError,
+    IncorrectRateLimitError,
+    IncorrectRetryError,
+    IncorrectSeedPagesError,
+    IncorrectSeedURLError,
+    IncorrectSessionError,
+    IncorrectTimeoutError,
+    IncorrectVerifyError,
+    MANIFEST_PATH,
+    NumberOfArticlesOutOfRangeError,
+    WEBSITE,
+)
+from lab_5_scraper.dates import compile_date, parse_date, parse_dates
+from lab_5_scraper.discovery import discover_entries
+from lab_5_scraper.extraction import ARTICLE_FIELDS, ArticleExtractor, ExtractedArticle
+from lab_5_scraper.fetching import replay_request, send_request, send_with_retries
+from lab_5_scraper.frontier import PriorityFrontier
+from lab_5_scraper.journal import CrawlJournal
+from lab_5_scraper.manifest import CrawlManifest
+from lab_5_scraper.scoring import find_date, get_rubric, LinkScorer
+from lab_5_scraper.shared_frontier import get_worker_name, SharedFrontier
+from lab_5_scraper.urls import canonicalize_url
+
+if TYPE_CHECKING:
+    import bs4
+
+    from lab_5_scraper import async_scraper
+else:
+    #: Imported on first use: by BeautifulSoup extraction only
+    bs4 = LazyModule('bs4')
+    #: Imported on first use: the asynchronous pipeline builds on the classes of this module
+    async_scraper = LazyModule('lab_5_scraper.async_scraper')
+
+ARTICLE_URL_PREFIX = WEBSITE + '/article/'
+PAGER_PATTERN = re.compile(r'[?&](PAGEN_\d+)=(\d+)')
+METRICS_PATH = pathlib.Path(ASSETS_PATH).parent / 'scrape_metrics.json'
+
+#: Number of archived pages whose dates are resolved at once by a replay
+REPLAY_BATCH_SIZE = 500
+
+#: Errors of parsing a page that lacks blocks of an article or has a malformed date
+UNPARSEABLE_PAGE_ERRORS = (IndexError, ValueError)
+
+logger = logging.getLogger(__name__)
+
+def make_request(url: str, config: Config,
+                 article_page: bool = False) -> requests.models.Response:
+    """
+    Deliver a response from a request with given configuration.
 
-WEBSITE = 'https://ugra-news.ru'
+    Concurrent requests of the same canonical url are sent once and
+    share the response.
 
+    Args:
+        url (str): Site url
+        config (Config): Configuration
+        article_page (bool): Whether the url is an article page that may be
+            streamed and cut off once every required block is read
 
-class IncorrectSeedURLError(Exception):
-    """
-    Raised when seed URL is not a valid URL
+    Returns:
+        requests.models.Response: A response from a request
     """
+    return config.get_request_guards().single_flight.do(
+        (canonicalize_url(url), article_page), send_with_retries, url, config, article_page)
 
 
-class NumberOfArticlesOutOfRangeError(Exception):
+class HostLimiter:
     """
-    Raised when number of articles is out of range from 1 to 150
+    Bound the number of in-flight requests to each host.
     """
 
+    def __init__(self, max_requests_per_host: int) -> None:
+        """
+        Initialize an instance of the HostLimiter class.
 
-class IncorrectNumberOfArticlesError(Exception):
-    """
-    Raised when total number of articles to parse is not integer or is less than 0
-    """
-
+        Args:
+            max_requests_per_host (int): Maximum number of simultaneous requests to a single host
+        """
+        self._max_requests_per_host = max_requests_per_host
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
 
-class IncorrectHeadersError(Exception):
-    """
-    Raised when headers are not a dictionary
-    """
+    def for_url(self, url: str) -> asyncio.Semaphore:
+        """
+        Get a semaphore guarding the host of the url.
 
+        Args:
+            url (str): Site url
 
-class IncorrectEncodingError(Exception):
-    """
-    Raised when encoding is not a string
-    """
+        Returns:
+            asyncio.Semaphore: Semaphore of the host
+        """
+        host = urlparse(url).netloc.lower()
+        if host not in self._semaphores:
+            self._semaphores[host] = asyncio.Semaphore(self._max_requests_per_host)
+        return self._semaphores[host]
 
 
-class IncorrectTimeoutError(Exception):
-    """
-    Raised when timeout value is not a positive integer less than 60
+async def make_request_async(url: str, config: Config, limiter: HostLimiter,
+                             article_page: bool = False) -> requests.models.Response:
     """
+    Deliver a response from a request without blocking the event loop.
 
+    Args:
+        url (str): Site url
+        config (Config): Configuration
+        limiter (HostLimiter): Limiter of in-flight requests per host
+        article_page (bool): Whether the url is an article page that may be
+            streamed and cut off once every required block is read
 
-class IncorrectVerifyError(Exception):
-    """
-    Raised when verify certificate value is not True or False
+    Returns:
+        requests.models.Response: A response from a request
     """
+    async with limiter.for_url(url):
+        return await asyncio.to_thread(make_request, url, config, article_page)
 
 
-class Config:
+class Crawler:
     """
-    Class for unpacking and validating configurations.
+    Crawler implementation.
     """
 
-    def __init__(self, path_to_config: pathlib.Path) -> None:
+    #: Url pattern
+    url_pattern: Union[Pattern, str]
+
+    def __init__(self, config: Config) -> None:
         """
-        Initialize an instance of the Config class.
+        Initialize an instance of the Crawler class.
 
         Args:
-            path_to_config (pathlib.Path): Path to configuration.
+            config (Config): Configuration
         """
-        self.path_to_config = path_to_config
-        config = self._extract_config_content()
-        self._seed_urls = config.seed_urls
-        self._num_articles = config.total_articles
-        self._headers = config.headers
-        self._encoding = config.encoding
-        self._timeout = config.timeout
-        self._should_verify_certificate = config.should_verify_certificate
-        self._headless_mode = config.headless_mode
-        self._validate_config_content()
+        self.config = config
+        self.urls = []
+        manifest = config.get_manifest()
+        self._collected: set[str] = set(manifest.get_urls()) if manifest else set()
+        self._refreshed: set[str] = set()
+        self._pagers: dict[str, tuple[str, int]] = {}
 
-    def _extract_config_content(self) -> ConfigDTO:
+    def _find_seed_urls(self, response: requests.models.Response) -> list[str]:
         """
-        Get config values.
+        Find article urls on a seed page.
 
-        Returns:
-            ConfigDTO: Config values
-        """
-        with open(self.path_to_config, encoding='utf-8') as file:
-            config = json.load(file)
-        return ConfigDTO(**config)
-
-    def _validate_config_content(self) -> None:
-        """
-        Ensure configuration parameters are not corrupt.
-        """
-        if (not isinstance(self._seed_urls, list) or
-                not all(isinstance(url, str) for url in self._seed_urls)):
-            raise IncorrectSeedURLError('Parameter _seed_urls of Config is malformed')
-        if not all(url.startswith(WEBSITE) for url in self._seed_urls):
-            raise IncorrectSeedURLError('Not all URLs belong to the original website')
-        if (not isinstance(self._num_articles, int) or
-                isinstance(self._num_articles, bool) or self._num_articles < 0):
-            raise IncorrectNumberOfArticlesError('Invalid number of articles to pass')
-        if self._num_articles > 150:
-            raise NumberOfArticlesOutOfRangeError(
-                'Number of articles is out of range: should be between 1 and 150')
-        if not isinstance(self._headers, dict):
-            raise IncorrectHeadersError('Headers is not an instance of dict')
-        if not isinstance(self._encoding, str):
-            raise IncorrectEncodingError('Encoding is not an instance of str')
-        if self._timeout not in range(1, 61):
-            raise IncorrectTimeoutError('Timeout is out of range')
-        if not isinstance(self._should_verify_certificate, bool):
-            raise IncorrectVerifyError('should_verify_certificate is not an instance of bool')
-        if not isinstance(self._headless_mode, bool):
-            raise IncorrectVerifyError('headless_mode is not an instance of bool')
-
-    def get_seed_urls(self) -> list[str]:
-        """
-        Retrieve seed urls.
+        Args:
+            response (requests.models.Response): A response from a seed url
 
         Returns:
-            list[str]: Seed urls
+            list[str]: Urls of articles linked from the page, collected before or not
         """
-        return self._seed_urls
-
-    def get_num_articles(self) -> int:
-        """
-        Retrieve total number of articles to scrape.
+        if not response.ok:
+            return []
+        if self.config.get_processing_options().use_fast_extraction:
+            extractor = ArticleExtractor(self.config.get_extraction_rules())
+            return [canonicalize_url(href, WEBSITE)
+                    for href in extractor.extract_seed_links(response.text)]
+        bs_text = bs4.BeautifulSoup(response.text, 'lxml')
+        rules = self.config.get_extraction_rules().select(('seed_links',))
+        links = rules.match_soup(bs_text)['seed_links']
+        return [self._extract_url(a_elem) for a_elem in links]
 
-        Returns:
-            int: Total number of articles to scrape
+    def _collect_urls(self, found_urls: list[str]) -> list[str]:
         """
-        return self._num_articles
+        Collect article urls found on a seed page.
 
-    def get_headers(self) -> dict[str, str]:
-        """
-        Retrieve headers to use during requesting.
+        Args:
+            found_urls (list[str]): Urls of articles linked from the page
 
         Returns:
-            dict[str, str]: Headers
+            list[str]: Urls that were not collected before
         """
-        return self._headers
+        new_urls = []
+        for url in found_urls:
+            if len(self.urls) >= self.config.get_num_articles():
+                break
+            if url not in self._collected:
+                self._collected.add(url)
+                self.urls.append(url)
+                new_urls.append(url)
+        return new_urls
 
-    def get_encoding(self) -> str:
+    def _extract_url(self, article_bs: bs4.Tag) -> str:
         """
-        Retrieve encoding to use during parsing.
+        Find and retrieve url from HTML.
+
+        Args:
+            article_bs (bs4.Tag): Link element
 
         Returns:
-            str: Encoding
+            str: Canonical url from HTML
         """
-        return self._encoding
+        return canonicalize_url(str(article_bs['href']), WEBSITE)
 
-    def get_timeout(self) -> int:
+    def _fetch_document(self, url: str) -> bytes | None:
         """
-        Retrieve number of seconds to wait for response.
+        Download a sitemap or a feed.
+
+        Args:
+            url (str): Url of the document
 
         Returns:
-            int: Number of seconds to wait for response
+            bytes | None: Document or None if it could not be downloaded
         """
-        return self._timeout
+        response = make_request(url, self.config)
+        return response.content if response.ok else None
 
-    def get_verify_certificate(self) -> bool:
+    def _is_stale(self, url: str, lastmod: datetime.date | None) -> bool:
         """
-        Retrieve whether to verify certificate.
+        Check whether an article saved by a previous run was modified since.
+
+        Args:
+            url (str): Site url
+            lastmod (datetime.date | None): Date the page was last modified, if known
 
         Returns:
-            bool: Whether to verify certificate or not
+            bool: Whether the article has to be fetched again
         """
-        return self._should_verify_certificate
+        manifest = self.config.get_manifest()
+        if (manifest is None or lastmod is None or url in self._refreshed or
+                not manifest.is_stale(url, lastmod)):
+            return False
+        self._refreshed.add(url)
+        return True
 
-    def get_headless_mode(self) -> bool:
+    def _discover_urls(self) -> list[str]:
         """
-        Retrieve whether to use headless mode.
+        Collect article urls listed in sitemaps and feeds.
+
+        Documents are read lazily, so no further documents are downloaded once
+        enough articles are found. In incremental mode articles saved by
+        previous runs are collected again only if modified after being fetched.
 
         Returns:
-            bool: Whether to use headless mode or not
+            list[str]: Urls that were not collected before
         """
-        return self._headless_mode
-
-
-def make_request(url: str, config: Config) -> requests.models.Response:
-    """
-    Deliver a response from a request with given configuration.
-
-    Args:
-        url (str): Site url
-        config (Config): Configuration
-
-    Returns:
-        requests.models.Response: A response from a request
-    """
-    request = requests.get(url, headers=config.get_headers(), timeout=config.get_timeout(),
-                           verify=config.get_verify_certificate())
-    request.encoding = config.get_encoding()
-    sleep(randint(1, 3))
-    return request
-
-
-class Crawler:
-    """
-    Crawler implementation.
-    """
-
-    #: Url pattern
-    url_pattern: Union[Pattern, str]
+        new_urls: list[str] = []
+        if len(self.urls) >= self.config.get_num_articles():
+            return new_urls
+        crawling = self.config.get_crawling_options()
+        since = (datetime.date.fromisoformat(crawling.lastmod_since)
+                 if crawling.lastmod_since else None)
+        for entry in discover_entries(crawling.sitemap_urls, self._fetch_document, since):
+            url = canonicalize_url(entry.url, WEBSITE)
+            if not url.startswith(ARTICLE_URL_PREFIX):
+                continue
+            if url in self._collected and not self._is_stale(url, entry.lastmod):
+                continue
+            self._collected.add(url)
+            self.urls.append(url)
+            new_urls.append(url)
+            if len(self.urls) >= self.config.get_num_articles():
+                break
+        return new_urls
 
-    def __init__(self, config: Config) -> None:
+    def _get_page_url(self, seed_url: str, page: int) -> str:
         """
-        Initialize an instance of the Crawler class.
+        Build the url of a page of a seed url.
 
         Args:
-            config (Config): Configuration
+            seed_url (str): Seed url
+            page (int): Page number, starting with 1
+
+        Returns:
+            str: Url of the page
         """
-        self.config = config
-        self.urls = []
+        if page == 1:
+            return seed_url
+        param = self._pagers.get(seed_url, ('PAGEN_1', 1))[0]
+        return f"{seed_url}{'&' if '?' in seed_url else '?'}{param}={page}"
 
-    def _extract_url(self, article_bs: BeautifulSoup) -> str:
+    def _handle_seed_page(self, seed_url: str, page: int,
+                          response: requests.models.Response) -> tuple[list[str], bool]:
         """
-        Find and retrieve url from HTML.
+        Collect article urls from a page of a seed url and check whether to read the next one.
+
+        The pager parameter and the last page are learned from pager links,
+        so pages beyond the last one are never requested. A page linking to
+        articles leads on to the next one even if all of them were collected
+        before, for instance from a sitemap.
 
         Args:
-            article_bs (bs4.BeautifulSoup): BeautifulSoup instance
+            seed_url (str): Seed url
+            page (int): Page number, starting with 1
+            response (requests.models.Response): A response from the page
 
         Returns:
-            str: Url from HTML
+            tuple[list[str], bool]: Urls that were not collected before and whether
+                the next page is worth reading
         """
-        return WEBSITE + article_bs['href']
+        found_urls = self._find_seed_urls(response)
+        new_urls = self._collect_urls(found_urls)
+        if not response.ok:
+            return new_urls, False
+        param, last_page = self._pagers.get(seed_url, ('PAGEN_1', 1))
+        for name, number in PAGER_PATTERN.findall(response.text):
+            if int(number) > last_page:
+                param, last_page = name, int(number)
+        self._pagers[seed_url] = (param, last_page)
+        return new_urls, bool(found_urls) and last_page > page
 
     def find_articles(self) -> None:
         """
-        Find articles.
+        Find articles in sitemaps and feeds, then on seed pages.
+
+        Seed urls are read page by page in rounds: first pages of all seed
+        urls, then second pages of those having more, and so on.
         """
-        for seed_url in self.get_search_urls():
-            response = make_request(seed_url, self.config)
-            if not response.ok:
-                continue
-            bs_text = BeautifulSoup(response.text, 'lxml')
-            all_a_links = bs_text.find_all('a', {'class': 'news-card photo'})
-            for a_elem in all_a_links:
+        self._discover_urls()
+        seed_urls = self.get_search_urls()
+        for page in range(1, self.config.get_crawling_options().max_seed_pages + 1):
+            next_seed_urls = []
+            for seed_url in seed_urls:
                 if len(self.urls) >= self.config.get_num_articles():
-                    break
-                url = self._extract_url(a_elem)
-                if url not in self.urls:
-                    self.urls.append(url)
+                    return
+                response = make_request(self._get_page_url(seed_url, page), self.config)
+                if self._handle_seed_page(seed_url, page, response)[1]:
+                    next_seed_urls.append(seed_url)
+            seed_urls = next_seed_urls
 
     def get_search_urls(self) -> list:
         """
@@ -282,78 +388,194 @@ class CrawlerRecursive(Crawler):
         super().__init__(config)
         self.urls: list = []
         self.visited_urls: list = []
-        self.start_url = WEBSITE
+        self.start_url = canonicalize_url(WEBSITE)
         self._cache_path = pathlib.Path(ASSETS_PATH).parent / "recursive_crawler_cache.json"
         self._templates = [
             WEBSITE + '/article',
             WEBSITE + '/videogallery',
             WEBSITE + '/photogallery'
         ]
-        if not pathlib.Path(self._cache_path).exists():
-            with open(self._cache_path, 'w', encoding='utf-8') as file:
-                json.dump({"urls_collected": [],
-                           "urls_visited": []}, file, indent=4)
-        else:
-            with open(self._cache_path, encoding='utf-8') as file:
-                cache = json.load(file)
-                self.urls = cache["urls_collected"]
-                self.visited_urls = cache["urls_visited"]
-
-    def _extract_urls(self, article_bs: BeautifulSoup) -> None:
-        slider_class = "slider__swiper-slide swiper-slide slider__swiper-slide-js swiper-slide-next"
-        slider_news = article_bs.find_all('a', {'class': slider_class})
-        if slider_news:
-            slider_news_urls = [WEBSITE + slider_a['href'] for slider_a in slider_news
-                                if WEBSITE + slider_a['href'] not in self.urls]
-            self.urls.extend(slider_news_urls)
-        sidebar_news = article_bs.find_all('a', {'class': "line-news"})
-        if sidebar_news:
-            sidebar_news_urls = [WEBSITE + sidebar_a['href'] for sidebar_a in sidebar_news
-                                 if WEBSITE + sidebar_a['href'] not in self.urls]
-            self.urls.extend(sidebar_news_urls)
-        header_news = article_bs.find_all('a', {'class': "header__top-banner-item"})
-        if header_news:
-            header_news_urls = [header_a['href'] for header_a in header_news
-                                if header_a['href'] not in self.urls]
-            self.urls.extend(header_news_urls)
-        main_page_news = article_bs.find_all('a', {'class': "news-card photo"})
-        if main_page_news:
-            main_page_urls = [WEBSITE + main_page_a['href'] for main_page_a in main_page_news
-                              if WEBSITE + main_page_a['href'] not in self.urls]
-            self.urls.extend(main_page_urls)
-        articles_texts = article_bs.find_all('div', {'class': "news-detail__detail-text"})
-        if articles_texts:
-            for article in articles_texts:
-                article_a_elements = article.find_all('a')
-                article_links = [article_a['href'] for article_a in article_a_elements
-                                 if all(article_a['href'].startswith(template)
-                                        for template in self._templates)]
-                if article_links:
-                    self.urls.extend(article_links)
+        self._journal = CrawlJournal(self._cache_path)
+        self._frontier_store = config.get_frontier_store()
+        self._worker_name = get_worker_name()
+        if self._frontier_store is None:
+            self.urls, self.visited_urls = self._journal.load()
+        self._collected.update(self.urls)
+        self._scorer = LinkScorer(config.get_crawling_options().frontier_weights or {},
+                                  self._templates)
+        self._num_found = 0
+        for url in filter(self.is_article_url, self.urls):
+            self._num_found += 1
+            self._scorer.add_collected(get_rubric(url))
+        self._contexts: dict[str, tuple[int, str | None, datetime.date | None]] = {
+            self.start_url: (0, None, None)
+        }
+        self._frontier = PriorityFrontier(self.visited_urls)
+        for url in self.urls:
+            self._contexts[url] = (1, get_rubric(url), find_date(url))
+            self._frontier.push(url, self._rescore(url))
+
+    def is_article_url(self, url: str) -> bool:
+        """
+        Check whether the url leads to an article page.
+
+        Args:
+            url (str): Canonical site url
+
+        Returns:
+            bool: Whether the url matches one of the templates of article pages
+        """
+        return url.startswith(tuple(self._templates))
+
+    def _rescore(self, url: str) -> float:
+        """
+        Score a queued url by the current numbers of collected urls of rubrics.
+
+        Args:
+            url (str): Canonical site url
+
+        Returns:
+            float: Priority of the url
+        """
+        depth, rubric, published = self._contexts[url]
+        return self._scorer.score(url, depth, rubric, published)
+
+    def _add_url(self, href: str, depth: int = 1, rubric: str | None = None,
+                  published: datetime.date | None = None) -> None:
+        """
+        Collect the url and queue it for visiting unless it is already known.
+
+        Args:
+            href (str): Site url, absolute or relative to the website
+            depth (int): Number of links between the start page and the url
+            rubric (str | None): Rubric of the page the url was found on, if known
+            published (datetime.date | None): Date of the link or of its page, if known
+        """
+        url = canonicalize_url(href, WEBSITE)
+        rubric = get_rubric(url) or rubric
+        published = find_date(url) or published
+        if url not in self._collected:
+            self._collected.add(url)
+            self.urls.append(url)
+            if self.is_article_url(url):
+                self._num_found += 1
+                self._scorer.add_collected(rubric)
+        if url not in self._frontier:
+            self._contexts[url] = (depth, rubric, published)
+            self._frontier.push(url, self._rescore(url))
+
+    def _find_links(self, fields: dict[str, list[bs4.Tag]]) -> list[bs4.Tag]:
+        """
+        Find links to news on a page.
+
+        Links inside the text of an article are kept only if they lead to
+        pages matching the templates.
+
+        Args:
+            fields (dict[str, list[bs4.Tag]]): Elements of the page matched by extraction rules
+
+        Returns:
+            list[bs4.Tag]: Links with hrefs, absolute or relative to the website
+        """
+        links = list(fields['links'])
+        for link in fields['text_links']:
+            if any(canonicalize_url(str(link['href']), WEBSITE).startswith(template)
+                   for template in self._templates):
+                links.append(link)
+        return links
+
+    def _extract_urls(self, article_bs: bs4.BeautifulSoup, page_url: str | None = None) -> None:
+        """
+        Collect urls of news linked from a page, scoring them by the page.
+
+        A link takes its date from its text or, failing that, from the date
+        of the page, and its rubric from its path or from the page.
+
+        Args:
+            article_bs (bs4.BeautifulSoup): BeautifulSoup instance
+            page_url (str | None): Url of the page
+        """
+        depth, rubric, _ = self._contexts.pop(page_url or '', (0, None, None))
+        rubric = get_rubric(page_url or '') or rubric
+        rules = self.config.get_extraction_rules().select(('date', 'links', 'text_links'))
+        fields = rules.match_soup(article_bs)
+        published = find_date(fields['date'][0].get_text()) if fields['date'] else None
+        for link in self._find_links(fields):
+            self._add_url(str(link['href']), depth + 1, rubric,
+                          find_date(link.get_text()) or published)
+
+    def _save_cache(self, collected: list[str], visited: list[str]) -> None:
+        """
+        Save newly collected and visited urls to resume crawling later.
+
+        Args:
+            collected (list[str]): Newly collected urls
+            visited (list[str]): Newly visited urls
+        """
+        self._journal.append(collected, visited)
+        if self._journal.should_compact():
+            self._journal.compact(self.urls, self.visited_urls)
 
     def find_articles(self) -> None:
         """
         Finds articles doing recursive crawling.
-        """
-        if len(self.urls) >= self.config.get_num_articles():
+
+        Pages are visited each at most once, highest scored first, until enough
+        article urls are collected or there is nothing left to visit. Links to
+        other pages are visited too, but do not count toward the number of
+        articles. Links are scored by frontier_weights: article pages, fresh
+        links, rubrics with few collected articles and pages close to the
+        start page come first. Links of equal score are visited in the order
+        they were found. Scores of rubrics drop as their articles are
+        collected, so a link is rescored when it is about to be visited.
+        """
+        if self._frontier_store is not None:
+            self._find_articles_shared(self._frontier_store)
             return
-        if len(self.visited_urls) == 0:
-            current_url = self.start_url
-        else:
-            urls_not_visited = set(self.urls) - set(self.visited_urls)
-            if len(urls_not_visited) == 0:
-                return
-            current_url = list(urls_not_visited)[0]
-        self.visited_urls.append(current_url)
-        response = make_request(current_url, self.config)
-        if not response.ok:
-            self.find_articles()
-        soup = BeautifulSoup(response.text, 'lxml')
-        self._extract_urls(soup)
-        with open(self._cache_path, 'w', encoding='utf-8') as file:
-            json.dump({"urls_collected": list(set(self.urls)),
-                       "urls_visited": self.visited_urls}, file, indent=4)
-        self.find_articles()
+        if not self.visited_urls:
+            self._frontier.push(self.start_url)
+        while self._num_found < self.config.get_num_articles() and self._frontier:
+            current_url = self._frontier.pop(self._rescore)
+            self.visited_urls.append(current_url)
+            collected_before = len(self.urls)
+            response = make_request(current_url, self.config)
+            if response.ok:
+                self._extract_urls(bs4.BeautifulSoup(response.text, 'lxml'), current_url)
+            self._save_cache(self.urls[collected_before:], [current_url])
+        self._journal.compact(self.urls, self.visited_urls)
+
+    def _find_articles_shared(self, store: SharedFrontier) -> None:
+        """
+        Find articles together with other crawler processes.
+
+        Pages are claimed from the shared frontier, so every page is visited
+        by one worker, and the article budget is shared by all workers. The
+        urls attribute holds article urls collected by this worker only, links
+        to other pages are only queued for visiting. A worker
+        whose claim finds nothing waits while others still visit pages.
+        Pages are claimed in the order they were found: links are not scored,
+        since the database of a crawl that is under way keeps no priorities.
+
+        Args:
+            store (SharedFrontier): Frontier shared by crawler processes
+        """
+        store.add([self.start_url], collect=False)
+        while store.count_collected() < self.config.get_num_articles():
+            current_url = store.claim(self._worker_name, wait=True)
+            if current_url is None:
+                break
+            self.visited_urls.append(current_url)
+            response = make_request(current_url, self.config)
+            if response.ok:
+                rules = self.config.get_extraction_rules().select(('links', 'text_links'))
+                soup = bs4.BeautifulSoup(response.text, 'lxml')
+                urls = [canonicalize_url(str(link['href']), WEBSITE)
+                        for link in self._find_links(rules.match_soup(soup))]
+                self.urls.extend(store.add(filter(self.is_article_url, urls),
+                                           self.config.get_num_articles()))
+                store.add(itertools.filterfalse(self.is_article_url, urls), collect=False)
+            if not store.complete(current_url, self._worker_name):
+                logger.warning('Lease of %s expired before it was visited', current_url)
 
 
 # 10
@@ -365,7 +587,8 @@ class HTMLParser:
     HTMLParser implementation.
     """
 
-    def __init__(self, full_url: str, article_id: int, config: Config) -> None:
+    def __init__(self, full_url: str, article_id: int, config: Config,
+                 resolve_date: bool = True) -> None:
         """
         Initialize an instance of the HTMLParser class.
 
@@ -373,61 +596,99 @@ class HTMLParser:
             full_url (str): Site url
             article_id (int): Article id
             config (Config): Configuration
+            resolve_date (bool): Resolve the date of the article or leave it to be resolved
+                with a column of dates
         """
         self.config = config
         self.article = Article(full_url, article_id)
+        self.date_text = ''
+        self._resolve_date = resolve_date
+        self._soup_fields: tuple[bs4.BeautifulSoup, dict[str, list[bs4.Tag]]] | None = None
+
+    def _match(self, article_soup: bs4.BeautifulSoup) -> dict[str, list[bs4.Tag]]:
+        """
+        Find elements of all fields of a page, walking the page only once.
+
+        Args:
+            article_soup (bs4.BeautifulSoup): BeautifulSoup instance
+
+        Returns:
+            dict[str, list[bs4.Tag]]: Elements matched by extraction rules
+        """
+        if self._soup_fields is None or self._soup_fields[0] is not article_soup:
+            rules = self.config.get_extraction_rules().select(ARTICLE_FIELDS)
+            self._soup_fields = (article_soup, rules.match_soup(article_soup))
+        return self._soup_fields[1]
 
-    def _fill_article_with_text(self, article_soup: BeautifulSoup) -> None:
+    def _fill_article_with_text(self, article_soup: bs4.BeautifulSoup) -> None:
         """
         Find text of article.
 
         Args:
             article_soup (bs4.BeautifulSoup): BeautifulSoup instance
         """
-        text = article_soup.find_all('div', {'class': 'news-detail__detail-text'})[0].text
+        text = self._match(article_soup)['text'][0].text
         self.article.text = text
 
-    def _fill_article_with_meta_information(self, article_soup: BeautifulSoup) -> None:
+    def _fill_article_with_meta_information(self, article_soup: bs4.BeautifulSoup) -> None:
         """
         Find meta information of article.
 
         Args:
             article_soup (bs4.BeautifulSoup): BeautifulSoup instance
         """
-        title = article_soup.find_all('h1', {'class': 'title'})[-1].text
+        fields = self._match(article_soup)
+        title = fields['title'][-1].text
         self.article.title = title
-        author = article_soup.find('div', {'class': 'author-news__info-authors'})
-        if author:
-            self.article.author = [author.text.replace('\n', '').strip()]
+        if fields['author']:
+            self.article.author = [fields['author'][0].text.replace('\n', '').strip()]
         else:
             self.article.author = ['NOT FOUND']
-        date = article_soup.find('span', {'class': 'author-news__info-text'}).text
-        self.article.date = self.unify_date_format(date)
-        topics = article_soup.find_all('a', {'class': 'tags photo-report-detail-share-tags__item'})
+        self._fill_date(fields['date'][0].text)
+        topics = fields['topics']
         self.article.topics = [tag.text.strip('\n').strip() for tag in topics]
 
+    def _fill_article_with_extracted(self, fields: ExtractedArticle) -> None:
+        """
+        Fill the article with fields found by the lxml fast path.
+
+        Args:
+            fields (ExtractedArticle): Raw fields of the article page
+        """
+        self.article.text = fields.text
+        self.article.title = fields.title
+        if fields.author:
+            self.article.author = [fields.author.replace('\n', '').strip()]
+        else:
+            self.article.author = ['NOT FOUND']
+        self._fill_date(fields.date)
+        self.article.topics = [topic.strip('\n').strip() for topic in fields.topics]
+
+    def _fill_date(self, date_str: str) -> None:
+        """
+        Keep the date of the article as the page writes it and resolve it if asked to.
+
+        Args:
+            date_str (str): Date in text format
+        """
+        self.date_text = date_str
+        if self._resolve_date:
+            self.article.date = self.unify_date_format(date_str)
+
     def unify_date_format(self, date_str: str) -> datetime.datetime:
         """
         Unify date format.
 
+        Dates without a year belong to the current one, relative dates such
+        as ``вчера в 09:15`` or ``5 минут назад`` are counted from now.
+
         Args:
             date_str (str): Date in text format
 
         Returns:
             datetime.datetime: Datetime object
         """
-        datetime_items = date_str.split()
-        if len(datetime_items) == 4:
-            day, month, year_, time = datetime_items
-            year = int(year_)
-        else:
-            day, month, time = datetime_items
-            year = int(datetime.datetime.today().strftime('%Y'))
-        hour, minute = time.split(':')
-        months_list = ['января', 'февраля', 'марта', 'апреля', 'мая', 'июня',
-                       'июля', 'августа', 'сентября', 'октября', 'ноября', 'декабря']
-        month_index = months_list.index(month) + 1
-        return datetime.datetime(year, month_index, int(day), int(hour), int(minute))
+        return parse_date(date_str)
 
     def parse(self) -> Union[Article, bool, list]:
         """
@@ -438,61 +699,283 @@ class HTMLParser:
         """
         if self.article.url is None:
             return False
-        response = make_request(self.article.url, self.config)
-        if response.ok:
-            soup = BeautifulSoup(response.text, 'lxml')
-            self._fill_article_with_text(soup)
-            self._fill_article_with_meta_information(soup)
+        return self.parse_response(make_request(self.article.url, self.config, True))
+
+    def parse_response(self, response: requests.models.Response) -> Union[Article, bool]:
+        """
+        Fill the article with contents of an already received response.
+
+        Args:
+            response (requests.models.Response): A response from the article url
+
+        Returns:
+            Union[Article, bool]: Article instance, False if the page could not be fetched
+        """
+        if not response.ok:
+            return False
+        with self.config.get_metrics().measure('parse'):
+            return self.parse_html(response.text)
+
+    def parse_html(self, html: str) -> Article:
+        """
+        Fill the article with contents of an article page.
+
+        Args:
+            html (str): HTML of the article page
+
+        Returns:
+            Article: Article instance
+        """
+        if self.config.get_processing_options().use_fast_extraction:
+            extractor = ArticleExtractor(self.config.get_extraction_rules())
+            self._fill_article_with_extracted(extractor.extract(html))
+            return self.article
+        soup = bs4.BeautifulSoup(html, 'lxml')
+        self._fill_article_with_text(soup)
+        self._fill_article_with_meta_information(soup)
+        self._soup_fields = None
         return self.article
 
 
-def prepare_environment(base_path: Union[pathlib.Path, str]) -> None:
+def save_article(article: Union[Article, bool, list]) -> None:
+    """
+    Save raw text and meta information of a parsed article.
+
+    Args:
+        article (Union[Article, bool, list]): Parsed article
+    """
+    if isinstance(article, Article):
+        to_raw(article)
+        to_meta(article)
+
+
+def write_article(article: Article, config: Config) -> None:
+    """
+    Save an article and record it in the manifest, if any.
+
+    With a shared frontier, the article takes the next id of the frontier
+    in the transaction writing it.
+
+    Args:
+        article (Article): Parsed article
+        config (Config): Configuration
+    """
+    store = config.get_frontier_store()
+    if store is not None:
+        def save_with_id(article_id: int) -> None:
+            article.article_id = article_id
+            save_article(article)
+
+        store.write_next(save_with_id)
+        return
+    save_article(article)
+    manifest = config.get_manifest()
+    if manifest is not None:
+        manifest.record(article.url or '', article.article_id, article.text)
+
+
+def is_new_article(article: Union[Article, bool, list], config: Config,
+                   signature: tuple[int, ...] | None = None) -> bool:
+    """
+    Check that an article was parsed and is not a near-duplicate of a saved one.
+
+    Args:
+        article (Union[Article, bool, list]): Parsed article
+        config (Config): Configuration
+        signature (tuple[int, ...] | None): MinHash signature of the text if it is
+            already computed
+
+    Returns:
+        bool: Whether the article should be saved
+    """
+    if not isinstance(article, Article):
+        return False
+    index = config.get_duplicate_index()
+    if index is None:
+        return True
+    if signature is not None:
+        duplicate_of = index.add_signature(article.url or '', signature)
+    else:
+        duplicate_of = index.add(article.url or '', article.text or '')
+    if duplicate_of is None:
+        return True
+    config.get_metrics().add_duplicate()
+    return False
+
+
+def accept_article(article: Union[Article, bool, list], config: Config, saved: int,
+                   signature: tuple[int, ...] | None = None) -> TypeGuard[Article]:
+    """
+    Decide whether to save a parsed article and give it its id.
+
+    Without a manifest, a new article takes the id following the articles
+    saved by this run. If other crawler processes save articles too, the
+    shared frontier gives the article its id once write_article writes it.
+    In incremental mode an article saved by a previous run keeps its id and
+    is not written again if its text is unchanged, and a new article takes
+    the id following all saved articles.
+
+    Args:
+        article (Union[Article, bool, list]): Parsed article
+        config (Config): Configuration
+        saved (int): Number of articles saved by this run
+        signature (tuple[int, ...] | None): MinHash signature of the text if it is
+            already computed
+
+    Returns:
+        TypeGuard[Article]: Whether the article should be written
+    """
+    if not isinstance(article, Article):
+        return False
+    manifest = config.get_manifest()
+    known_id = manifest.get_id(article.url or '') if manifest else None
+    if manifest is not None and known_id is not None:
+        if manifest.is_unchanged(article.url or '', article.text):
+            manifest.record(article.url or '', known_id, article.text)
+            return False
+        article.article_id = known_id
+        return True
+    if manifest is not None and manifest.has_text(article.text):
+        config.get_metrics().add_duplicate()
+        return False
+    if not is_new_article(article, config, signature):
+        return False
+    if manifest is not None:
+        article.article_id = manifest.get_next_id()
+    elif config.get_frontier_store() is None:
+        article.article_id = saved + 1
+    return True
+
+
+def prepare_environment(base_path: Union[pathlib.Path, str], sharded: bool = False) -> None:
     """
     Create ASSETS_PATH folder if no created and remove existing folder.
 
     Args:
         base_path (Union[pathlib.Path, str]): Path where articles stores
+        sharded (bool): Whether to store articles in shard folders
     """
     path = pathlib.Path(base_path)
     if path.is_dir():
         shutil.rmtree(base_path)
     path.mkdir(parents=True)
+    if sharded:
+        (path / SHARDED_LAYOUT_MARKER).touch()
+
+
+def prepare_incremental_environment(base_path: Union[pathlib.Path, str],
+                                    manifest: CrawlManifest, sharded: bool = False) -> None:
+    """
+    Keep articles listed in the manifest and remove files written after it.
+
+    Files of an article interrupted before it was recorded are removed, so
+    ids stay contiguous. If the folder lost articles of the manifest or
+    changed its layout, the manifest is dropped and the folder is recreated.
+
+    Args:
+        base_path (Union[pathlib.Path, str]): Path where articles stores
+        manifest (CrawlManifest): Manifest of saved articles
+        sharded (bool): Whether to store articles in shard folders
+    """
+    path = pathlib.Path(base_path)
+    known = len(manifest)
+    if not known or not path.is_dir() or is_sharded(path) != sharded:
+        manifest.clear()
+        prepare_environment(base_path, sharded)
+        return
+    ids = {entry.path: get_article_id_from_filepath(pathlib.Path(entry.path))
+           for entry in iter_article_files(path) if entry.name.split('_', 1)[0].isdigit()}
+    raw_ids = {article_id for file_path, article_id in ids.items()
+               if file_path.endswith('_raw.txt')}
+    if not raw_ids.issuperset(range(1, known + 1)):
+        manifest.clear()
+        prepare_environment(base_path, sharded)
+        return
+    for file_path, article_id in ids.items():
+        if article_id > known:
+            os.remove(file_path)
+    manifest.compact()
+
+
+def prepare_assets(config: Config) -> None:
+    """
+    Prepare ASSETS_PATH for a run with the given configuration.
+
+    Args:
+        config (Config): Configuration
+    """
+    manifest = config.get_manifest()
+    store = config.get_frontier_store()
+    sharded = config.get_storage_options().large_corpus_mode
+    if manifest is not None:
+        prepare_incremental_environment(ASSETS_PATH, manifest, sharded)
+    elif store is not None:
+        store.initialize(lambda: prepare_environment(ASSETS_PATH, sharded))
+    else:
+        prepare_environment(ASSETS_PATH, sharded)
 
 
 def main() -> None:
     """
     Entrypoint for scrapper module.
     """
-    prepare_environment(ASSETS_PATH)
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
     config = Config(CRAWLER_CONFIG_PATH)
-    crawler = Crawler(config)
-    crawler.find_articles()
-    for idx, url in enumerate(crawler.urls, 1):
-        parser = HTMLParser(url, idx, config)
-        article = parser.parse()
-        if isinstance(article, Article):
-            to_raw(article)
-            to_meta(article)
+    prepare_assets(config)
+    asyncio.run(async_scraper.scrape_async(config))
+    config.get_session_pool().close()
+    config.get_metrics().save_report(METRICS_PATH)
+    logger.info(config.get_metrics().get_summary_line())
+
+
+def main_replay() -> None:
+    """
+    Re-parse every article page stored in the archive without network.
+
+    Records are parsed with the configured extraction rules, so pages that
+    lack blocks of an article, such as seed pages, are skipped one by one.
+    """
+    config = Config(CRAWLER_CONFIG_PATH)
+    prepare_assets(config)
+    records = iter(ResponseArchive(ARCHIVE_PATH))
+    article_id = 0
+    while batch := list(itertools.islice(records, REPLAY_BATCH_SIZE)):
+        parsers = []
+        for response in batch:
+            response.encoding = config.get_encoding()
+            parser = HTMLParser(response.url, article_id + 1, config, resolve_date=False)
+            try:
+                if not parser.parse_response(response):
+                    continue
+                # A malformed date fails its own record rather than the column of dates
+                compile_date(parser.date_text)
+            except UNPARSEABLE_PAGE_ERRORS as error:
+                logger.warning('Skipping %s that cannot be parsed: %r', response.url, error)
+                continue
+            parsers.append(parser)
+        dates = parse_dates(parser.date_text for parser in parsers)
+        for parser, date in zip(parsers, dates):
+            parser.article.date = date
+            parser.article.article_id = article_id + 1
+            if accept_article(parser.article, config, article_id):
+                article_id += 1
+                write_article(parser.article, config)
 
 
 def main_recursive_crawler() -> None:
     """
     Recursive crawler showcase.
     """
-    prepare_environment(ASSETS_PATH)
     config = Config(CRAWLER_CONFIG_PATH)
+    prepare_assets(config)
     recursive_crawler = CrawlerRecursive(config)
     recursive_crawler.find_articles()
-    path_to_cache = pathlib.Path(__file__).parent.parent / "tmp" / "recursive_crawler_cache.json"
-    with open(path_to_cache, 'r', encoding='utf-8') as file:
-        cache = json.load(file)
-    urls = cache["urls_collected"]
-    for idx, url in enumerate(urls, 1):
-        parser = HTMLParser(url, idx, config)
-        article = parser.parse()
-        if isinstance(article, Article):
-            to_raw(article)
-            to_meta(article)
+    saved = 0
+    for url in filter(recursive_crawler.is_article_url, recursive_crawler.urls):
+        article = HTMLParser(url, saved + 1, config).parse()
+        if accept_article(article, config, saved):
+            saved += 1
+            write_article(article, config)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,331 @@
+"""
+Crawl frontier shared by crawler processes through an SQLite database.
+"""
+
+import os
+import pathlib
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Callable, Iterable, Iterator, Union
+
+#: Number of seconds a claimed url stays with its worker before others may reclaim it
+LEASE_SECONDS = 300.0
+
+#: Number of seconds a connection waits for a lock held by another process
+BUSY_TIMEOUT = 30.0
+
+#: Number of seconds between claims of a worker waiting for others to find urls
+CLAIM_INTERVAL = 0.5
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS urls (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    url TEXT NOT NULL UNIQUE,
+    collected INTEGER NOT NULL,
+    state TEXT NOT NULL DEFAULT 'queued',
+    owner TEXT,
+    lease_expires REAL
+);
+CREATE INDEX IF NOT EXISTS urls_by_state ON urls (state, seq);
+CREATE TABLE IF NOT EXISTS counters (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+
+def get_worker_name() -> str:
+    """
+    Build a name telling apart workers sharing a frontier.
+
+    Returns:
+        str: Host name, process id and a random suffix
+    """
+    return f'{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}'
+
+
+class SharedFrontier:
+    """
+    Queue of urls to visit that several crawler processes pull from at once.
+
+    Every url ever found is stored once in the order it was found and goes
+    from ``queued`` to ``leased`` when a worker claims it and to ``visited``
+    when the worker is done with it. A lease expires after ``lease_seconds``,
+    so a url claimed by a worker that crashed or hung is claimed again by
+    another one. Claiming and adding run in immediate transactions of a
+    database in WAL mode: readers never block, writers wait for each other,
+    and a process killed mid-transaction leaves no trace. Collected urls are
+    counted in the same transaction they are added, so the article budget
+    holds across all workers.
+
+    WAL mode keeps its index in memory shared by the processes opening the
+    database, so all workers must run on one host. Processes on other hosts
+    opening the database over a network filesystem would corrupt it.
+    """
+
+    def __init__(self, path: Union[pathlib.Path, str],
+                 lease_seconds: float = LEASE_SECONDS) -> None:
+        """
+        Initialize an instance of the SharedFrontier class.
+
+        Args:
+            path (Union[pathlib.Path, str]): Path to database
+            lease_seconds (float): Number of seconds a claimed url stays with its worker
+        """
+        self.path = pathlib.Path(path)
+        self.lease_seconds = lease_seconds
+        self._lock = threading.Lock()
+        self._connection: sqlite3.Connection | None = None
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Open the database on first use.
+
+        Returns:
+            sqlite3.Connection: Connection in autocommit mode
+        """
+        if self._connection is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT, isolation_level=None,
+                                         check_same_thread=False)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            connection.executescript(SCHEMA)
+            self._connection = connection
+        return self._connection
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """
+        Run the enclosed block in a transaction holding the write lock from its start.
+
+        Yields:
+            sqlite3.Connection: Connection inside the transaction
+        """
+        with self._lock:
+            connection = self._connect()
+            connection.execute('BEGIN IMMEDIATE')
+            try:
+                yield connection
+            except BaseException:
+                connection.execute('ROLLBACK')
+                raise
+            connection.execute('COMMIT')
+
+    def _get_counter(self, connection: sqlite3.Connection, name: str) -> int:
+        """
+        Read a counter.
+
+        Args:
+            connection (sqlite3.Connection): Connection
+            name (str): Name of the counter
+
+        Returns:
+            int: Value of the counter, 0 if it was never set
+        """
+        row = connection.execute('SELECT value FROM counters WHERE name = ?', (name,)).fetchone()
+        return int(row[0]) if row else 0
+
+    def _set_counter(self, connection: sqlite3.Connection, name: str, value: int) -> None:
+        """
+        Write a counter.
+
+        Args:
+            connection (sqlite3.Connection): Connection
+            name (str): Name of the counter
+            value (int): New value
+        """
+        connection.execute('INSERT OR REPLACE INTO counters (name, value) VALUES (?, ?)',
+                           (name, value))
+
+    def initialize(self, setup: Callable[[], None]) -> bool:
+        """
+        Run the setup of a crawl once, by the first worker to start it.
+
+        Other workers wait until the setup is done and skip it.
+
+        Args:
+            setup (Callable[[], None]): Preparation of the crawl, e.g. of the assets folder
+
+        Returns:
+            bool: Whether this worker ran the setup
+        """
+        with self._transaction() as connection:
+            if self._get_counter(connection, 'initialized'):
+                return False
+            setup()
+            self._set_counter(connection, 'initialized', 1)
+        return True
+
+    def add(self, urls: Iterable[str], limit: int | None = None,
+            collect: bool = True) -> list[str]:
+        """
+        Queue urls that were never found before.
+
+        Args:
+            urls (Iterable[str]): Site urls
+            limit (int | None): Number of collected urls not to exceed
+            collect (bool): Whether the urls count as collected or are only to be visited
+
+        Returns:
+            list[str]: Urls that were queued, in the given order
+        """
+        added = []
+        with self._transaction() as connection:
+            collected = self._get_counter(connection, 'collected')
+            for url in urls:
+                if collect and limit is not None and collected >= limit:
+                    break
+                cursor = connection.execute(
+                    'INSERT OR IGNORE INTO urls (url, collected) VALUES (?, ?)',
+                    (url, int(collect)))
+                if cursor.rowcount:
+                    added.append(url)
+                    collected += int(collect)
+            self._set_counter(connection, 'collected', collected)
+        return added
+
+    def _claim_now(self, owner: str) -> str | None:
+        """
+        Lease the earliest found url whose lease has expired or, if none, that is queued.
+
+        Args:
+            owner (str): Name of the claiming worker
+
+        Returns:
+            str | None: Site url or None if there is nothing to claim now
+        """
+        now = time.time()
+        with self._transaction() as connection:
+            row = connection.execute(
+                "SELECT seq, url FROM urls WHERE state = 'leased' AND lease_expires < ? "
+                "ORDER BY seq LIMIT 1", (now,)).fetchone()
+            if row is None:
+                row = connection.execute(
+                    "SELECT seq, url FROM urls WHERE state = 'queued' ORDER BY seq LIMIT 1"
+                ).fetchone()
+            if row is None:
+                return None
+            connection.execute(
+                "UPDATE urls SET state = 'leased', owner = ?, lease_expires = ? WHERE seq = ?",
+                (owner, now + self.lease_seconds, row[0]))
+        return str(row[1])
+
+    def claim(self, owner: str, wait: bool = False) -> str | None:
+        """
+        Lease the next url to visit.
+
+        Args:
+            owner (str): Name of the claiming worker
+            wait (bool): Whether to wait while other workers visit urls and may find new ones
+
+        Returns:
+            str | None: Site url or None if there is nothing to claim
+        """
+        url = self._claim_now(owner)
+        while url is None and wait and self.has_active_leases():
+            time.sleep(CLAIM_INTERVAL)
+            url = self._claim_now(owner)
+        return url
+
+    def complete(self, url: str, owner: str) -> bool:
+        """
+        Mark a url leased to the worker as visited.
+
+        A worker whose lease expired and whose url was claimed again by
+        another one leaves the url to its new owner.
+
+        Args:
+            url (str): Site url
+            owner (str): Name of the worker that claimed the url
+
+        Returns:
+            bool: Whether the url was still leased to the worker
+        """
+        with self._transaction() as connection:
+            cursor = connection.execute(
+                "UPDATE urls SET state = 'visited', owner = NULL, lease_expires = NULL "
+                "WHERE url = ? AND state = 'leased' AND owner = ?", (url, owner))
+        return bool(cursor.rowcount)
+
+    def write_next(self, write: Callable[[int], None]) -> int:
+        """
+        Write an article under the next article id, unique across all workers.
+
+        The id is taken and the article is written in one transaction, so
+        the id is spent only once the article is written: if the writing
+        fails or the worker dies, the id goes to the next article and ids
+        stay contiguous. Files a dead worker left under the id are
+        overwritten by that article.
+
+        Args:
+            write (Callable[[int], None]): Writing of the article under the given id
+
+        Returns:
+            int: Article id, starting with 1
+        """
+        with self._transaction() as connection:
+            article_id = self._get_counter(connection, 'article_id') + 1
+            write(article_id)
+            self._set_counter(connection, 'article_id', article_id)
+        return article_id
+
+    def has_active_leases(self) -> bool:
+        """
+        Check whether some worker is visiting a url and may find new ones.
+
+        Returns:
+            bool: Whether unexpired leases exist
+        """
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT 1 FROM urls WHERE state = 'leased' AND lease_expires >= ? LIMIT 1",
+                (time.time(),)).fetchone()
+        return row is not None
+
+    def count_collected(self) -> int:
+        """
+        Get number of collected urls.
+
+        Returns:
+            int: Number of collected urls
+        """
+        with self._lock:
+            return self._get_counter(self._connect(), 'collected')
+
+    def get_collected(self) -> list[str]:
+        """
+        Get collected urls.
+
+        Returns:
+            list[str]: Urls in the order they were found
+        """
+        with self._lock:
+            rows = self._connect().execute(
+                'SELECT url FROM urls WHERE collected ORDER BY seq').fetchall()
+        return [row[0] for row in rows]
+
+    def get_visited(self) -> list[str]:
+        """
+        Get visited urls.
+
+        Returns:
+            list[str]: Urls in the order they were found
+        """
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT url FROM urls WHERE state = 'visited' ORDER BY seq").fetchall()
+        return [row[0] for row in rows]
+
+    def close(self) -> None:
+        """
+        Close the database.
+        """
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
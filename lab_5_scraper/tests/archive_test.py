@@ -0,0 +1,196 @@
+"""
+Record/replay archive validation.
+"""
+
+import datetime
+import json
+import shutil
+import unittest
+from unittest import mock
+
+import pytest
+
+from admin_utils.test_params import SCRAPER_TEST_FILES_FOLDER, TEST_PATH
+from core_utils.constants import CRAWLER_CONFIG_PATH
+from lab_5_scraper import scraper
+from lab_5_scraper.archive import ResponseArchive
+from lab_5_scraper.dates import parse_dates
+from lab_5_scraper.scraper import Config, HTMLParser, main_replay
+from lab_5_scraper.tests.utils import build_response, ScraperTestCase
+
+ARTICLE_URL = 'https://ugra-news.ru/article/v_surgute_otkryli_biblioteku/'
+
+
+class ResponseArchiveTest(unittest.TestCase):
+    """
+    Class for testing ResponseArchive functionality.
+    """
+
+    def setUp(self) -> None:
+        """
+        Define start instructions for ResponseArchiveTest class.
+        """
+        TEST_PATH.mkdir(parents=True, exist_ok=True)
+        self.path = TEST_PATH / 'crawl_archive.warc'
+        self.html = (SCRAPER_TEST_FILES_FOLDER / 'article.html').read_text(encoding='utf-8')
+
+    def tearDown(self) -> None:
+        """
+        Define final instructions for ResponseArchiveTest class.
+        """
+        shutil.rmtree(TEST_PATH, ignore_errors=True)
+
+    @pytest.mark.lab_5_scraper
+    def test_archive_replays_latest_record(self) -> None:
+        """
+        Ensure a reopened archive returns the latest body recorded for each url.
+        """
+        archive = ResponseArchive(self.path)
+        archive.record(ARTICLE_URL, build_response(ARTICLE_URL, 'old'))
+        archive.record('https://ugra-news.ru/', build_response('https://ugra-news.ru/', 'main'))
+        archive.record(ARTICLE_URL, build_response(ARTICLE_URL, self.html))
+
+        reopened = ResponseArchive(self.path)
+        self.assertEqual(2, len(reopened))
+        replayed = reopened.replay(ARTICLE_URL)
+        self.assertIsNotNone(replayed)
+        self.assertEqual(self.html.encode('utf-8'), replayed.content)
+        self.assertIsNone(reopened.replay('https://ugra-news.ru/missing/'))
+        self.assertEqual(['https://ugra-news.ru/', ARTICLE_URL],
+                         [response.url for response in reopened])
+
+    @pytest.mark.lab_5_scraper
+    def test_archive_rebuilds_missing_index(self) -> None:
+        """
+        Ensure the offset index is recovered by scanning the archive.
+        """
+        archive = ResponseArchive(self.path)
+        for idx in range(3):
+            url = f'https://ugra-news.ru/article/{idx}/'
+            archive.record(url, build_response(url, f'body {idx}\nwith newline'))
+        archive.index_path.unlink()
+
+        reopened = ResponseArchive(self.path)
+        self.assertTrue(reopened.index_path.exists())
+        self.assertEqual(b'body 1\nwith newline',
+                         reopened.replay('https://ugra-news.ru/article/1/').content)
+
+    @pytest.mark.lab_5_scraper
+    def test_archive_rebuilds_stale_index(self) -> None:
+        """
+        Ensure an index missing the last record or ending in a torn record is rebuilt.
+        """
+        archive = ResponseArchive(self.path)
+        for idx in range(2):
+            url = f'https://ugra-news.ru/article/{idx}/'
+            archive.record(url, build_response(url, f'body {idx}'))
+        stale_index = archive.index_path.read_bytes()
+        archive.record('https://ugra-news.ru/article/2/',
+                       build_response('https://ugra-news.ru/article/2/', 'body 2'))
+        archive.index_path.write_bytes(stale_index)
+        self.assertEqual(3, len(ResponseArchive(self.path)))
+
+        with open(self.path, 'ab') as file:
+            file.write(b'{"url": "https://ugra-news.ru/article/3/", "status_code": 200, '
+                       b'"headers": {}, "length": 100}\nbody')
+        reopened = ResponseArchive(self.path)
+        self.assertEqual(3, len(reopened))
+        reopened.record('https://ugra-news.ru/article/4/',
+                        build_response('https://ugra-news.ru/article/4/', 'body 4'))
+        replayed = ResponseArchive(self.path).replay('https://ugra-news.ru/article/4/')
+        self.assertIsNotNone(replayed)
+        self.assertEqual(b'body 4', replayed.content)
+
+    @pytest.mark.lab_5_scraper
+    def test_replayed_page_parses_like_fetched_page(self) -> None:
+        """
+        Ensure HTMLParser fills the same article from an archived page.
+        """
+        config = Config(CRAWLER_CONFIG_PATH)
+        archive = ResponseArchive(self.path)
+        archive.record(ARTICLE_URL, build_response(ARTICLE_URL, self.html))
+        replayed = ResponseArchive(self.path).replay(ARTICLE_URL)
+        replayed.encoding = 'utf-8'
+
+        article = HTMLParser(ARTICLE_URL, 1, config).parse_response(replayed)
+        self.assertEqual('В Сургуте открыли новую библиотеку', article.title)
+        self.assertEqual(['Анна Иванова'], article.author)
+        self.assertEqual(datetime.datetime(2025, 4, 12, 14, 30), article.date)
+        self.assertEqual(['Культура', 'Сургут'], article.topics)
+        self.assertIn('центральная городская библиотека', article.text)
+
+
+class ReplayTest(ScraperTestCase):
+    """
+    Class for testing re-parsing of archived pages.
+    """
+
+    def setUp(self) -> None:
+        """
+        Define start instructions for ReplayTest class.
+        """
+        super().setUp()
+        self.html = (SCRAPER_TEST_FILES_FOLDER / 'article.html').read_text(encoding='utf-8')
+        self.archive = ResponseArchive(TEST_PATH / 'crawl_archive.warc')
+        patch = mock.patch.object(scraper, 'ARCHIVE_PATH', self.archive.path)
+        patch.start()
+        self.addCleanup(patch.stop)
+
+    def _replay(self) -> mock.Mock:
+        """
+        Re-parse the archive.
+
+        Returns:
+            mock.Mock: Spy of the batch date parser
+        """
+        with mock.patch.object(scraper, 'parse_dates', wraps=parse_dates) as spy:
+            main_replay()
+        return spy
+
+    def _get_meta(self, article_id: int) -> dict:
+        """
+        Read meta information of a saved article.
+
+        Args:
+            article_id (int): Article id
+
+        Returns:
+            dict: Meta information
+        """
+        with open(TEST_PATH / f'{article_id}_meta.json', encoding='utf-8') as file:
+            meta: dict = json.load(file)
+        return meta
+
+    @pytest.mark.lab_5_scraper
+    def test_dates_of_archived_pages_are_resolved_as_a_column(self) -> None:
+        """
+        Ensure articles are saved in order with dates resolved by one batch call.
+        """
+        self.archive.record('https://ugra-news.ru/', build_response('https://ugra-news.ru/',
+                                                                    'main'))
+        self.archive.record(ARTICLE_URL, build_response(ARTICLE_URL, self.html))
+        spy = self._replay()
+        spy.assert_called_once()
+        self.assertEqual('2025-04-12 14:30:00', self._get_meta(1)['date'])
+        self.assertEqual(ARTICLE_URL, self._get_meta(1)['url'])
+        self.assertFalse((TEST_PATH / '2_meta.json').exists())
+
+    @pytest.mark.lab_5_scraper
+    def test_archived_pages_are_checked_by_configured_rules(self) -> None:
+        """
+        Ensure pages are recognized by the configured rules and a broken page is skipped alone.
+        """
+        with open(CRAWLER_CONFIG_PATH, encoding='utf-8') as file:
+            config = json.load(file)
+        config['extraction_rules'] = {'text': {'tag': 'div', 'class': 'article-body'}}
+        config_path = TEST_PATH / 'scraper_config.json'
+        config_path.write_text(json.dumps(config), encoding='utf-8')
+        redesigned = self.html.replace('news-detail__detail-text', 'article-body')
+        broken_date = redesigned.replace('12 апреля 2025 14:30', '31 апреля 2025 14:30')
+        self.archive.record(ARTICLE_URL + 'broken/', build_response(ARTICLE_URL + 'broken/',
+                                                                   broken_date))
+        self.archive.record(ARTICLE_URL, build_response(ARTICLE_URL, redesigned))
+        with mock.patch.object(scraper, 'CRAWLER_CONFIG_PATH', config_path):
+            self._replay()
+        self.assertEqual(ARTICLE_URL, self._get_meta(1)['url'])
+        self.assertFalse((TEST_PATH / '2_meta.json').exists())
@@ -0,0 +1,298 @@
+"""
+Asynchronous crawling validation.
+"""
+
+# pylint: disable=protected-access
+import asyncio
+import json
+import unittest
+from unittest import mock
+
+import pytest
+import requests
+
+from admin_utils.test_params import SCRAPER_TEST_FILES_FOLDER, TEST_PATH
+from core_utils.constants import CRAWLER_CONFIG_PATH
+from lab_5_scraper import async_scraper, scraper
+from lab_5_scraper.async_scraper import AsyncCrawler, scrape_async
+from lab_5_scraper.scraper import Config, Crawler, HostLimiter
+from lab_5_scraper.tests.utils import build_response, ScraperTestCase
+
+ARTICLE_HTML = (SCRAPER_TEST_FILES_FOLDER / 'article.html').read_text(encoding='utf-8')
+
+
+def seed_page(url: str, *args: object) -> requests.models.Response:
+    """
+    Build a seed page with three article cards specific to the url.
+
+    Args:
+        url (str): Site url
+        *args (object): Ignored request arguments
+
+    Returns:
+        requests.models.Response: A response
+    """
+    rubric = url.rstrip('/').rsplit('/', 1)[-1]
+    cards = ''.join(f'<a class="news-card photo" href="/article/{rubric}-{idx}/">card</a>'
+                    for idx in range(3))
+    return build_response(url, f'<html><body>{cards}</body></html>')
+
+
+def paged_seed_page(url: str, *args: object) -> requests.models.Response:
+    """
+    Build a page of a rubric having three pages with three article cards each.
+
+    Args:
+        url (str): Site url
+        *args (object): Ignored request arguments
+
+    Returns:
+        requests.models.Response: A response
+    """
+    path, _, query = url.partition('?')
+    rubric = path.rstrip('/').rsplit('/', 1)[-1]
+    page = int(query.split('=')[1]) if query else 1
+    cards = ''.join(f'<a class="news-card photo" href="/article/{rubric}-p{page}-{idx}/">card</a>'
+                    for idx in range(3))
+    pager = ''.join(f'<a href="/rubrics/{rubric}/?PAGEN_1={number}">{number}</a>'
+                    for number in range(page + 1, min(page + 2, 3) + 1))
+    return build_response(url, f'<html><body>{cards}<div>{pager}</div></body></html>')
+
+
+def site_page(url: str, *args: object) -> requests.models.Response:
+    """
+    Build a seed page or an article page depending on the url.
+
+    Args:
+        url (str): Site url
+        *args (object): Ignored request arguments
+
+    Returns:
+        requests.models.Response: A response
+    """
+    if '/rubrics/' in url:
+        return seed_page(url)
+    return build_response(url, ARTICLE_HTML)
+
+
+class AsyncCrawlerTest(unittest.TestCase):
+    """
+    Class for testing AsyncCrawler functionality.
+    """
+
+    def setUp(self) -> None:
+        """
+        Define start instructions for AsyncCrawlerTest class.
+        """
+        self.config = Config(CRAWLER_CONFIG_PATH)
+        self.config._num_articles = 10
+
+    @pytest.mark.lab_5_scraper
+    def test_async_crawler_collects_same_urls_as_crawler(self) -> None:
+        """
+        Ensure AsyncCrawler finds the same urls in the same order as Crawler.
+        """
+        with mock.patch.object(scraper, 'make_request', side_effect=seed_page):
+            crawler = Crawler(self.config)
+            crawler.find_articles()
+            async_crawler = AsyncCrawler(self.config)
+            async_crawler.find_articles()
+        self.assertEqual(10, len(async_crawler.urls))
+        self.assertEqual(crawler.urls, async_crawler.urls)
+
+    @pytest.mark.lab_5_scraper
+    def test_crawlers_read_seed_pages_in_rounds(self) -> None:
+        """
+        Ensure both crawlers follow pagers page by page and stop at the budget.
+        """
+        self.config._seed_urls = self.config.get_seed_urls()[:2]
+        self.config._crawling.sitemap_urls = []
+        self.config._num_articles = 14
+        with mock.patch.object(scraper, 'make_request',
+                               side_effect=paged_seed_page) as make_request:
+            crawler = Crawler(self.config)
+            crawler.find_articles()
+            requested = [call.args[0] for call in make_request.call_args_list]
+            async_crawler = AsyncCrawler(self.config)
+            async_crawler.find_articles()
+        self.assertEqual(14, len(crawler.urls))
+        self.assertEqual(crawler.urls, async_crawler.urls)
+        self.assertEqual(['https://ugra-news.ru/article/society-p1-0/',
+                          'https://ugra-news.ru/article/politics-p1-0/',
+                          'https://ugra-news.ru/article/society-p2-0/'],
+                         crawler.urls[::3][:3])
+        self.assertEqual(['https://ugra-news.ru/rubrics/society/',
+                          'https://ugra-news.ru/rubrics/politics/',
+                          'https://ugra-news.ru/rubrics/society/?PAGEN_1=2',
+                          'https://ugra-news.ru/rubrics/politics/?PAGEN_1=2',
+                          'https://ugra-news.ru/rubrics/society/?PAGEN_1=3'], requested)
+
+    @pytest.mark.lab_5_scraper
+    def test_crawler_stops_after_last_linked_page(self) -> None:
+        """
+        Ensure pages beyond the last page linked by the pager are never requested.
+        """
+        self.config._seed_urls = self.config.get_seed_urls()[:2]
+        self.config._crawling.sitemap_urls = []
+        self.config._num_articles = 100
+        with mock.patch.object(scraper, 'make_request',
+                               side_effect=paged_seed_page) as make_request:
+            crawler = Crawler(self.config)
+            crawler.find_articles()
+        self.assertEqual(18, len(crawler.urls))
+        self.assertEqual(6, make_request.call_count)
+
+    @pytest.mark.lab_5_scraper
+    def test_crawler_reads_on_past_page_of_known_urls(self) -> None:
+        """
+        Ensure a page whose articles were all collected before still leads to the next page.
+        """
+        self.config._seed_urls = self.config.get_seed_urls()[:1]
+        self.config._crawling.sitemap_urls = []
+        self.config._num_articles = 100
+        with mock.patch.object(scraper, 'make_request',
+                               side_effect=paged_seed_page) as make_request:
+            crawler = Crawler(self.config)
+            known_urls = [f'https://ugra-news.ru/article/society-p1-{idx}/' for idx in range(3)]
+            crawler._collected.update(known_urls)
+            crawler.find_articles()
+        self.assertEqual(3, make_request.call_count)
+        self.assertEqual(6, len(crawler.urls))
+
+    @pytest.mark.lab_5_scraper
+    def test_host_limiter_bounds_in_flight_requests(self) -> None:
+        """
+        Ensure no more than the configured number of requests are in flight per host.
+        """
+        limiter = HostLimiter(2)
+        in_flight = {'current': 0, 'peak': 0}
+
+        async def fetch(url: str) -> None:
+            async with limiter.for_url(url):
+                in_flight['current'] += 1
+                in_flight['peak'] = max(in_flight['peak'], in_flight['current'])
+                await asyncio.sleep(0.01)
+                in_flight['current'] -= 1
+
+        async def run() -> None:
+            await asyncio.gather(*(fetch(f'https://ugra-news.ru/article/{idx}/')
+                                   for idx in range(10)))
+
+        asyncio.run(run())
+        self.assertEqual(2, in_flight['peak'])
+        self.assertIs(limiter.for_url('https://UGRA-NEWS.ru/a'),
+                      limiter.for_url('https://ugra-news.ru/b'))
+
+
+class ScrapeStreamTest(ScraperTestCase):
+    """
+    Class for testing the streaming scraping pipeline.
+    """
+
+    def setUp(self) -> None:
+        """
+        Define start instructions for ScrapeStreamTest class.
+        """
+        super().setUp()
+        self.config._num_articles = 7
+        # every article page of the mock site has the same text
+        self.config._storage.skip_near_duplicates = False
+
+    @pytest.mark.lab_5_scraper
+    def test_stream_saves_articles_with_ids_in_seed_order(self) -> None:
+        """
+        Ensure streamed articles keep ids of the sequential crawler.
+        """
+        with mock.patch.object(scraper, 'make_request', side_effect=site_page):
+            crawler = Crawler(self.config)
+            crawler.find_articles()
+            saved = asyncio.run(scrape_async(self.config))
+        self.assertEqual(7, saved)
+        for article_id, url in enumerate(crawler.urls, 1):
+            with open(TEST_PATH / f'{article_id}_meta.json', encoding='utf-8') as file:
+                self.assertEqual(url, json.load(file)['url'])
+            self.assertTrue((TEST_PATH / f'{article_id}_raw.txt').stat().st_size)
+
+    @pytest.mark.lab_5_scraper
+    def test_stream_parses_in_worker_processes(self) -> None:
+        """
+        Ensure articles parsed in worker processes match articles parsed in place.
+        """
+        self.config._processing.parse_workers = 2
+        with mock.patch.object(scraper, 'make_request', side_effect=site_page):
+            saved = asyncio.run(scrape_async(self.config))
+        self.assertEqual(7, saved)
+        reference = scraper.HTMLParser('https://ugra-news.ru/article/1/', 1,
+                                       self.config).parse_html(ARTICLE_HTML)
+        with open(TEST_PATH / '7_meta.json', encoding='utf-8') as file:
+            meta = json.load(file)
+        self.assertEqual(7, meta['id'])
+        self.assertEqual(reference.title, meta['title'])
+        self.assertEqual(reference.topics, meta['topics'])
+        self.assertEqual(reference.text, (TEST_PATH / '7_raw.txt').read_text(encoding='utf-8'))
+
+    @pytest.mark.lab_5_scraper
+    def test_parsing_processes_receive_configuration_once(self) -> None:
+        """
+        Ensure tasks of the parsing pool carry pages only, not the configuration.
+        """
+        self.config._processing.parse_workers = 2
+        with mock.patch.object(scraper, 'make_request', side_effect=site_page), \
+                mock.patch.object(Config, '__getstate__', autospec=True,
+                                  side_effect=Config.__getstate__) as get_state:
+            saved = asyncio.run(scrape_async(self.config))
+        self.assertEqual(7, saved)
+        self.assertLessEqual(get_state.call_count, 2)
+
+    @pytest.mark.lab_5_scraper
+    def test_stream_skips_failed_pages_without_gaps_in_ids(self) -> None:
+        """
+        Ensure pages failing after retries are not saved and later articles close the gap.
+        """
+        failing_url = 'https://ugra-news.ru/article/politics-0/'
+
+        def flaky_site_page(url: str, *args: object) -> requests.models.Response:
+            if url == failing_url:
+                return build_response(url, '', 503)
+            return site_page(url)
+
+        with mock.patch.object(scraper, 'make_request', side_effect=flaky_site_page):
+            crawler = Crawler(self.config)
+            crawler.find_articles()
+            saved = asyncio.run(scrape_async(self.config))
+        self.assertEqual(6, saved)
+        self.assertFalse((TEST_PATH / '7_meta.json').exists())
+        saved_urls = [url for url in crawler.urls if url != failing_url]
+        for article_id, url in enumerate(saved_urls, 1):
+            with open(TEST_PATH / f'{article_id}_meta.json', encoding='utf-8') as file:
+                self.assertEqual(url, json.load(file)['url'])
+
+    @pytest.mark.lab_5_scraper
+    def test_stream_skips_unparseable_pages_without_gaps_in_ids(self) -> None:
+        """
+        Ensure a page lacking the article text is skipped instead of stopping the run.
+        """
+        malformed_url = 'https://ugra-news.ru/article/politics-0/'
+
+        def malformed_site_page(url: str, *args: object) -> requests.models.Response:
+            if url == malformed_url:
+                return build_response(url, '<html><body><h1 class="title">T</h1></body></html>')
+            return site_page(url)
+
+        for fast in (False, True):
+            self.config._processing.use_fast_extraction = fast
+            with mock.patch.object(scraper, 'make_request', side_effect=malformed_site_page):
+                saved = asyncio.run(asyncio.wait_for(scrape_async(self.config), 30))
+            self.assertEqual(6, saved)
+            self.assertFalse((TEST_PATH / '7_meta.json').exists())
+
+    @pytest.mark.lab_5_scraper
+    def test_stream_stops_all_stages_when_one_fails(self) -> None:
+        """
+        Ensure an error of the writer stops the crawler and the parsers and is raised.
+        """
+        self.config._num_articles = 30
+        with mock.patch.object(scraper, 'make_request', side_effect=site_page), \
+                mock.patch.object(async_scraper, 'write_article', side_effect=OSError('disk full')):
+            with self.assertRaisesRegex(OSError, 'disk full'):
+                asyncio.run(asyncio.wait_for(scrape_async(self.config), 30))
@@ -0,0 +1,86 @@
+"""
+Date normalization validation.
+"""
+
+import datetime
+import unittest
+
+import pytest
+
+from lab_5_scraper.dates import compile_date, parse_date, parse_dates
+
+NOW = datetime.datetime(2025, 4, 12, 14, 30, 45)
+
+
+class DatesTest(unittest.TestCase):
+    """
+    Class for testing normalization of dates.
+    """
+
+    @pytest.mark.lab_5_scraper
+    def test_absolute_dates_are_parsed(self) -> None:
+        """
+        Ensure dates written in full, without a year or with abbreviations are parsed.
+        """
+        expected = datetime.datetime(2024, 5, 1, 9, 5)
+        for text in ('1 мая 2024 09:05', '1 Мая 2024, в 09:05', ' 1  мая  2024 г. 09:05',
+                     '01.05.2024 09:05', '2024-05-01 09:05'):
+            self.assertEqual(expected, parse_date(text), text)
+        self.assertEqual(datetime.datetime(2025, 9, 3, 0, 0), parse_date('3 сент. 2025'))
+        self.assertEqual(datetime.datetime(2025, 2, 7, 18, 0), parse_date('7 февраля 18:00', NOW))
+        self.assertEqual(datetime.datetime(2024, 2, 29, 10, 0),
+                         parse_date('29 февраля 10:00', NOW))
+
+    @pytest.mark.lab_5_scraper
+    def test_relative_dates_are_counted_from_now(self) -> None:
+        """
+        Ensure day words and time passed are resolved against the given current time.
+        """
+        self.assertEqual(datetime.datetime(2025, 4, 12, 9, 15), parse_date('Сегодня, 09:15', NOW))
+        self.assertEqual(datetime.datetime(2025, 4, 11, 23, 5), parse_date('вчера в 23:05', NOW))
+        self.assertEqual(datetime.datetime(2025, 4, 12, 14, 25), parse_date('5 минут назад', NOW))
+        self.assertEqual(datetime.datetime(2025, 4, 12, 13, 30), parse_date('час назад', NOW))
+        self.assertEqual(datetime.datetime(2025, 4, 10, 14, 30), parse_date('2 дня назад', NOW))
+        self.assertEqual(datetime.datetime(2025, 4, 12, 14, 30), parse_date('только что', NOW))
+        later = NOW + datetime.timedelta(days=1)
+        self.assertEqual(datetime.datetime(2025, 4, 13, 9, 15), parse_date('сегодня 09:15', later))
+
+    @pytest.mark.lab_5_scraper
+    def test_each_distinct_string_is_compiled_once(self) -> None:
+        """
+        Ensure repeated strings come from the cache and site dates skip it.
+        """
+        compile_date.cache_clear()
+        column = ['вчера 10:00', '12 апреля 2025 14:30', 'вчера 10:00', '3 часа назад']
+        self.assertEqual([datetime.datetime(2025, 4, 11, 10, 0),
+                          datetime.datetime(2025, 4, 12, 14, 30),
+                          datetime.datetime(2025, 4, 11, 10, 0),
+                          datetime.datetime(2025, 4, 12, 11, 30)],
+                         [parse_date(text, NOW) for text in column])
+        info = compile_date.cache_info()
+        self.assertEqual((2, 1), (info.misses, info.hits))
+
+    @pytest.mark.lab_5_scraper
+    def test_batch_parses_each_distinct_string_once(self) -> None:
+        """
+        Ensure a column is parsed in order and repeated strings are resolved once.
+        """
+        compile_date.cache_clear()
+        column = ['вчера 10:00', '12 апреля 2025 14:30', 'вчера 10:00', '3 часа назад']
+        self.assertEqual([datetime.datetime(2025, 4, 11, 10, 0),
+                          datetime.datetime(2025, 4, 12, 14, 30),
+                          datetime.datetime(2025, 4, 11, 10, 0),
+                          datetime.datetime(2025, 4, 12, 11, 30)], parse_dates(column, NOW))
+        parse_dates(column, NOW)
+        info = compile_date.cache_info()
+        self.assertEqual((2, 2), (info.misses, info.hits))
+
+    @pytest.mark.lab_5_scraper
+    def test_malformed_dates_are_rejected(self) -> None:
+        """
+        Ensure unknown formats, months and impossible dates raise ValueError.
+        """
+        for text in ('', 'недавно', '12 смарта 2025 10:00', '31 февраля 2025 10:00',
+                     '30 февраля 10:00', 'вчера в 25:00'):
+            with self.assertRaises(ValueError, msg=text):
+                parse_date(text, NOW)
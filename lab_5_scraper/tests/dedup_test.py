@@ -0,0 +1,132 @@
+"""
+Near-duplicate detection validation.
+"""
+
+# pylint: disable=protected-access
+import asyncio
+import threading
+import unittest
+from unittest import mock
+
+import pytest
+import requests
+
+from admin_utils.test_params import TEST_PATH
+from lab_5_scraper import async_scraper, scraper
+from lab_5_scraper.async_scraper import scrape_async
+from lab_5_scraper.dedup import minhash, NearDuplicateIndex
+from lab_5_scraper.tests.async_scraper_test import ARTICLE_HTML, seed_page, site_page
+from lab_5_scraper.tests.utils import build_response, ScraperTestCase
+
+TEXT = ('В Сургуте после реконструкции открылась центральная городская библиотека. '
+        'В здании обновили читальные залы, появились коворкинг и детская зона, '
+        'а фонд пополнили тысячами новых книг. На открытии побывали глава города '
+        'и представители администрации, которые поблагодарили строителей за работу. '
+        'Библиотека будет работать ежедневно, кроме понедельника, с десяти утра до '
+        'восьми вечера. Для читателей подготовили программу лекций, встреч с '
+        'писателями и мастер-классов, а записаться можно будет на сайте учреждения.')
+
+
+def unique_site_page(url: str, *args: object) -> requests.models.Response:
+    """
+    Build a seed page or an article page with a text of its own.
+
+    Args:
+        url (str): Site url
+        *args (object): Ignored request arguments
+
+    Returns:
+        requests.models.Response: A response
+    """
+    if '/rubrics/' in url:
+        return seed_page(url)
+    text = ' '.join(f'{url}-{idx}' for idx in range(40))
+    return build_response(url, ARTICLE_HTML.replace(
+        '<div class="news-detail__detail-text">',
+        f'<div class="news-detail__detail-text"><p>{text}</p>'))
+
+
+class MinHashTest(unittest.TestCase):
+    """
+    Class for testing signatures and the index of near-duplicates.
+    """
+
+    @pytest.mark.lab_5_scraper
+    def test_edited_copies_are_near_duplicates(self) -> None:
+        """
+        Ensure a copy with a changed word, case and spacing is a near-duplicate.
+        """
+        index = NearDuplicateIndex()
+        self.assertIsNone(index.add('https://ugra-news.ru/article/1/', TEXT))
+        edited = '\n' + TEXT.replace('тысячами', 'сотнями').upper() + '  '
+        self.assertEqual('https://ugra-news.ru/article/1/',
+                         index.add('https://ugra-news.ru/article/2/', edited))
+        self.assertEqual(1, len(index))
+
+    @pytest.mark.lab_5_scraper
+    def test_different_texts_are_kept(self) -> None:
+        """
+        Ensure unrelated texts and texts without words are never duplicates.
+        """
+        index = NearDuplicateIndex()
+        self.assertIsNone(index.add('first', TEXT))
+        self.assertIsNone(index.add('second', 'В Ханты-Мансийске прошел форум '
+                                              'молодых предпринимателей региона.'))
+        self.assertIsNone(index.add('empty', ''))
+        self.assertIsNone(index.add('also empty', ' ... '))
+        self.assertEqual(2, len(index))
+        self.assertIsNone(minhash(''))
+
+
+class ScrapeDuplicatesTest(ScraperTestCase):
+    """
+    Class for testing that near-duplicates are not saved.
+    """
+
+    def setUp(self) -> None:
+        """
+        Define start instructions for ScrapeDuplicatesTest class.
+        """
+        super().setUp()
+        self.config._num_articles = 5
+        self.config._storage.skip_near_duplicates = True
+
+    @pytest.mark.lab_5_scraper
+    def test_repeated_news_is_saved_once(self) -> None:
+        """
+        Ensure pages with the same text under different urls give a single article.
+        """
+        with mock.patch.object(scraper, 'make_request', side_effect=site_page):
+            saved = asyncio.run(scrape_async(self.config))
+        self.assertEqual(1, saved)
+        self.assertTrue((TEST_PATH / '1_raw.txt').exists())
+        self.assertFalse((TEST_PATH / '2_raw.txt').exists())
+        self.assertEqual(4, self.config.get_metrics().get_report()['duplicates'])
+
+    @pytest.mark.lab_5_scraper
+    def test_distinct_news_are_all_saved(self) -> None:
+        """
+        Ensure pages sharing the layout but not the text are all saved.
+        """
+        with mock.patch.object(scraper, 'make_request', side_effect=unique_site_page):
+            saved = asyncio.run(scrape_async(self.config))
+        self.assertEqual(5, saved)
+        self.assertEqual(0, self.config.get_metrics().get_report()['duplicates'])
+
+    @pytest.mark.lab_5_scraper
+    def test_signatures_are_computed_off_the_event_loop(self) -> None:
+        """
+        Ensure texts are hashed by the parse stage outside the thread of the event loop.
+        """
+        threads = []
+
+        def record_thread(text: str) -> tuple[int, ...] | None:
+            threads.append(threading.current_thread())
+            return minhash(text)
+
+        with mock.patch.object(scraper, 'make_request', side_effect=site_page), \
+                mock.patch.object(async_scraper, 'minhash', side_effect=record_thread):
+            saved = asyncio.run(scrape_async(self.config))
+        self.assertEqual(1, saved)
+        self.assertEqual(5, len(threads))
+        self.assertNotIn(threading.main_thread(), threads)
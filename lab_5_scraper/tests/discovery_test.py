@@ -0,0 +1,143 @@
+"""
+Sitemap and feed discovery validation.
+"""
+
+# pylint: disable=protected-access
+import datetime
+import gzip
+import io
+import unittest
+from unittest import mock
+
+import pytest
+import requests
+
+from core_utils.constants import CRAWLER_CONFIG_PATH
+from lab_5_scraper import scraper
+from lab_5_scraper.discovery import discover_entries, iter_feed_entries
+from lab_5_scraper.scraper import Config, Crawler
+from lab_5_scraper.tests.async_scraper_test import seed_page
+from lab_5_scraper.tests.utils import build_response
+
+SITEMAP_INDEX = b"""<?xml version="1.0" encoding="UTF-8"?>
+<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+  <sitemap><loc>https://ugra-news.ru/sitemap-old.xml</loc><lastmod>2020-01-01</lastmod></sitemap>
+  <sitemap><loc>https://ugra-news.ru/sitemap-new.xml.gz</loc><lastmod>2025-04-12</lastmod></sitemap>
+</sitemapindex>"""
+
+SITEMAP = b"""<?xml version="1.0" encoding="UTF-8"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+  <url><loc>https://ugra-news.ru/article/new-1/</loc><lastmod>2025-04-12T10:00:00+05:00</lastmod></url>
+  <url><loc>https://ugra-news.ru/rubrics/culture/</loc></url>
+  <url><loc>https://ugra-news.ru/article/stale/</loc><lastmod>2024-12-31</lastmod></url>
+  <url><loc>https://ugra-news.ru/article/new-2/</loc></url>
+  <url><loc>https://ugra-news.ru/article/new-3/</loc><lastmod>2025-05-01</lastmod></url>
+</urlset>"""
+
+RSS = b"""<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0"><channel><title>Feed</title><link>https://ugra-news.ru/</link>
+  <item><title>One</title><link>https://ugra-news.ru/article/rss-1/</link>
+    <pubDate>Sat, 12 Apr 2025 14:30:00 +0500</pubDate></item>
+  <item><title>Two</title><link>https://ugra-news.ru/article/rss-2/</link></item>
+</channel></rss>"""
+
+DOCUMENTS = {
+    'https://ugra-news.ru/sitemap.xml': SITEMAP_INDEX,
+    'https://ugra-news.ru/sitemap-new.xml.gz': gzip.compress(SITEMAP),
+}
+
+
+def site_with_sitemap(url: str, *args: object) -> requests.models.Response:
+    """
+    Serve sitemaps and seed pages depending on the url.
+
+    Args:
+        url (str): Site url
+        *args (object): Ignored request arguments
+
+    Returns:
+        requests.models.Response: A response
+    """
+    if url in DOCUMENTS:
+        response = build_response(url, '')
+        response._content = DOCUMENTS[url]
+        return response
+    if '/rubrics/' in url:
+        return seed_page(url)
+    return build_response(url, '', 404)
+
+
+class DiscoveryTest(unittest.TestCase):
+    """
+    Class for testing discovery of urls from sitemaps and feeds.
+    """
+
+    def setUp(self) -> None:
+        """
+        Define start instructions for DiscoveryTest class.
+        """
+        self.config = Config(CRAWLER_CONFIG_PATH)
+        self.config._crawling.sitemap_urls = ['https://ugra-news.ru/sitemap.xml']
+        self.config._crawling.lastmod_since = '2025-01-01'
+
+    @pytest.mark.lab_5_scraper
+    def test_rss_items_are_read_with_dates(self) -> None:
+        """
+        Ensure RSS items give their links and publication dates.
+        """
+        entries = list(iter_feed_entries(io.BytesIO(RSS)))
+        self.assertEqual(['https://ugra-news.ru/article/rss-1/',
+                          'https://ugra-news.ru/article/rss-2/'],
+                         [entry.url for entry in entries])
+        self.assertEqual(datetime.date(2025, 4, 12), entries[0].lastmod)
+        self.assertIsNone(entries[1].lastmod)
+
+    @pytest.mark.lab_5_scraper
+    def test_sitemap_index_is_followed_and_filtered_by_lastmod(self) -> None:
+        """
+        Ensure stale nested sitemaps are not downloaded and stale entries are skipped.
+        """
+        fetched = []
+
+        def fetch(url: str) -> bytes | None:
+            fetched.append(url)
+            return DOCUMENTS.get(url)
+
+        urls = [entry.url for entry in discover_entries(['https://ugra-news.ru/sitemap.xml'],
+                                                        fetch, datetime.date(2025, 1, 1))]
+        self.assertEqual(['https://ugra-news.ru/article/new-1/',
+                          'https://ugra-news.ru/rubrics/culture/',
+                          'https://ugra-news.ru/article/new-2/',
+                          'https://ugra-news.ru/article/new-3/'], urls)
+        self.assertEqual(['https://ugra-news.ru/sitemap.xml',
+                          'https://ugra-news.ru/sitemap-new.xml.gz'], fetched)
+
+    @pytest.mark.lab_5_scraper
+    def test_crawler_prefers_sitemaps_to_seed_pages(self) -> None:
+        """
+        Ensure seed pages are requested only for articles sitemaps did not give.
+        """
+        self.config._num_articles = 5
+        with mock.patch.object(scraper, 'make_request',
+                               side_effect=site_with_sitemap) as make_request:
+            crawler = Crawler(self.config)
+            crawler.find_articles()
+        self.assertEqual(['https://ugra-news.ru/article/new-1/',
+                          'https://ugra-news.ru/article/new-2/',
+                          'https://ugra-news.ru/article/new-3/',
+                          'https://ugra-news.ru/article/society-0/',
+                          'https://ugra-news.ru/article/society-1/'], crawler.urls)
+        self.assertEqual(3, make_request.call_count)
+
+    @pytest.mark.lab_5_scraper
+    def test_crawler_stops_reading_sitemaps_once_budget_is_reached(self) -> None:
+        """
+        Ensure no seed page and no further sitemap is requested once enough urls are found.
+        """
+        self.config._num_articles = 1
+        with mock.patch.object(scraper, 'make_request',
+                               side_effect=site_with_sitemap) as make_request:
+            crawler = Crawler(self.config)
+            crawler.find_articles()
+        self.assertEqual(['https://ugra-news.ru/article/new-1/'], crawler.urls)
+        self.assertEqual(2, make_request.call_count)
@@ -0,0 +1,152 @@
+"""
+Fast extraction path validation.
+"""
+
+# pylint: disable=protected-access
+import unittest
+from unittest import mock
+
+import pytest
+from bs4 import BeautifulSoup
+from lxml import html as lxml_html
+
+from admin_utils.test_params import SCRAPER_TEST_FILES_FOLDER
+from core_utils.constants import CRAWLER_CONFIG_PATH
+from lab_5_scraper import scraper
+from lab_5_scraper.extraction import ArticleExtractor, ExtractionRules
+from lab_5_scraper.scraper import Config, Crawler, HTMLParser, IncorrectExtractionRulesError
+from lab_5_scraper.tests.async_scraper_test import seed_page
+
+ARTICLE_HTML = (SCRAPER_TEST_FILES_FOLDER / 'article.html').read_text(encoding='utf-8')
+
+EDGE_CASES_HTML = """<html><body>
+<div class="news-detail__detail-text wide"> first <b>bold</b>  <script>var x = 1;</script> tail
+<pre>  kept
+  </pre>   \t <!-- comment -->  after<ruby>漢<rt>kan</rt></ruby> &amp; <style>p {}</style><br>
+</div>
+<h1 class="title">Header</h1><h1 class="title main">  Title </h1>
+<span class="author-news__info-text">1 мая 2024 09:05</span>
+<a class="tags photo-report-detail-share-tags__item">
+  Tag</a>
+<a class="photo-report-detail-share-tags__item">Not a tag</a>
+</body></html>"""
+
+
+class ExtractionTest(unittest.TestCase):
+    """
+    Class for testing that both extraction paths fill articles the same way.
+    """
+
+    def setUp(self) -> None:
+        """
+        Define start instructions for ExtractionTest class.
+        """
+        self.soup_config = Config(CRAWLER_CONFIG_PATH)
+        self.soup_config._processing.use_fast_extraction = False
+        self.soup_config._num_articles = 20
+        self.fast_config = Config(CRAWLER_CONFIG_PATH)
+        self.fast_config._processing.use_fast_extraction = True
+        self.fast_config._num_articles = 20
+        self.assertNotEqual(self.soup_config.get_processing_options().use_fast_extraction,
+                            self.fast_config.get_processing_options().use_fast_extraction)
+
+    def _parse(self, config: Config, html: str) -> dict:
+        """
+        Parse a page into fields of an article.
+
+        Args:
+            config (Config): Configuration
+            html (str): HTML of the page
+
+        Returns:
+            dict: Fields of the article
+        """
+        return vars(HTMLParser('https://ugra-news.ru/article/1/', 1, config).parse_html(html))
+
+    @pytest.mark.lab_5_scraper
+    def test_fast_path_fills_same_article(self) -> None:
+        """
+        Ensure the lxml path fills the fixture article exactly as BeautifulSoup does.
+        """
+        fast = self._parse(self.fast_config, ARTICLE_HTML)
+        self.assertEqual(self._parse(self.soup_config, ARTICLE_HTML), fast)
+        self.assertEqual('В Сургуте открыли новую библиотеку', fast['title'])
+
+    @pytest.mark.lab_5_scraper
+    def test_fast_path_keeps_text_of_edge_cases(self) -> None:
+        """
+        Ensure scripts, comments, whitespace and multi-class matching follow BeautifulSoup.
+        """
+        self.assertEqual(self._parse(self.soup_config, EDGE_CASES_HTML),
+                         self._parse(self.fast_config, EDGE_CASES_HTML))
+        self.assertEqual(['\n  Tag'], ArticleExtractor().extract(EDGE_CASES_HTML).topics)
+
+    @pytest.mark.lab_5_scraper
+    def test_fast_path_fails_on_missing_blocks_as_soup_path(self) -> None:
+        """
+        Ensure a page lacking a required block fails on both paths instead of filling None.
+        """
+        for block in ('news-detail__detail-text', 'title', 'author-news__info-text'):
+            page = EDGE_CASES_HTML.replace(f'class="{block}', 'class="other')
+            for config in (self.soup_config, self.fast_config):
+                with self.assertRaises(IndexError, msg=block):
+                    self._parse(config, page)
+        page = EDGE_CASES_HTML.replace('<h1 class="title">Header</h1>', '')
+        self.assertEqual(self._parse(self.soup_config, page), self._parse(self.fast_config, page))
+
+    @pytest.mark.lab_5_scraper
+    def test_fast_path_collects_same_seed_urls(self) -> None:
+        """
+        Ensure the lxml path collects the same urls from seed pages.
+        """
+        with mock.patch.object(scraper, 'make_request', side_effect=seed_page):
+            soup_crawler = Crawler(self.soup_config)
+            soup_crawler.find_articles()
+            fast_crawler = Crawler(self.fast_config)
+            fast_crawler.find_articles()
+        self.assertEqual(20, len(fast_crawler.urls))
+        self.assertEqual(soup_crawler.urls, fast_crawler.urls)
+
+    @pytest.mark.lab_5_scraper
+    def test_configured_rules_fill_same_article(self) -> None:
+        """
+        Ensure configured rules replace the default ones of their fields on both paths.
+        """
+        rules = {'title': {'tag': 'h1', 'class': 'main'},
+                 'topics': [{'tag': 'a', 'class': 'photo-report-detail-share-tags__item'},
+                            {'tag': 'h1', 'class': 'title'}]}
+        for config in (self.soup_config, self.fast_config):
+            config._processing.extraction_rules = rules
+            config._init_services()
+        fast = self._parse(self.fast_config, EDGE_CASES_HTML)
+        self.assertEqual(self._parse(self.soup_config, EDGE_CASES_HTML), fast)
+        self.assertEqual('Title', fast['title'].strip())
+        self.assertEqual(['Tag', 'Not a tag', 'Header', 'Title'], fast['topics'])
+
+    @pytest.mark.lab_5_scraper
+    def test_rules_match_trees_of_both_parsers_alike(self) -> None:
+        """
+        Ensure links are found by rule order, enclosing classes and hrefs in both trees.
+        """
+        page = """<html><body>
+<a class="line-news" href="/article/2/">2</a><a class="header__top-banner-item" href="/b/">b</a>
+<div class="news-detail__detail-text"><p><a href="/article/3/">3</a><a>no href</a></p></div>
+<a class="line-news" href="/article/4/">4</a><a href="/article/5/">outside</a>
+</body></html>"""
+        rules = ExtractionRules().select(('links', 'text_links'))
+        for fields in (rules.match_tree(lxml_html.document_fromstring(page)),
+                       rules.match_soup(BeautifulSoup(page, 'lxml'))):
+            self.assertEqual(['/article/2/', '/article/4/', '/b/'],
+                             [link.get('href') for link in fields['links']])
+            self.assertEqual(['/article/3/'], [link.get('href') for link in fields['text_links']])
+
+    @pytest.mark.lab_5_scraper
+    def test_malformed_rules_are_rejected(self) -> None:
+        """
+        Ensure rules of unknown fields or without a tag fail validation.
+        """
+        for rules in ({'subtitle': {'tag': 'h2'}}, {'title': {'class': 'title'}},
+                      {'title': [{'tag': 'h1', 'class': ''}]}, ['title']):
+            self.soup_config._processing.extraction_rules = rules
+            with self.assertRaises(IncorrectExtractionRulesError):
+                self.soup_config._validate_config_content()
@@ -0,0 +1,109 @@
+"""
+Response cache validation.
+"""
+
+import shutil
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from admin_utils.test_params import TEST_PATH
+from lab_5_scraper.http_cache import ResponseCache
+
+BODY = '<html><body><h1 class="title">Заголовок</h1></body></html>'.encode('utf-8')
+
+
+class ETagHandler(BaseHTTPRequestHandler):
+    """
+    Serve a page that supports revalidation by ETag.
+    """
+
+    #: Number of bodies sent
+    bodies_sent = 0
+
+    def do_GET(self) -> None:  # pylint: disable=invalid-name
+        """
+        Respond to a GET request.
+        """
+        if self.headers.get('If-None-Match') == '"v1"':
+            self.send_response(304)
+            self.send_header('ETag', '"v1"')
+            self.end_headers()
+            return
+        ETagHandler.bodies_sent += 1
+        self.send_response(200)
+        self.send_header('ETag', '"v1"')
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(BODY)))
+        self.end_headers()
+        self.wfile.write(BODY)
+
+    def log_message(self, *args: object) -> None:
+        """
+        Keep test output clean.
+
+        Args:
+            *args (object): Ignored log arguments
+        """
+
+
+class ResponseCacheTest(unittest.TestCase):
+    """
+    Class for testing ResponseCache functionality.
+    """
+
+    def setUp(self) -> None:
+        """
+        Define start instructions for ResponseCacheTest class.
+        """
+        ETagHandler.bodies_sent = 0
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), ETagHandler)
+        self.url = f'http://127.0.0.1:{self.server.server_port}/article/1/'
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.cache = ResponseCache(TEST_PATH / 'http_cache')
+
+    def tearDown(self) -> None:
+        """
+        Define final instructions for ResponseCacheTest class.
+        """
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(TEST_PATH, ignore_errors=True)
+
+    def fetch(self) -> requests.models.Response:
+        """
+        Request the page through the cache.
+
+        Returns:
+            requests.models.Response: A response with body
+        """
+        response = requests.get(self.url, headers=self.cache.get_conditional_headers(self.url),
+                                timeout=5)
+        return self.cache.update(self.url, response)
+
+    @pytest.mark.lab_5_scraper
+    def test_repeated_request_is_served_from_disk(self) -> None:
+        """
+        Ensure the second request is revalidated and its body comes from the cache.
+        """
+        first = self.fetch()
+        second = self.fetch()
+        self.assertEqual(1, ETagHandler.bodies_sent)
+        self.assertEqual((1, 1), (self.cache.hits, self.cache.misses))
+        self.assertEqual(200, second.status_code)
+        self.assertEqual(first.content, second.content)
+        second.encoding = 'utf-8'
+        self.assertIn('Заголовок', second.text)
+
+    @pytest.mark.lab_5_scraper
+    def test_unknown_url_has_no_conditional_headers(self) -> None:
+        """
+        Ensure nothing is revalidated before the first download.
+        """
+        self.assertEqual({}, self.cache.get_conditional_headers(self.url))
+        self.fetch()
+        self.assertEqual({'If-None-Match': '"v1"'},
+                         self.cache.get_conditional_headers(self.url))
@@ -0,0 +1,86 @@
+"""
+Connection pool validation.
+"""
+
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from lab_5_scraper.http_session import SessionPool
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    """
+    Serve a tiny page over persistent connections.
+    """
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self) -> None:  # pylint: disable=invalid-name
+        """
+        Respond to a GET request.
+        """
+        body = b'<html><body>ok</body></html>'
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args: object) -> None:
+        """
+        Keep test output clean.
+
+        Args:
+            *args (object): Ignored log arguments
+        """
+
+
+class SessionPoolTest(unittest.TestCase):
+    """
+    Class for testing SessionPool functionality.
+    """
+
+    def setUp(self) -> None:
+        """
+        Define start instructions for SessionPoolTest class.
+        """
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), KeepAliveHandler)
+        self.url = f'http://127.0.0.1:{self.server.server_port}/'
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def tearDown(self) -> None:
+        """
+        Define final instructions for SessionPoolTest class.
+        """
+        self.server.shutdown()
+        self.server.server_close()
+
+    @pytest.mark.lab_5_scraper
+    def test_session_pool_reuses_connections(self) -> None:
+        """
+        Ensure sequential requests to one host share a single connection.
+        """
+        pool = SessionPool({}, pool_size=2, keep_alive=True, max_retries=0)
+        for _ in range(5):
+            self.assertTrue(pool.get(self.url, timeout=5).ok)
+        statistics = pool.get_statistics()
+        pool.close()
+        self.assertEqual(5, statistics['requests'])
+        self.assertEqual(1, statistics['connections'])
+        self.assertAlmostEqual(0.8, statistics['reuse_ratio'])
+        self.assertEqual(1, statistics['open_sockets'])
+
+    @pytest.mark.lab_5_scraper
+    def test_session_pool_without_keep_alive_opens_new_connections(self) -> None:
+        """
+        Ensure disabled keep-alive closes connections after every request.
+        """
+        pool = SessionPool({}, pool_size=2, keep_alive=False, max_retries=0)
+        for _ in range(3):
+            self.assertTrue(pool.get(self.url, timeout=5).ok)
+        statistics = pool.get_statistics()
+        pool.close()
+        self.assertEqual(3, statistics['connections'])
+        self.assertEqual(0.0, statistics['reuse_ratio'])
@@ -0,0 +1,42 @@
+"""
+Cold start of the entry points validation.
+"""
+
+import unittest
+
+import pytest
+
+from lab_5_scraper.benchmarks.import_benchmark import (
+    ENTRY_POINTS,
+    IMPORT_BUDGET_MS,
+    measure_import,
+)
+
+
+class ImportBenchmarkTest(unittest.TestCase):
+    """
+    Class for testing that entry points defer heavy dependencies.
+    """
+
+    @pytest.mark.lab_5_scraper
+    def test_entry_points_start_cold_without_heavy_dependencies(self) -> None:
+        """
+        Ensure importing an entry point does not even try to import a deferred dependency.
+        """
+        for module in ENTRY_POINTS:
+            self.assertEqual([], measure_import(module, repeats=1)[1], module)
+
+    @pytest.mark.lab_5_scraper
+    def test_entry_points_start_within_budget(self) -> None:
+        """
+        Ensure the fastest of a few cold imports of an entry point meets the budget.
+        """
+        for module in ENTRY_POINTS:
+            self.assertLessEqual(measure_import(module, repeats=3)[0], IMPORT_BUDGET_MS, module)
+
+    @pytest.mark.lab_5_scraper
+    def test_attempted_imports_are_reported(self) -> None:
+        """
+        Ensure an eagerly imported dependency is reported.
+        """
+        self.assertEqual(['colorsys'], measure_import('colorsys', 1, ('colorsys',))[1])
@@ -0,0 +1,185 @@
+"""
+Incremental recrawl validation.
+"""
+
+# pylint: disable=protected-access
+import asyncio
+import datetime
+import shutil
+import unittest
+from unittest import mock
+
+import pytest
+
+from admin_utils.test_params import TEST_PATH
+from core_utils.article import article
+from core_utils.article.article import Article
+from core_utils.constants import CRAWLER_CONFIG_PATH
+from lab_5_scraper import config as scraper_config
+from lab_5_scraper import scraper
+from lab_5_scraper.async_scraper import scrape_async
+from lab_5_scraper.manifest import CrawlManifest
+from lab_5_scraper.scraper import accept_article, Config, prepare_assets
+from lab_5_scraper.tests.dedup_test import unique_site_page
+
+URL = 'https://ugra-news.ru/article/1/'
+
+
+class CrawlManifestTest(unittest.TestCase):
+    """
+    Class for testing CrawlManifest functionality.
+    """
+
+    def setUp(self) -> None:
+        """
+        Define start instructions for CrawlManifestTest class.
+        """
+        TEST_PATH.mkdir(parents=True, exist_ok=True)
+        self.path = TEST_PATH / 'manifest.jsonl'
+
+    def tearDown(self) -> None:
+        """
+        Define final instructions for CrawlManifestTest class.
+        """
+        shutil.rmtree(TEST_PATH, ignore_errors=True)
+
+    @pytest.mark.lab_5_scraper
+    def test_manifest_survives_a_torn_line(self) -> None:
+        """
+        Ensure records are restored, later records win and a torn line is dropped.
+        """
+        manifest = CrawlManifest(self.path)
+        manifest.record(URL, 1, 'old text')
+        manifest.record('https://ugra-news.ru/article/2/', 2, 'other text')
+        manifest.record(URL, 1, 'new text')
+        with open(self.path, 'a', encoding='utf-8') as file:
+            file.write('{"url": "https://ugra-news.ru/art')
+        restored = CrawlManifest(self.path)
+        self.assertEqual(2, len(restored))
+        self.assertEqual(3, restored.get_next_id())
+        self.assertTrue(restored.is_unchanged(URL, 'new text'))
+        self.assertFalse(restored.is_unchanged(URL, 'old text'))
+        self.assertTrue(restored.has_text('other text'))
+        self.assertEqual(2, len(self.path.read_text(encoding='utf-8').splitlines()))
+
+    @pytest.mark.lab_5_scraper
+    def test_articles_modified_since_fetch_day_are_stale(self) -> None:
+        """
+        Ensure a modification on the fetch day or later makes an article stale.
+        """
+        manifest = CrawlManifest(self.path)
+        manifest.record(URL, 1, 'text')
+        today = datetime.datetime.now(datetime.timezone.utc).date()
+        self.assertFalse(manifest.is_stale(URL, today - datetime.timedelta(days=1)))
+        self.assertTrue(manifest.is_stale(URL, today))
+        self.assertTrue(manifest.is_stale(URL, today + datetime.timedelta(days=1)))
+        self.assertFalse(manifest.is_stale('https://ugra-news.ru/article/2/', today))
+
+
+class IncrementalRecrawlTest(unittest.TestCase):
+    """
+    Class for testing recrawls that keep articles of previous runs.
+    """
+
+    def setUp(self) -> None:
+        """
+        Define start instructions for IncrementalRecrawlTest class.
+        """
+        TEST_PATH.mkdir(parents=True, exist_ok=True)
+        self.assets = TEST_PATH / 'articles'
+        self.assets_path = article.ASSETS_PATH
+        article.ASSETS_PATH = self.assets
+        self.assets_patch = mock.patch.object(scraper, 'ASSETS_PATH', self.assets)
+        self.manifest_patch = mock.patch.object(scraper_config, 'MANIFEST_PATH',
+                                                TEST_PATH / 'manifest.jsonl')
+        self.assets_patch.start()
+        self.manifest_patch.start()
+
+    def tearDown(self) -> None:
+        """
+        Define final instructions for IncrementalRecrawlTest class.
+        """
+        self.manifest_patch.stop()
+        self.assets_patch.stop()
+        article.ASSETS_PATH = self.assets_path
+        shutil.rmtree(TEST_PATH, ignore_errors=True)
+
+    def _run(self, num_articles: int) -> tuple[int, list[str]]:
+        """
+        Run an incremental crawl against the mock site.
+
+        Args:
+            num_articles (int): Number of articles to find
+
+        Returns:
+            tuple[int, list[str]]: Number of written articles and requested article urls
+        """
+        config = Config(CRAWLER_CONFIG_PATH)
+        config._storage.incremental_mode = True
+        config._num_articles = num_articles
+        config._crawling.sitemap_urls = []
+        config._init_services()
+        prepare_assets(config)
+        with mock.patch.object(scraper, 'make_request',
+                               side_effect=unique_site_page) as make_request:
+            saved = asyncio.run(scrape_async(config))
+        return saved, [call.args[0] for call in make_request.call_args_list
+                       if '/article/' in call.args[0]]
+
+    def _get_ids(self) -> list[int]:
+        """
+        Get ids of saved raw texts.
+
+        Returns:
+            list[int]: Sorted article ids
+        """
+        return sorted(int(path.name.split('_')[0]) for path in self.assets.glob('*_raw.txt'))
+
+    @pytest.mark.lab_5_scraper
+    def test_recrawl_fetches_and_appends_only_new_articles(self) -> None:
+        """
+        Ensure a second run skips known urls and continues ids without gaps.
+        """
+        saved, requested = self._run(4)
+        self.assertEqual(4, saved)
+        self.assertEqual([1, 2, 3, 4], self._get_ids())
+        saved, requested_again = self._run(3)
+        self.assertEqual(3, saved)
+        self.assertFalse(set(requested) & set(requested_again))
+        self.assertEqual(list(range(1, 8)), self._get_ids())
+        self.assertEqual(7, len(CrawlManifest(TEST_PATH / 'manifest.jsonl')))
+
+    @pytest.mark.lab_5_scraper
+    def test_files_of_an_interrupted_run_are_removed(self) -> None:
+        """
+        Ensure files written after the last manifest record are removed before a run.
+        """
+        self._run(2)
+        (self.assets / '3_raw.txt').write_text('torn', encoding='utf-8')
+        config = Config(CRAWLER_CONFIG_PATH)
+        config._storage.incremental_mode = True
+        config._init_services()
+        prepare_assets(config)
+        self.assertEqual([1, 2], self._get_ids())
+
+    @pytest.mark.lab_5_scraper
+    def test_known_article_keeps_its_id_and_is_rewritten_only_if_changed(self) -> None:
+        """
+        Ensure an unchanged known article is skipped and a changed one keeps its id.
+        """
+        config = Config(CRAWLER_CONFIG_PATH)
+        config._storage.incremental_mode = True
+        manifest = config.get_manifest()
+        assert manifest is not None
+        manifest.record('https://ugra-news.ru/article/0/', 1, 'first')
+        manifest.record(URL, 2, 'text')
+        known = Article(URL, 10)
+        known.text = 'text'
+        self.assertFalse(accept_article(known, config, 0))
+        known.text = 'edited text'
+        self.assertTrue(accept_article(known, config, 0))
+        self.assertEqual(2, known.article_id)
+        new = Article('https://ugra-news.ru/article/new/', 10)
+        new.text = 'fresh text'
+        self.assertTrue(accept_article(new, config, 0))
+        self.assertEqual(3, new.article_id)
@@ -0,0 +1,88 @@
+"""
+Crawl metrics validation.
+"""
+
+import json
+import shutil
+import threading
+import unittest
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+from admin_utils.test_params import TEST_PATH
+from lab_5_scraper.http_session import SessionPool
+from lab_5_scraper.metrics import LatencyHistogram, ScrapeMetrics
+from lab_5_scraper.tests.http_session_test import KeepAliveHandler
+
+
+class ScrapeMetricsTest(unittest.TestCase):
+    """
+    Class for testing ScrapeMetrics functionality.
+    """
+
+    def tearDown(self) -> None:
+        """
+        Define final instructions for ScrapeMetricsTest class.
+        """
+        shutil.rmtree(TEST_PATH, ignore_errors=True)
+
+    @pytest.mark.lab_5_scraper
+    def test_histogram_estimates_percentiles(self) -> None:
+        """
+        Ensure percentiles are reported by the upper bound of their bucket.
+        """
+        histogram = LatencyHistogram()
+        for _ in range(90):
+            histogram.observe(0.004)
+        for _ in range(10):
+            histogram.observe(0.3)
+        summary = histogram.get_summary()
+        self.assertEqual(100, summary['count'])
+        self.assertEqual(5, summary['p50_ms'])
+        self.assertEqual(5, summary['p90_ms'])
+        self.assertEqual(300, summary['p99_ms'])
+        self.assertEqual({'<=5ms': 90, '<=500ms': 10}, summary['buckets'])
+
+    @pytest.mark.lab_5_scraper
+    def test_report_keeps_statuses_and_slowest_pages(self) -> None:
+        """
+        Ensure the JSON report counts status codes and lists the slowest pages first.
+        """
+        metrics = ScrapeMetrics()
+        for idx in range(15):
+            metrics.record_response(f'https://ugra-news.ru/article/{idx}/', 200, idx / 100)
+        metrics.record_response('https://ugra-news.ru/article/404/', 404, 0.001)
+        metrics.add_article()
+        metrics.save_report(TEST_PATH / 'metrics.json')
+        with open(TEST_PATH / 'metrics.json', encoding='utf-8') as file:
+            report = json.load(file)
+        self.assertEqual({'200': 15, '404': 1}, report['status_codes'])
+        self.assertEqual(10, len(report['slowest_pages']))
+        self.assertEqual('https://ugra-news.ru/article/14/', report['slowest_pages'][0]['url'])
+        self.assertEqual(16, report['phases']['request']['count'])
+        self.assertEqual(1, report['articles'])
+
+    @pytest.mark.lab_5_scraper
+    def test_session_pool_reports_network_phases(self) -> None:
+        """
+        Ensure a new connection is timed once while every request is timed and counted.
+        """
+        server = ThreadingHTTPServer(('127.0.0.1', 0), KeepAliveHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        metrics = ScrapeMetrics()
+        pool = SessionPool({}, pool_size=1, keep_alive=True, max_retries=0, metrics=metrics)
+        try:
+            for _ in range(3):
+                pool.get(f'http://127.0.0.1:{server.server_port}/', timeout=5)
+        finally:
+            pool.close()
+            server.shutdown()
+            server.server_close()
+        phases = metrics.get_report()['phases']
+        self.assertEqual(1, phases['dns']['count'])
+        self.assertEqual(1, phases['connect']['count'])
+        self.assertEqual(3, phases['ttfb']['count'])
+        self.assertEqual(3, phases['download']['count'])
+        self.assertEqual(3 * len(b'<html><body>ok</body></html>'),
+                         metrics.get_report()['bytes_received'])
@@ -0,0 +1,82 @@
+"""
+Mock news site validation.
+"""
+
+# pylint: disable=protected-access
+import shutil
+import threading
+import unittest
+from unittest import mock
+
+import pytest
+
+from admin_utils.test_params import TEST_PATH
+from lab_5_scraper import scraper
+from lab_5_scraper.benchmarks.crawl_benchmark import build_config
+from lab_5_scraper.benchmarks.mock_site import create_server, MockNewsSite
+from lab_5_scraper.scraper import Crawler, CrawlerRecursive, HTMLParser
+
+
+class MockSiteTest(unittest.TestCase):
+    """
+    Class for testing crawlers against a local mock of the news site.
+    """
+
+    def setUp(self) -> None:
+        """
+        Define start instructions for MockSiteTest class.
+        """
+        TEST_PATH.mkdir(parents=True, exist_ok=True)
+        self.assets_patch = mock.patch.object(scraper, 'ASSETS_PATH', TEST_PATH / 'articles')
+        self.assets_patch.start()
+        self.site = MockNewsSite(45, page_size=3)
+        self.server = create_server(self.site)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.config = build_config(self.site, f'http://127.0.0.1:{self.server.server_port}')
+
+    def tearDown(self) -> None:
+        """
+        Define final instructions for MockSiteTest class.
+        """
+        self.config.get_session_pool().close()
+        self.server.shutdown()
+        self.server.server_close()
+        self.assets_patch.stop()
+        shutil.rmtree(TEST_PATH, ignore_errors=True)
+
+    @pytest.mark.lab_5_scraper
+    def test_crawlers_find_every_article(self) -> None:
+        """
+        Ensure paginated rubrics and links between articles lead to every article.
+        """
+        expected = {self.site.get_article_url(number) for number in range(1, 46)}
+        crawler = Crawler(self.config)
+        crawler.find_articles()
+        self.assertEqual(expected, set(crawler.urls))
+        self.assertEqual(45, len(crawler.urls))
+        recursive_crawler = CrawlerRecursive(self.config)
+        recursive_crawler.find_articles()
+        self.assertEqual(expected, set(recursive_crawler.urls))
+
+    @pytest.mark.lab_5_scraper
+    def test_parsed_article_matches_generated_one(self) -> None:
+        """
+        Ensure an article page served by the mock site is parsed into its fields.
+        """
+        expected = self.site.get_article(7)
+        parsed = HTMLParser(self.site.get_article_url(7), 7, self.config).parse()
+        self.assertEqual(expected['title'], parsed.title)
+        self.assertEqual([expected['author']], parsed.author)
+        self.assertEqual(expected['topics'], parsed.topics)
+        self.assertTrue(parsed.text.startswith(expected['paragraphs'][0]))
+        self.assertEqual(self.site.get_article_url(7), parsed.url)
+
+    @pytest.mark.lab_5_scraper
+    def test_unknown_pages_and_failures_are_served_as_errors(self) -> None:
+        """
+        Ensure unknown pages answer 404 and the error rate answers 503.
+        """
+        self.assertEqual(404, self.site.handle('/article/sport-7/')[0])
+        self.assertEqual(404, self.site.handle('/article/politics-46/')[0])
+        failing = MockNewsSite(10, error_rate=1.0)
+        self.assertEqual(503, failing.handle('/')[0])
@@ -0,0 +1,110 @@
+"""
+Rate limiter validation.
+"""
+
+import time
+import unittest
+
+import pytest
+
+from lab_5_scraper.rate_limiter import (
+    RateLimiter,
+    SLOW_RESPONSES_TO_BACK_OFF,
+    SLOWEST_RATE,
+    TokenBucket,
+)
+
+URL = 'https://ugra-news.ru/article/1/'
+
+
+class RateLimiterTest(unittest.TestCase):
+    """
+    Class for testing RateLimiter functionality.
+    """
+
+    @pytest.mark.lab_5_scraper
+    def test_token_bucket_allows_burst_then_waits(self) -> None:
+        """
+        Ensure a full bucket lets a burst through and then spaces requests by the rate.
+        """
+        bucket = TokenBucket(rate=10, capacity=2)
+        self.assertEqual(0.0, bucket.reserve())
+        self.assertEqual(0.0, bucket.reserve())
+        self.assertAlmostEqual(0.1, bucket.reserve(), places=2)
+        self.assertAlmostEqual(0.2, bucket.reserve(), places=2)
+
+    @pytest.mark.lab_5_scraper
+    def test_rate_limiter_paces_requests(self) -> None:
+        """
+        Ensure acquire() blocks for as long as the budget requires.
+        """
+        limiter = RateLimiter(requests_per_second=20, burst_size=1)
+        start = time.monotonic()
+        for _ in range(5):
+            limiter.acquire(URL)
+        self.assertGreaterEqual(time.monotonic() - start, 0.19)
+
+    @pytest.mark.lab_5_scraper
+    def test_disabled_rate_limiter_never_waits(self) -> None:
+        """
+        Ensure zero rate disables limiting.
+        """
+        limiter = RateLimiter(requests_per_second=0, burst_size=1)
+        start = time.monotonic()
+        for _ in range(100):
+            limiter.acquire(URL)
+        self.assertLess(time.monotonic() - start, 0.05)
+
+    @pytest.mark.lab_5_scraper
+    def test_rate_limiter_backs_off_and_recovers(self) -> None:
+        """
+        Ensure the rate is halved on 429 and grows back up to the budget on success.
+        """
+        limiter = RateLimiter(requests_per_second=4, burst_size=1)
+        limiter.record(URL, 200, 0.1)
+        self.assertEqual(4, limiter.get_rate(URL))
+        limiter.record(URL, 429, 0.1)
+        self.assertEqual(2, limiter.get_rate(URL))
+        limiter.record(URL, 503, 0.1)
+        self.assertEqual(1, limiter.get_rate(URL))
+        for _ in range(50):
+            limiter.record(URL, 200, 0.1)
+        self.assertEqual(4, limiter.get_rate(URL))
+
+    @pytest.mark.lab_5_scraper
+    def test_rate_limiter_backs_off_on_sustained_latency_only(self) -> None:
+        """
+        Ensure a single slow response is ignored and slow responses in a row slow the host down.
+        """
+        limiter = RateLimiter(requests_per_second=4, burst_size=1)
+        for _ in range(5):
+            limiter.record(URL, 200, 0.1)
+        limiter.record(URL, 200, 1.0)
+        self.assertEqual(4, limiter.get_rate(URL))
+        for _ in range(5):
+            limiter.record(URL, 200, 0.1)
+        for _ in range(SLOW_RESPONSES_TO_BACK_OFF):
+            limiter.record(URL, 200, 1.0)
+        self.assertEqual(2, limiter.get_rate(URL))
+
+    @pytest.mark.lab_5_scraper
+    def test_rate_limiter_never_backs_off_below_former_sleep(self) -> None:
+        """
+        Ensure backing off stops at the rate of the former 1-3 second sleep.
+        """
+        limiter = RateLimiter(requests_per_second=4, burst_size=1)
+        for _ in range(20):
+            limiter.record(URL, 503, 0.1)
+        self.assertAlmostEqual(SLOWEST_RATE, limiter.get_rate(URL))
+        slow_limiter = RateLimiter(requests_per_second=0.1, burst_size=1)
+        slow_limiter.record(URL, 429, 0.1)
+        self.assertAlmostEqual(0.1, slow_limiter.get_rate(URL))
+
+    @pytest.mark.lab_5_scraper
+    def test_non_adaptive_rate_limiter_keeps_rate(self) -> None:
+        """
+        Ensure server feedback is ignored when adaptation is disabled.
+        """
+        limiter = RateLimiter(requests_per_second=4, burst_size=1, adaptive=False)
+        limiter.record(URL, 429, 0.1)
+        self.assertEqual(4, limiter.get_rate(URL))
@@ -0,0 +1,254 @@
+"""
+Recursive crawler validation.
+"""
+
+# pylint: disable=protected-access
+import datetime
+import json
+import shutil
+import sys
+from unittest import mock
+
+import pytest
+import requests
+from bs4 import BeautifulSoup
+
+from admin_utils.test_params import SCRAPER_TEST_FILES_FOLDER, TEST_PATH
+from lab_5_scraper import scraper
+from lab_5_scraper.frontier import PriorityFrontier
+from lab_5_scraper.journal import CrawlJournal
+from lab_5_scraper.scraper import CrawlerRecursive
+from lab_5_scraper.scoring import find_date, LinkScorer
+from lab_5_scraper.tests.utils import build_response, ScraperTestCase
+
+
+def chained_page(url: str, *args: object) -> requests.models.Response:
+    """
+    Build a page linking to the next page of an endless chain.
+
+    Args:
+        url (str): Site url
+        *args (object): Ignored request arguments
+
+    Returns:
+        requests.models.Response: A response
+    """
+    number = int(url.rstrip('/').rsplit('/', 1)[-1]) if '/article/' in url else 0
+    links = (f'<a class="line-news" href="/article/{number + 1}/">next</a>'
+             f'<a class="news-card photo" href="/article/{max(number - 1, 1)}/">back</a>')
+    return build_response(url, f'<html><body>{links}</body></html>')
+
+
+def portal_page(url: str, *args: object) -> requests.models.Response:
+    """
+    Build a page of a site whose home page links to dead-end promo pages first.
+
+    Args:
+        url (str): Site url
+        *args (object): Ignored request arguments
+
+    Returns:
+        requests.models.Response: A response
+    """
+    if url.endswith('ugra-news.ru/'):
+        links = ''.join(f'<a class="line-news" href="/promo/{idx}/">promo</a>' for idx in range(10))
+        links += '<a class="news-card photo" href="/article/0/">news</a>'
+    elif '/article/' in url:
+        number = int(url.rstrip('/').rsplit('/', 1)[-1])
+        links = ''.join(f'<a class="line-news" href="/article/{3 * number + idx}/">news</a>'
+                        for idx in (1, 2, 3))
+    else:
+        links = ''
+    return build_response(url, f'<html><body>{links}</body></html>')
+
+
+class CrawlerRecursiveTest(ScraperTestCase):
+    """
+    Class for testing CrawlerRecursive functionality.
+    """
+
+    @pytest.mark.lab_5_scraper
+    def test_frontier_keeps_order_and_skips_known_urls(self) -> None:
+        """
+        Ensure urls of equal priority are first-in first-out and never queued twice.
+        """
+        frontier = PriorityFrontier(seen=['https://ugra-news.ru'])
+        self.assertFalse(frontier.push('https://ugra-news.ru'))
+        self.assertTrue(frontier.push('https://ugra-news.ru/article/1/'))
+        self.assertTrue(frontier.push('https://ugra-news.ru/article/2/'))
+        self.assertFalse(frontier.push('https://ugra-news.ru/article/1/'))
+        self.assertEqual(2, len(frontier))
+        self.assertEqual('https://ugra-news.ru/article/1/', frontier.pop())
+        self.assertFalse(frontier.push('https://ugra-news.ru/article/1/'))
+        self.assertIn('https://ugra-news.ru/article/1/', frontier)
+
+    @pytest.mark.lab_5_scraper
+    def test_priority_frontier_gives_out_best_urls_first(self) -> None:
+        """
+        Ensure urls come out by priority, ties in push order, and are never queued twice.
+        """
+        frontier = PriorityFrontier(seen=['https://ugra-news.ru/'])
+        self.assertFalse(frontier.push('https://ugra-news.ru/', 10))
+        for url, priority in (('low', 1), ('first', 5), ('second', 5), ('high', 9)):
+            self.assertTrue(frontier.push(url, priority))
+        self.assertFalse(frontier.push('low', 100))
+        self.assertEqual(['high', 'first', 'second', 'low'],
+                         [frontier.pop() for _ in range(len(frontier))])
+
+    @pytest.mark.lab_5_scraper
+    def test_stale_priorities_are_rescored_on_pop(self) -> None:
+        """
+        Ensure a url whose priority fell while waiting comes out after better ones.
+        """
+        scores = {'sport': 9, 'culture': 5, 'economy': 1}
+        frontier = PriorityFrontier()
+        for url, priority in scores.items():
+            frontier.push(url, priority)
+        scores['sport'] = 3
+        self.assertEqual(['culture', 'sport', 'economy'],
+                         [frontier.pop(scores.__getitem__) for _ in range(len(frontier))])
+
+    @pytest.mark.lab_5_scraper
+    def test_links_are_scored_by_every_signal(self) -> None:
+        """
+        Ensure articles, fresh dates, rare rubrics and shallow pages score higher.
+        """
+        today = datetime.date(2025, 4, 12)
+        scorer = LinkScorer({}, ['https://ugra-news.ru/article'], today)
+        article = 'https://ugra-news.ru/article/1/'
+        self.assertGreater(scorer.score(article, 1), scorer.score('https://ugra-news.ru/tags/', 1))
+        self.assertGreater(scorer.score(article, 1, published=today),
+                           scorer.score(article, 1, published=today - datetime.timedelta(30)))
+        self.assertGreater(scorer.score(article, 1), scorer.score(article, 5))
+        scorer.add_collected('sport')
+        self.assertGreater(scorer.score(article, 1, 'culture'), scorer.score(article, 1, 'sport'))
+        self.assertEqual(today, find_date('Опубликовано 12 апреля 2025 14:30'))
+        self.assertEqual(today, find_date('https://ugra-news.ru/2025/04/12/news/'))
+        self.assertIsNone(find_date('31 февраля 2025'))
+
+    @pytest.mark.lab_5_scraper
+    def test_scored_crawl_reaches_budget_in_fewer_fetches(self) -> None:
+        """
+        Ensure article links are visited before dead ends found earlier.
+        """
+        self.config._num_articles = 30
+        fetches = {}
+        for name, weights in (('fifo', {'article': 0, 'freshness': 0, 'rubric': 0, 'depth': 0}),
+                              ('scored', {})):
+            self.config._crawling.frontier_weights = weights
+            with mock.patch.object(scraper, 'make_request', side_effect=portal_page) as request:
+                crawler = CrawlerRecursive(self.config)
+                crawler.find_articles()
+            shutil.rmtree(TEST_PATH, ignore_errors=True)
+            self.assertGreaterEqual(len(crawler.urls), 30)
+            fetches[name] = request.call_count
+        self.assertLess(fetches['scored'], fetches['fifo'] - 5)
+
+    @pytest.mark.lab_5_scraper
+    def test_only_article_urls_count_toward_budget(self) -> None:
+        """
+        Ensure links to pages other than articles do not use up the number of articles.
+        """
+        self.config._num_articles = 5
+        with mock.patch.object(scraper, 'make_request', side_effect=portal_page):
+            crawler = CrawlerRecursive(self.config)
+            crawler.find_articles()
+        articles = list(filter(crawler.is_article_url, crawler.urls))
+        self.assertGreaterEqual(len(articles), 5)
+
+    @pytest.mark.lab_5_scraper
+    def test_deep_crawl_does_not_recurse(self) -> None:
+        """
+        Ensure a chain deeper than the recursion limit is crawled without duplicates.
+        """
+        depth = sys.getrecursionlimit() + 200
+        self.config._num_articles = depth
+        with mock.patch.object(scraper, 'make_request', side_effect=chained_page):
+            crawler = CrawlerRecursive(self.config)
+            crawler.find_articles()
+        self.assertEqual(depth, len(crawler.urls))
+        self.assertEqual(len(crawler.urls), len(set(crawler.urls)))
+        self.assertEqual(len(crawler.visited_urls), len(set(crawler.visited_urls)))
+
+    @pytest.mark.lab_5_scraper
+    def test_crawl_resumes_from_cache(self) -> None:
+        """
+        Ensure a new crawler continues from urls collected by the previous one.
+        """
+        self.config._num_articles = 5
+        with mock.patch.object(scraper, 'make_request', side_effect=chained_page):
+            CrawlerRecursive(self.config).find_articles()
+            self.config._num_articles = 10
+            crawler = CrawlerRecursive(self.config)
+            self.assertEqual(5, len(crawler.urls))
+            crawler.find_articles()
+        self.assertEqual([f'https://ugra-news.ru/article/{idx}/' for idx in range(1, 11)],
+                         crawler.urls)
+        self.assertEqual(len(crawler.visited_urls), len(set(crawler.visited_urls)))
+
+    @pytest.mark.lab_5_scraper
+    def test_links_inside_article_text_are_collected(self) -> None:
+        """
+        Ensure article links from the text and every news block are collected.
+        """
+        html = (SCRAPER_TEST_FILES_FOLDER / 'article.html').read_text(encoding='utf-8')
+        crawler = CrawlerRecursive(self.config)
+        crawler._extract_urls(BeautifulSoup(html, 'lxml'))
+        self.assertEqual(5, len(crawler.urls))
+        self.assertIn('https://ugra-news.ru/article/v_surgute_otkryli_shkolu/', crawler.urls)
+
+    @pytest.mark.lab_5_scraper
+    def test_journal_replays_log_after_crash(self) -> None:
+        """
+        Ensure state is restored from the snapshot and the log, skipping a torn line.
+        """
+        journal = CrawlJournal(TEST_PATH / 'cache.json', compact_every=2)
+        journal.append(['a', 'b'], ['start'])
+        journal.append(['c'], ['a'])
+        self.assertTrue(journal.should_compact())
+        journal.compact(['a', 'b', 'c'], ['start', 'a'])
+        self.assertEqual(0, journal.log_path.stat().st_size)
+        journal.append(['d', 'a'], ['b'])
+        with open(journal.log_path, 'a', encoding='utf-8') as file:
+            file.write('{"collected": ["e"], "vis')
+
+        collected, visited = CrawlJournal(TEST_PATH / 'cache.json').load()
+        self.assertEqual(['a', 'b', 'c', 'd'], collected)
+        self.assertEqual(['start', 'a', 'b'], visited)
+
+    @pytest.mark.lab_5_scraper
+    def test_journal_appends_after_torn_line_on_resume(self) -> None:
+        """
+        Ensure entries appended after resuming from a torn log are read back.
+        """
+        journal = CrawlJournal(TEST_PATH / 'cache.json', compact_every=3)
+        journal.append(['a'], ['start'])
+        with open(journal.log_path, 'a', encoding='utf-8') as file:
+            file.write('{"collected": ["b"], "vis')
+
+        resumed = CrawlJournal(TEST_PATH / 'cache.json', compact_every=3)
+        self.assertEqual((['a'], ['start']), resumed.load())
+        self.assertFalse(resumed.should_compact())
+        resumed.append(['c'], ['a'])
+        resumed.append(['d'], ['c'])
+        self.assertTrue(resumed.should_compact())
+
+        collected, visited = CrawlJournal(TEST_PATH / 'cache.json').load()
+        self.assertEqual(['a', 'c', 'd'], collected)
+        self.assertEqual(['start', 'a', 'c'], visited)
+
+    @pytest.mark.lab_5_scraper
+    def test_crawl_writes_only_new_urls_per_page(self) -> None:
+        """
+        Ensure every visited page logs one line with the urls it added.
+        """
+        self.config._num_articles = 4
+        with mock.patch.object(scraper, 'make_request', side_effect=chained_page), \
+                mock.patch.object(CrawlJournal, 'compact'):
+            crawler = CrawlerRecursive(self.config)
+            crawler.find_articles()
+        with open(crawler._journal.log_path, encoding='utf-8') as file:
+            entries = [json.loads(line) for line in file]
+        self.assertEqual([[url] for url in crawler.visited_urls],
+                         [entry['visited'] for entry in entries])
+        self.assertEqual(crawler.urls, [url for entry in entries for url in entry['collected']])
@@ -0,0 +1,134 @@
+"""
+Retries and circuit breaker validation.
+"""
+
+# pylint: disable=protected-access
+import time
+import unittest
+from unittest import mock
+
+import pytest
+import requests
+
+from core_utils.constants import CRAWLER_CONFIG_PATH
+from lab_5_scraper.resilience import CircuitBreaker, RetryPolicy
+from lab_5_scraper.scraper import Config, make_request
+from lab_5_scraper.tests.utils import build_response
+
+URL = 'https://ugra-news.ru/article/1/'
+
+
+class RetryPolicyTest(unittest.TestCase):
+    """
+    Class for testing RetryPolicy functionality.
+    """
+
+    @pytest.mark.lab_5_scraper
+    def test_delays_are_jittered_within_exponential_bounds(self) -> None:
+        """
+        Ensure delays never exceed the exponential bound and the maximum delay.
+        """
+        policy = RetryPolicy(max_retries=5, backoff_factor=0.5, max_delay=3)
+        for attempt, bound in enumerate((0.5, 1, 2, 3, 3)):
+            delays = [policy.get_delay(attempt) for _ in range(200)]
+            self.assertTrue(all(0 <= delay <= bound for delay in delays))
+            self.assertGreater(len(set(delays)), 1)
+
+    @pytest.mark.lab_5_scraper
+    def test_retry_after_header_is_respected(self) -> None:
+        """
+        Ensure the server's Retry-After header sets the lower bound of the delay.
+        """
+        policy = RetryPolicy(max_retries=1, backoff_factor=0.1, max_delay=30)
+        response = build_response(URL, '', 429)
+        response.headers['Retry-After'] = '7'
+        self.assertEqual(7, policy.get_delay(0, response))
+
+
+class CircuitBreakerTest(unittest.TestCase):
+    """
+    Class for testing CircuitBreaker functionality.
+    """
+
+    @pytest.mark.lab_5_scraper
+    def test_circuit_opens_and_lets_one_probe_through(self) -> None:
+        """
+        Ensure the circuit opens after consecutive failures and closes after a probe succeeds.
+        """
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.05)
+        breaker.record_failure(URL)
+        self.assertTrue(breaker.allow(URL))
+        breaker.record_failure(URL)
+        self.assertFalse(breaker.allow('https://UGRA-NEWS.ru/article/2/'))
+        self.assertTrue(breaker.allow('https://example.com/'))
+        time.sleep(0.06)
+        self.assertTrue(breaker.allow(URL))
+        self.assertFalse(breaker.allow(URL))
+        breaker.record_success(URL)
+        self.assertFalse(breaker.is_open(URL))
+        self.assertTrue(breaker.allow(URL))
+
+    @pytest.mark.lab_5_scraper
+    def test_failed_probe_opens_circuit_again(self) -> None:
+        """
+        Ensure a failing probe request opens the circuit for another timeout.
+        """
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+        breaker.record_failure(URL)
+        time.sleep(0.06)
+        self.assertTrue(breaker.allow(URL))
+        breaker.record_failure(URL)
+        self.assertFalse(breaker.allow(URL))
+
+
+class ResilientRequestTest(unittest.TestCase):
+    """
+    Class for testing retries of make_request.
+    """
+
+    def setUp(self) -> None:
+        """
+        Define start instructions for ResilientRequestTest class.
+        """
+        self.config = Config(CRAWLER_CONFIG_PATH)
+        self.config._storage.use_http_cache = False
+        guards = self.config.get_request_guards()
+        guards.rate_limiter._max_rate = 0
+        guards.retry_policy = RetryPolicy(max_retries=2, backoff_factor=0)
+        guards.circuit_breaker = CircuitBreaker(failure_threshold=3, reset_timeout=60)
+
+    @pytest.mark.lab_5_scraper
+    def test_transient_failures_are_retried(self) -> None:
+        """
+        Ensure timeouts and 503 responses are retried until the page arrives.
+        """
+        responses = [requests.exceptions.Timeout(), build_response(URL, '', 503),
+                     build_response(URL, '<html>ok</html>')]
+        with mock.patch.object(self.config.get_session_pool(), 'get',
+                               side_effect=responses) as get:
+            response = make_request(URL, self.config)
+        self.assertEqual(3, get.call_count)
+        self.assertEqual(200, response.status_code)
+        self.assertFalse(self.config.get_request_guards().circuit_breaker.is_open(URL))
+
+    @pytest.mark.lab_5_scraper
+    def test_open_circuit_fails_fast(self) -> None:
+        """
+        Ensure a host failing every attempt opens its circuit and is not requested again.
+        """
+        with mock.patch.object(self.config.get_session_pool(), 'get',
+                               side_effect=requests.exceptions.ConnectionError()) as get:
+            self.assertEqual(503, make_request(URL, self.config).status_code)
+            self.assertEqual(503, make_request(URL, self.config).status_code)
+        self.assertEqual(3, get.call_count)
+        self.assertTrue(self.config.get_request_guards().circuit_breaker.is_open(URL))
+
+    @pytest.mark.lab_5_scraper
+    def test_client_errors_are_not_retried(self) -> None:
+        """
+        Ensure a 404 response is returned at once.
+        """
+        with mock.patch.object(self.config.get_session_pool(), 'get',
+                               return_value=build_response(URL, '', 404)) as get:
+            self.assertEqual(404, make_request(URL, self.config).status_code)
+        self.assertEqual(1, get.call_count)
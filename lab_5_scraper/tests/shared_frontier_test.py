@@ -0,0 +1,173 @@
+"""
+Shared frontier validation.
+"""
+
+# pylint: disable=protected-access
+import shutil
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import pytest
+import requests
+
+from admin_utils.test_params import TEST_PATH
+from core_utils.constants import CRAWLER_CONFIG_PATH
+from lab_5_scraper import config as scraper_config
+from lab_5_scraper import scraper, shared_frontier
+from lab_5_scraper.scraper import Config, CrawlerRecursive, prepare_assets
+from lab_5_scraper.shared_frontier import SharedFrontier
+from lab_5_scraper.tests.utils import build_response
+
+
+def tree_page(url: str, *args: object) -> requests.models.Response:
+    """
+    Build a page linking to two child pages of an endless binary tree.
+
+    Args:
+        url (str): Site url
+        *args (object): Ignored request arguments
+
+    Returns:
+        requests.models.Response: A response
+    """
+    number = int(url.rstrip('/').rsplit('/', 1)[-1]) if '/article/' in url else 0
+    time.sleep(0.01)
+    links = ''.join(f'<a class="line-news" href="/article/{child}/">child</a>'
+                    for child in (2 * number + 1, 2 * number + 2))
+    return build_response(url, f'<html><body>{links}</body></html>')
+
+
+class SharedFrontierTest(unittest.TestCase):
+    """
+    Class for testing SharedFrontier functionality.
+    """
+
+    def setUp(self) -> None:
+        """
+        Define start instructions for SharedFrontierTest class.
+        """
+        TEST_PATH.mkdir(parents=True, exist_ok=True)
+        self.path = TEST_PATH / 'frontier.sqlite'
+
+    def tearDown(self) -> None:
+        """
+        Define final instructions for SharedFrontierTest class.
+        """
+        shutil.rmtree(TEST_PATH, ignore_errors=True)
+
+    @pytest.mark.lab_5_scraper
+    def test_urls_are_added_once_and_within_the_limit(self) -> None:
+        """
+        Ensure known urls are skipped and collected urls never exceed the limit.
+        """
+        first, second = SharedFrontier(self.path), SharedFrontier(self.path)
+        self.assertEqual(['start'], first.add(['start'], collect=False))
+        self.assertEqual(['a', 'b'], first.add(['a', 'b', 'a'], limit=3))
+        self.assertEqual(['c'], second.add(['b', 'c', 'd'], limit=3))
+        self.assertEqual(3, first.count_collected())
+        self.assertEqual(['a', 'b', 'c'], second.get_collected())
+        first.close()
+        second.close()
+
+    @pytest.mark.lab_5_scraper
+    def test_abandoned_lease_is_reclaimed(self) -> None:
+        """
+        Ensure a url is leased to one worker and reclaimed by another once the lease expires.
+        """
+        crashed = SharedFrontier(self.path, lease_seconds=0.2)
+        alive = SharedFrontier(self.path, lease_seconds=0.2)
+        crashed.add(['a', 'b'])
+        self.assertEqual('a', crashed.claim('crashed'))
+        self.assertEqual('b', alive.claim('alive'))
+        self.assertIsNone(alive.claim('alive'))
+        self.assertTrue(alive.complete('b', 'alive'))
+        self.assertEqual('a', alive.claim('alive', wait=True))
+        self.assertFalse(crashed.complete('a', 'crashed'))
+        self.assertEqual(['b'], crashed.get_visited())
+        self.assertTrue(alive.complete('a', 'alive'))
+        self.assertIsNone(alive.claim('alive', wait=True))
+        self.assertEqual(['a', 'b'], crashed.get_visited())
+        crashed.close()
+        alive.close()
+
+    @pytest.mark.lab_5_scraper
+    def test_failed_write_leaves_no_gap_in_ids(self) -> None:
+        """
+        Ensure an id is spent only once its article is written.
+        """
+        crashed, alive = SharedFrontier(self.path), SharedFrontier(self.path)
+        written = []
+
+        def fail(article_id: int) -> None:
+            raise OSError(f'worker died writing {article_id}')
+
+        with self.assertRaises(OSError):
+            crashed.write_next(fail)
+        self.assertEqual(1, alive.write_next(written.append))
+        self.assertEqual(2, crashed.write_next(written.append))
+        self.assertEqual([1, 2], written)
+        crashed.close()
+        alive.close()
+
+
+class SharedCrawlTest(unittest.TestCase):
+    """
+    Class for testing recursive crawlers sharing a frontier.
+    """
+
+    def setUp(self) -> None:
+        """
+        Define start instructions for SharedCrawlTest class.
+        """
+        TEST_PATH.mkdir(parents=True, exist_ok=True)
+        self.patches = [mock.patch.object(scraper, 'ASSETS_PATH', TEST_PATH / 'articles'),
+                        mock.patch.object(scraper_config, 'FRONTIER_PATH',
+                                          TEST_PATH / 'frontier.sqlite'),
+                        mock.patch.object(scraper, 'make_request', side_effect=tree_page),
+                        mock.patch.object(shared_frontier, 'CLAIM_INTERVAL', 0.01)]
+        for patch in self.patches:
+            patch.start()
+
+    def tearDown(self) -> None:
+        """
+        Define final instructions for SharedCrawlTest class.
+        """
+        for patch in reversed(self.patches):
+            patch.stop()
+        shutil.rmtree(TEST_PATH, ignore_errors=True)
+
+    def _crawl(self) -> CrawlerRecursive:
+        """
+        Run a worker with its own configuration and connection.
+
+        Returns:
+            CrawlerRecursive: Finished crawler
+        """
+        config = Config(CRAWLER_CONFIG_PATH)
+        config._crawling.shared_frontier = True
+        config._num_articles = 40
+        config._init_services()
+        prepare_assets(config)
+        crawler = CrawlerRecursive(config)
+        crawler.find_articles()
+        config.get_frontier_store().close()
+        return crawler
+
+    @pytest.mark.lab_5_scraper
+    def test_workers_split_pages_and_the_budget(self) -> None:
+        """
+        Ensure concurrent workers visit every page once and collect exactly the budget.
+        """
+        (TEST_PATH / 'articles').mkdir(parents=True)
+        (TEST_PATH / 'articles' / 'stale_raw.txt').touch()
+        with ThreadPoolExecutor(4) as executor:
+            crawlers = list(executor.map(lambda _: self._crawl(), range(4)))
+        collected = [url for crawler in crawlers for url in crawler.urls]
+        visited = [url for crawler in crawlers for url in crawler.visited_urls]
+        self.assertEqual(40, len(collected))
+        self.assertEqual(len(collected), len(set(collected)))
+        self.assertEqual(len(visited), len(set(visited)))
+        self.assertGreater(sum(bool(crawler.visited_urls) for crawler in crawlers), 1)
+        self.assertFalse((TEST_PATH / 'articles' / 'stale_raw.txt').exists())
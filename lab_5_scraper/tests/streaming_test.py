@@ -0,0 +1,208 @@
+"""
+Streamed download of article pages validation.
+"""
+
+# pylint: disable=protected-access
+import shutil
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+import pytest
+
+from admin_utils.test_params import SCRAPER_TEST_FILES_FOLDER, TEST_PATH
+from core_utils.constants import CRAWLER_CONFIG_PATH
+from lab_5_scraper import config as scraper_config
+from lab_5_scraper.extraction import ArticleStreamParser, ExtractionRules
+from lab_5_scraper.scraper import Config, HTMLParser, make_request
+
+ARTICLE_HTML = (SCRAPER_TEST_FILES_FOLDER / 'article.html').read_bytes()
+
+GALLERY = b''.join(b'<div class="gallery__item"><img src="/upload/%d.jpg"></div>' % idx
+                   for idx in range(50000))
+
+LARGE_ARTICLE_HTML = ARTICLE_HTML.replace(b'</body>', GALLERY + b'</body>')
+
+AUTHOR_START = ARTICLE_HTML.index(b'<div class="author-news__info-authors">')
+
+NO_AUTHOR_HTML = (ARTICLE_HTML[:AUTHOR_START] +
+                  ARTICLE_HTML[ARTICLE_HTML.index(b'</div>', AUTHOR_START) + len(b'</div>'):])
+
+
+class GalleryPageHandler(BaseHTTPRequestHandler):
+    """
+    Serve an article page followed by a large gallery.
+    """
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self) -> None:  # pylint: disable=invalid-name
+        """
+        Respond to a GET request.
+        """
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(LARGE_ARTICLE_HTML)))
+        self.end_headers()
+        try:
+            self.wfile.write(LARGE_ARTICLE_HTML)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_message(self, *args: object) -> None:
+        """
+        Keep test output clean.
+
+        Args:
+            *args (object): Ignored log arguments
+        """
+
+
+class ArticleStreamParserTest(unittest.TestCase):
+    """
+    Class for testing ArticleStreamParser functionality.
+    """
+
+    @pytest.mark.lab_5_scraper
+    def test_parser_completes_once_required_blocks_close(self) -> None:
+        """
+        Ensure the page is complete right after the article block and not before the text.
+        """
+        parser = ArticleStreamParser(encoding='utf-8')
+        text_end = ARTICLE_HTML.index(b'<div class="photo-report-detail-share-tags">')
+        tags_end = ARTICLE_HTML.index(b'</main>')
+        completed_at = None
+        for position in range(0, len(ARTICLE_HTML), 64):
+            if parser.feed(ARTICLE_HTML[position:position + 64]):
+                completed_at = position + 64
+                break
+        self.assertIsNotNone(completed_at)
+        self.assertGreater(completed_at, text_end)
+        self.assertLess(completed_at, tags_end + 128)
+
+    @pytest.mark.lab_5_scraper
+    def test_parser_never_completes_without_article_block(self) -> None:
+        """
+        Ensure pages lacking some field are downloaded in full.
+        """
+        parser = ArticleStreamParser(encoding='utf-8')
+        self.assertFalse(parser.feed(b'<html><body><div class="news-detail__detail-text">'
+                                     b'text</div></body></html>'))
+
+    @pytest.mark.lab_5_scraper
+    def test_page_without_author_is_cut_off_and_parsed_the_same(self) -> None:
+        """
+        Ensure a page lacking the author completes and gives the article of the full page.
+        """
+        parser = ArticleStreamParser(encoding='utf-8')
+        completed_at = None
+        for position in range(0, len(NO_AUTHOR_HTML), 64):
+            if parser.feed(NO_AUTHOR_HTML[position:position + 64]):
+                completed_at = position + 64
+                break
+        self.assertIsNotNone(completed_at)
+        self.assertLess(completed_at, len(NO_AUTHOR_HTML))
+        config = Config(CRAWLER_CONFIG_PATH)
+        url = 'https://ugra-news.ru/article/1/'
+        full = HTMLParser(url, 1, config).parse_html(NO_AUTHOR_HTML.decode('utf-8'))
+        streamed = HTMLParser(url, 1, config).parse_html(
+            NO_AUTHOR_HTML[:completed_at].decode('utf-8', errors='ignore'))
+        self.assertEqual(['NOT FOUND'], full.author)
+        self.assertEqual(vars(full), vars(streamed))
+
+    @pytest.mark.lab_5_scraper
+    def test_parser_completes_by_configured_rules(self) -> None:
+        """
+        Ensure the page is complete once the fields of the configured rules are read.
+        """
+        rules = ExtractionRules({'text': {'tag': 'article'},
+                                 'topics': {'tag': 'a', 'class': 'tag'}})
+        page = (b'<html><body><main><h1 class="title">Title</h1>'
+                b'<div class="author-news__info-authors">Author</div>'
+                b'<span class="author-news__info-text">12.04.2025</span>'
+                b'<article>Text</article><a class="tag" href="/tag/">Tag</a></main>')
+        self.assertFalse(ArticleStreamParser(encoding='utf-8').feed(page))
+        self.assertTrue(ArticleStreamParser(rules, 'utf-8').feed(page))
+
+
+class StreamedRequestTest(unittest.TestCase):
+    """
+    Class for testing streamed requests of article pages.
+    """
+
+    def setUp(self) -> None:
+        """
+        Define start instructions for StreamedRequestTest class.
+        """
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), GalleryPageHandler)
+        self.url = f'http://127.0.0.1:{self.server.server_port}/article/1/'
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.config = Config(CRAWLER_CONFIG_PATH)
+        self.config._storage.use_http_cache = False
+        self.config.get_request_guards().rate_limiter._max_rate = 0
+
+    def tearDown(self) -> None:
+        """
+        Define final instructions for StreamedRequestTest class.
+        """
+        self.config.get_session_pool().close()
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(TEST_PATH, ignore_errors=True)
+
+    @pytest.mark.lab_5_scraper
+    def test_streamed_article_is_cut_off_and_parsed_the_same(self) -> None:
+        """
+        Ensure only the head of a large page is downloaded and the article is the same.
+        """
+        self.config._processing.stream_article_pages = True
+        streamed = make_request(self.url, self.config, True)
+        report = self.config.get_metrics().get_report()
+        self.assertLess(len(streamed.content), len(LARGE_ARTICLE_HTML) // 10)
+        self.assertEqual(1, report['aborted_downloads'])
+        self.assertEqual(len(streamed.content), report['bytes_received'])
+        full = make_request(self.url, self.config)
+        self.assertEqual(len(LARGE_ARTICLE_HTML), len(full.content))
+        self.assertEqual(vars(HTMLParser(self.url, 1, self.config).parse_response(full)),
+                         vars(HTMLParser(self.url, 1, self.config).parse_response(streamed)))
+
+    @pytest.mark.lab_5_scraper
+    def test_article_pages_are_downloaded_in_full_when_streaming_is_off(self) -> None:
+        """
+        Ensure disabled streaming keeps the whole body.
+        """
+        self.config._processing.stream_article_pages = False
+        response = make_request(self.url, self.config, True)
+        self.assertEqual(LARGE_ARTICLE_HTML, response.content)
+
+    @pytest.mark.lab_5_scraper
+    def test_cut_off_pages_are_not_cached(self) -> None:
+        """
+        Ensure a cut off body never replaces the page in the HTTP cache.
+        """
+        self.config._processing.stream_article_pages = True
+        self.config._storage.use_http_cache = True
+        with mock.patch.object(scraper_config, 'HTTP_CACHE_PATH', TEST_PATH / 'http_cache'):
+            make_request(self.url, self.config, True)
+        cache = self.config.get_response_cache()
+        assert cache is not None
+        self.assertEqual({}, cache.get_conditional_headers(self.url))
+        self.assertFalse(any(path.is_file() for path in (TEST_PATH / 'http_cache').rglob('*')))
+
+    @pytest.mark.lab_5_scraper
+    def test_recorded_pages_are_downloaded_in_full(self) -> None:
+        """
+        Ensure the archive replays whole pages even when streaming is on.
+        """
+        self.config._processing.stream_article_pages = True
+        self.config._storage.archive_mode = 'record'
+        with mock.patch.object(scraper_config, 'ARCHIVE_PATH', TEST_PATH / 'crawl_archive.warc'):
+            response = make_request(self.url, self.config, True)
+        self.assertEqual(LARGE_ARTICLE_HTML, response.content)
+        archive = self.config.get_archive()
+        assert archive is not None
+        replayed = archive.replay(self.url)
+        self.assertIsNotNone(replayed)
+        assert replayed is not None
+        self.assertEqual(LARGE_ARTICLE_HTML, replayed.content)
@@ -0,0 +1,134 @@
+"""
+Url canonicalization and request coalescing validation.
+"""
+
+# pylint: disable=protected-access
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import pytest
+import requests
+
+from lab_5_scraper import scraper
+from lab_5_scraper.scraper import CrawlerRecursive, make_request
+from lab_5_scraper.tests.utils import build_response, ScraperTestCase
+from lab_5_scraper.urls import canonicalize_url, SingleFlight
+
+
+def aliased_page(url: str, *args: object) -> requests.models.Response:
+    """
+    Build a page linking to one article under several spellings of its url.
+
+    Args:
+        url (str): Site url
+        *args (object): Ignored request arguments
+
+    Returns:
+        requests.models.Response: A response
+    """
+    links = ('<a class="line-news" href="/article/forum">forum</a>'
+             '<a class="news-card photo" href="/article/forum/?utm_source=vk#comments">forum</a>'
+             '<a class="header__top-banner-item" href="HTTPS://UGRA-NEWS.RU:443/article/forum/">'
+             'forum</a>')
+    return build_response(url, f'<html><body>{links}</body></html>')
+
+
+class CanonicalizeUrlTest(unittest.TestCase):
+    """
+    Class for testing canonicalize_url functionality.
+    """
+
+    @pytest.mark.lab_5_scraper
+    def test_spellings_of_a_page_share_one_url(self) -> None:
+        """
+        Ensure case, ports, fragments, tracking parameters and slashes do not matter.
+        """
+        expected = 'https://ugra-news.ru/article/forum/'
+        for url in ('https://ugra-news.ru/article/forum/', 'HTTPS://Ugra-News.RU/article/forum',
+                    'https://ugra-news.ru:443/article/forum/#comments',
+                    'https://ugra-news.ru/article/forum/?utm_source=vk&utm_medium=social',
+                    'https://ugra-news.ru/article/forum/?yclid=123'):
+            self.assertEqual(expected, canonicalize_url(url))
+        self.assertEqual(expected, canonicalize_url('/article/forum', 'https://ugra-news.ru'))
+        self.assertEqual(expected, canonicalize_url('forum', 'https://ugra-news.ru/article/'))
+
+    @pytest.mark.lab_5_scraper
+    def test_meaningful_parts_are_kept(self) -> None:
+        """
+        Ensure paths keep their case, files keep no slash and pager parameters stay sorted.
+        """
+        self.assertEqual('https://ugra-news.ru/rubrics/society/?PAGEN_1=2&sort=date',
+                         canonicalize_url('https://ugra-news.ru/rubrics/society/'
+                                          '?sort=date&utm_campaign=x&PAGEN_1=2'))
+        self.assertEqual('https://ugra-news.ru/upload/Photo.JPG',
+                         canonicalize_url('https://ugra-news.ru/upload/Photo.JPG'))
+        self.assertEqual('http://127.0.0.1:8080/', canonicalize_url('http://127.0.0.1:8080'))
+        self.assertEqual('https://ugra-news.ru/', canonicalize_url('https://ugra-news.ru'))
+
+
+class SingleFlightTest(ScraperTestCase):
+    """
+    Class for testing coalescing of concurrent requests.
+    """
+
+    @pytest.mark.lab_5_scraper
+    def test_concurrent_calls_share_one_result(self) -> None:
+        """
+        Ensure only one of concurrent calls with the same key runs and errors reach everyone.
+        """
+        single_flight = SingleFlight()
+        calls = []
+        release = threading.Event()
+
+        def fetch(key: str) -> str:
+            calls.append(key)
+            release.wait(5)
+            if key == 'broken':
+                raise ValueError(key)
+            return key.upper()
+
+        with ThreadPoolExecutor(8) as executor:
+            pages = [executor.submit(single_flight.do, 'page', fetch, 'page') for _ in range(4)]
+            broken = [executor.submit(single_flight.do, 'broken', fetch, 'broken')
+                      for _ in range(4)]
+            time.sleep(0.1)
+            release.set()
+            self.assertEqual(['PAGE'] * 4, [future.result() for future in pages])
+            for future in broken:
+                self.assertRaises(ValueError, future.result)
+        self.assertEqual(['broken', 'page'], sorted(calls))
+        self.assertEqual('PAGE', single_flight.do('page', fetch, 'page'))
+        self.assertEqual(3, len(calls))
+
+    @pytest.mark.lab_5_scraper
+    def test_requests_of_one_canonical_url_are_sent_once(self) -> None:
+        """
+        Ensure concurrent requests of spellings of one url reach the network once.
+        """
+        def slow_page(url: str, *args: object) -> requests.models.Response:
+            time.sleep(0.2)
+            return build_response(url, '<html></html>')
+
+        urls = ['https://ugra-news.ru/article/forum', 'https://UGRA-NEWS.ru/article/forum/#top',
+                'https://ugra-news.ru/article/forum/?utm_source=vk']
+        with mock.patch.object(scraper, 'send_with_retries', side_effect=slow_page) as send, \
+                ThreadPoolExecutor(len(urls)) as executor:
+            responses = list(executor.map(lambda url: make_request(url, self.config), urls))
+        self.assertEqual(1, send.call_count)
+        self.assertTrue(all(response is responses[0] for response in responses))
+
+    @pytest.mark.lab_5_scraper
+    def test_recursive_crawler_collects_aliases_once(self) -> None:
+        """
+        Ensure a page linked under several spellings is collected and visited once.
+        """
+        self.config._num_articles = 5
+        with mock.patch.object(scraper, 'make_request', side_effect=aliased_page) as request:
+            crawler = CrawlerRecursive(self.config)
+            crawler.find_articles()
+        self.assertEqual(['https://ugra-news.ru/article/forum/'], crawler.urls)
+        self.assertEqual(['https://ugra-news.ru/', 'https://ugra-news.ru/article/forum/'],
+                         [call.args[0] for call in request.call_args_list])
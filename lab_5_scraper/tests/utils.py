@@ -2,15 +2,21 @@
 Utils for lab_5_scraper tests.
 """
 
-# pylint: disable=no-member,assignment-from-no-return
+# pylint: disable=no-member,assignment-from-no-return,protected-access
 
 import random
+import shutil
+import unittest
+from unittest import mock
+
+import requests
 
 from admin_utils.test_params import TEST_PATH
 from core_utils.article import article
 from core_utils.article.io import to_meta, to_raw
 from core_utils.constants import ASSETS_PATH, CRAWLER_CONFIG_PATH
 from core_utils.tests.utils import copy_student_data
+from lab_5_scraper import scraper
 from lab_5_scraper.scraper import Config, Crawler, HTMLParser
 
 
@@ -32,3 +38,49 @@ def scraper_setup() -> None:
         return_value = parser.parse()
         to_raw(return_value)
         to_meta(return_value)
+
+
+def build_response(url: str, html: str, status_code: int = 200) -> requests.models.Response:
+    """
+    Build a response without touching the network.
+
+    Args:
+        url (str): Site url
+        html (str): Body of the response
+        status_code (int): Status code of the response
+
+    Returns:
+        requests.models.Response: A response
+    """
+    response = requests.models.Response()
+    response.url = url
+    response.status_code = status_code
+    response._content = html.encode('utf-8')
+    response.encoding = 'utf-8'
+    return response
+
+
+class ScraperTestCase(unittest.TestCase):
+    """
+    Base of test cases running scrapers with a fresh configuration.
+
+    Articles are saved right into TEST_PATH, and files kept next to the
+    assets folder, such as the recursive crawler cache, are kept there too.
+    """
+
+    def setUp(self) -> None:
+        """
+        Define start instructions for scraper test cases.
+        """
+        TEST_PATH.mkdir(parents=True, exist_ok=True)
+        self.config = Config(CRAWLER_CONFIG_PATH)
+        for patch in (mock.patch.object(scraper, 'ASSETS_PATH', TEST_PATH / 'articles'),
+                      mock.patch.object(article, 'ASSETS_PATH', TEST_PATH)):
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def tearDown(self) -> None:
+        """
+        Define final instructions for scraper test cases.
+        """
+        shutil.rmtree(TEST_PATH, ignore_errors=True)
@@ -0,0 +1,110 @@
+"""
+Canonical urls and coalescing of concurrent requests of the same url.
+"""
+
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Hashable, TypeVar
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
+
+#: Query parameters added by advertising and analytics that do not change the page
+TRACKING_PARAMS = frozenset({'_openstat', 'fbclid', 'gclid', 'mc_cid', 'mc_eid', 'yclid',
+                             'ysclid'})
+
+#: Prefixes of query parameters added by advertising and analytics
+TRACKING_PARAM_PREFIXES = ('utm_',)
+
+#: Ports implied by schemes
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+ResultT = TypeVar('ResultT')
+
+
+def is_tracking_param(name: str) -> bool:
+    """
+    Check whether a query parameter only tracks the visitor.
+
+    Args:
+        name (str): Name of the parameter
+
+    Returns:
+        bool: Whether the parameter can be dropped
+    """
+    name = name.lower()
+    return name in TRACKING_PARAMS or name.startswith(TRACKING_PARAM_PREFIXES)
+
+
+def canonicalize_url(url: str, base: str | None = None) -> str:
+    """
+    Bring a url to the single form all crawlers store and request.
+
+    Relative urls are resolved against ``base``. Scheme and host are
+    lowercased, default ports, fragments and tracking parameters are dropped,
+    the remaining parameters are sorted, and a trailing slash is added to
+    paths whose last segment is not a file name.
+
+    Args:
+        url (str): Url, absolute or relative to base
+        base (str | None): Url relative urls are resolved against
+
+    Returns:
+        str: Canonical url
+    """
+    parts = urlsplit(urljoin(base, url.strip()) if base else url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').rstrip('.')
+    if ':' in host:
+        host = f'[{host}]'
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        host = f'{host}:{parts.port}'
+    path = parts.path or '/'
+    if not path.endswith('/') and '.' not in path.rsplit('/', 1)[-1]:
+        path += '/'
+    query = urlencode(sorted((name, value)
+                             for name, value in parse_qsl(parts.query, keep_blank_values=True)
+                             if not is_tracking_param(name)))
+    return urlunsplit((scheme, host, path, query, ''))
+
+
+class SingleFlight:
+    """
+    Let only one of concurrent calls with the same key run, the others share its result.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialize an instance of the SingleFlight class.
+        """
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, Future] = {}
+
+    def do(self, key: Hashable, func: Callable[..., ResultT], *args: Any) -> ResultT:
+        """
+        Call a function unless a call with the same key is running, then wait for its result.
+
+        Args:
+            key (Hashable): Key of the call
+            func (Callable[..., ResultT]): Function to call
+            *args (Any): Arguments of the function
+
+        Returns:
+            ResultT: Result of the call, shared by all callers waiting for it
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            is_leader = call is None
+            if call is None:
+                call = self._calls[key] = Future()
+        if not is_leader:
+            shared: ResultT = call.result()
+            return shared
+        try:
+            result = func(*args)
+        except BaseException as error:
+            call.set_exception(error)
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+        call.set_result(result)
+        return result
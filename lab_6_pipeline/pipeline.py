@@ -3,21 +3,23 @@ Pipeline for CONLL-U formatting.
 """
 
 # pylint: disable=too-few-public-methods, undefined-variable, too-many-nested-blocks
+from __future__ import annotations
+
+import importlib
 import pathlib
 from collections import defaultdict
 from dataclasses import asdict
+from typing import TYPE_CHECKING
 
-import spacy_udpipe
-import stanza
-from networkx import DiGraph, to_dict_of_lists
-from networkx.algorithms.isomorphism import categorical_node_match, GraphMatcher
-from spacy_conll.parser import ConllParser
-from stanza.models.common.doc import Document
-from stanza.utils.conll import CoNLL
-
-from core_utils.article.article import Article, ArtifactType, get_article_id_from_filepath
+from core_utils.article.article import (
+    Article,
+    ArtifactType,
+    get_article_id_from_filepath,
+    iter_article_files,
+)
 from core_utils.article.io import from_meta, from_raw, to_cleaned, to_meta
 from core_utils.constants import ASSETS_PATH, PROJECT_ROOT
+from core_utils.lazy import is_loaded, LazyModule
 from core_utils.pipeline import (
     AbstractCoNLLUAnalyzer,
     CoNLLUDocument,
@@ -30,6 +32,25 @@ from core_utils.pipeline import (
 )
 from core_utils.visualizer import visualize
 
+if TYPE_CHECKING:
+    import networkx as nx
+    import spacy_udpipe
+    import stanza
+    from networkx.algorithms import isomorphism
+    from spacy_conll import parser as conll_parser
+    from stanza.models.common import doc as stanza_doc
+    from stanza.utils import conll as stanza_conll
+else:
+    #: Imported on first use, so that runs of CorpusManager or of one analyzer load only what
+    #: they need
+    spacy_udpipe = LazyModule('spacy_udpipe')
+    conll_parser = LazyModule('spacy_conll.parser')
+    stanza = LazyModule('stanza')
+    stanza_doc = LazyModule('stanza.models.common.doc')
+    stanza_conll = LazyModule('stanza.utils.conll')
+    nx = LazyModule('networkx')
+    isomorphism = LazyModule('networkx.algorithms.isomorphism')
+
 
 class EmptyDirectoryError(Exception):
     """
@@ -77,8 +98,17 @@ class CorpusManager:
             raise NotADirectoryError(f'{self.path} is not a directory.')
         if not any(self.path.iterdir()):
             raise EmptyDirectoryError(f'Directory {self.path} is empty.')
-        meta = [filepath.name for filepath in self.path.glob('*_meta.json')]
-        raw = [filepath.name for filepath in self.path.glob('*_raw.txt')]
+        meta = []
+        raw = []
+        has_empty_files = False
+        for entry in iter_article_files(self.path):
+            if entry.name.endswith('_meta.json'):
+                meta.append(entry.name)
+            elif entry.name.endswith('_raw.txt'):
+                raw.append(entry.name)
+            else:
+                continue
+            has_empty_files = has_empty_files or entry.stat().st_size == 0
         if len(meta) != len(raw):
             raise InconsistentDatasetError(
                 f'The amounts of meta and raw files are not equal: {len(meta)} != {len(raw)}.')
@@ -88,16 +118,18 @@ class CorpusManager:
         raw_template = [f'{count}_raw.txt' for count in range(1, len(raw) + 1)]
         if set(raw) != set(raw_template):
             raise InconsistentDatasetError('IDs of raw files are inconsistent.')
-        for mask in ['*_raw.txt', '*_meta.json']:
-            if any(filepath.stat().st_size == 0 for filepath in self.path.glob(mask)):
-                raise InconsistentDatasetError('Some files are empty.')
+        if has_empty_files:
+            raise InconsistentDatasetError('Some files are empty.')
 
     def _scan_dataset(self) -> None:
         """
         Register each dataset entry.
         """
-        self._storage = {get_article_id_from_filepath(filepath): from_raw(filepath)
-                         for filepath in self.path.glob('*_raw.txt')}
+        self._storage = {}
+        for entry in iter_article_files(self.path):
+            if entry.name.endswith('_raw.txt'):
+                filepath = pathlib.Path(entry.path)
+                self._storage[get_article_id_from_filepath(filepath)] = from_raw(filepath)
 
     def get_articles(self) -> dict:
         """
@@ -169,6 +201,8 @@ class UDPipeAnalyzer(LibraryWrapper):
             lang='ru',
             path=str(model_path)
         )
+        # Importing spacy_conll registers the conll_formatter component
+        importlib.import_module('spacy_conll')
         model.add_pipe(
             "conll_formatter",
             last=True,
@@ -214,7 +248,7 @@ class UDPipeAnalyzer(LibraryWrapper):
             raise EmptyFileError(f'File {conllu_path} is empty.')
         with open(conllu_path, encoding='utf-8') as file:
             conllu = file.read()
-        parsed_conllu: UDPipeDocument = ConllParser(
+        parsed_conllu: UDPipeDocument = conll_parser.ConllParser(
             self._analyzer).parse_conll_text_as_spacy(conllu.strip('\n'))
         return parsed_conllu
 
@@ -269,7 +303,7 @@ class StanzaAnalyzer(LibraryWrapper):
         Returns:
             list[StanzaDocument]: List of documents
         """
-        return self._analyzer.process([Document([], text=text) for text in texts])
+        return self._analyzer.process([stanza_doc.Document([], text=text) for text in texts])
 
     def to_conllu(self, article: Article) -> None:
         """
@@ -278,8 +312,8 @@ class StanzaAnalyzer(LibraryWrapper):
         Args:
             article (Article): Article containing information to save
         """
-        CoNLL.write_doc2conll(article.get_conllu_info(),
-                              article.get_file_path(ArtifactType.STANZA_CONLLU))
+        stanza_conll.CoNLL.write_doc2conll(article.get_conllu_info(),
+                                           article.get_file_path(ArtifactType.STANZA_CONLLU))
 
     def from_conllu(self, article: Article) -> StanzaDocument:
         """
@@ -296,7 +330,7 @@ class StanzaAnalyzer(LibraryWrapper):
             raise FileNotFoundError(f'File {conllu_path} does not exist.')
         if pathlib.Path(conllu_path).stat().st_size == 0:
             raise EmptyFileError(f'File {conllu_path} is empty.')
-        parsed_conllu: StanzaDocument = CoNLL.conll2doc(conllu_path)
+        parsed_conllu: StanzaDocument = stanza_conll.CoNLL.conll2doc(conllu_path)
         return parsed_conllu
 
     def get_document(self, doc: StanzaDocument) -> UnifiedCoNLLUDocument:
@@ -380,7 +414,7 @@ class PatternSearchPipeline(PipelineProtocol):
         self._analyzer = analyzer
         self._node_labels = pos
 
-    def _make_graphs(self, doc: CoNLLUDocument) -> list[DiGraph]:
+    def _make_graphs(self, doc: CoNLLUDocument) -> list[nx.DiGraph]:
         """
         Make graphs for a document.
 
@@ -391,16 +425,17 @@ class PatternSearchPipeline(PipelineProtocol):
             list[DiGraph]: Graphs for the sentences in the document
         """
         graphs = []
-        if isinstance(doc, Document):
+        # A document of Stanza exists only if Stanza is imported, UDPipe runs do not import it
+        if is_loaded(stanza_doc) and isinstance(doc, stanza_doc.Document):
             for sentence in doc.sentences:
-                graph = DiGraph()
+                graph = nx.DiGraph()
                 for word in sentence.words:
                     graph.add_node(word.id, label=word.upos)
                     graph.add_edge(word.head, word.id, label=word.deprel)
                 graphs.append(graph)
             return graphs
         for sentence in doc.sents:
-            graph = DiGraph()
+            graph = nx.DiGraph()
             for word in sentence:
                 graph.add_node(word.i, label=word.pos_)
                 graph.add_edge(word.head, word.i, label=word.dep_)
@@ -409,7 +444,7 @@ class PatternSearchPipeline(PipelineProtocol):
 
 
     def _add_children(
-        self, graph: DiGraph, subgraph_to_graph: dict, node_id: int, tree_node: TreeNode
+        self, graph: nx.DiGraph, subgraph_to_graph: dict, node_id: int, tree_node: TreeNode
     ) -> None:
         """
         Add children to TreeNode.
@@ -440,12 +475,12 @@ class PatternSearchPipeline(PipelineProtocol):
             dict[int, list[TreeNode]]: A dictionary with pattern matches
         """
         matches = {}
-        pattern_graph = DiGraph()
+        pattern_graph = nx.DiGraph()
         pattern_graph.add_nodes_from((idx, {"label": label})
                                      for idx, label in enumerate(self._node_labels))
         for sentence_id, graph in enumerate(doc_graphs):
-            matcher = GraphMatcher(graph, pattern_graph,
-                                   node_match=categorical_node_match('label', ''))
+            matcher = isomorphism.GraphMatcher(
+                graph, pattern_graph, node_match=isomorphism.categorical_node_match('label', ''))
             pattern_nodes = []
 
             for match in matcher.subgraph_isomorphisms_iter():
@@ -455,7 +490,7 @@ class PatternSearchPipeline(PipelineProtocol):
                                          isomorphic_graph.nodes[node].get('text'),
                                          [])
                     self._add_children(
-                        graph, to_dict_of_lists(pattern_graph), node, tree_node
+                        graph, nx.to_dict_of_lists(pattern_graph), node, tree_node
                     )
                     pattern_nodes.append(tree_node)
 